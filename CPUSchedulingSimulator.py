@@ -1,204 +1,109 @@
 import customtkinter as ctk
-import psutil
-from tkinter import messagebox, Canvas
-import copy
+from tkinter import messagebox, filedialog, Canvas
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-import random
 import threading
 
+from cpu_scheduler import Process
+from cpu_scheduler.cache import ResultCache, workload_key
+from cpu_scheduler.gantt import IDLE_PID, LABELS, SWITCH_PID, ColumnarGantt
+from cpu_scheduler.incremental import IncrementalSimulator
+from cpu_scheduler.metrics import compute_kpis, smp_metrics
+from cpu_scheduler.monitor import LiveSimulation, estimate_burst
+from cpu_scheduler.online import ALGORITHMS as ONLINE_ALGORITHMS
+from cpu_scheduler.profiling import format_report, profiler
+from cpu_scheduler.recording import SnapshotLog, SnapshotWriter, replay
+from cpu_scheduler.runner import SimulationCancelled, run_monitored
+from cpu_scheduler.smp import SMPSimulator
+from cpu_scheduler.snapshot import take_snapshot
+from cpu_scheduler.table import ProcessTable
+
+# Threads used to sample processes in parallel when fetching
+SNAPSHOT_WORKERS = 8
+
+# Engine short names of the algorithms offered in the GUI
+ALGORITHM_NAMES = {
+    "FCFS": "fcfs",
+    "SJF (Preemptive)": "sjf",
+    "Priority (Preemptive)": "priority",
+    "Round Robin": "rr",
+    "MLFQ": "mlfq",
+    "CFS (Fair)": "cfs",
+}
+
+# Algorithms that take the Time Quantum entry (the top-level quantum for MLFQ)
+QUANTUM_ALGORITHMS = ("Round Robin", "MLFQ")
+
+# Columns of the live monitor table
+LIVE_HEADERS = ["PID", "Process Name", "OS Priority", "CPU %", "Arrival", "Burst Time", "State"]
+
+# Run queue layouts offered for multi-CPU runs: (queues, work stealing)
+QUEUE_OPTIONS = {
+    "Global queue": ("global", False),
+    "Per-CPU queues": ("per-cpu", False),
+    "Per-CPU + stealing": ("per-cpu", True),
+}
+
 # Set appearance mode and color theme
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 
-class Process:
-    """Represents a process with scheduling attributes"""
-    def __init__(self, pid, name, priority, burst_time=0, arrival_time=0):
-        self.pid = pid
-        self.name = name
-        self.priority = priority
-        self.burst_time = burst_time
-        self.arrival_time = arrival_time
-        self.remaining_time = burst_time
-        self.completion_time = 0
-        self.turnaround_time = 0
-        self.waiting_time = 0
-        self.start_time = -1
+def wheel_notches(event):
+    """Wheel notches of a scroll event, positive for up
+    
+    Windows and macOS send <MouseWheel> with a delta, X11 sends
+    <Button-4> (up) and <Button-5> (down) instead.
+    """
+    if event.num == 4:
+        return 1
+    if event.num == 5:
+        return -1
+    return event.delta / 120
 
 
-class SchedulingSimulator:
-    """Implements various CPU scheduling algorithms"""
-    
-    @staticmethod
-    def fcfs(processes):
-        """First Come First Serve scheduling"""
-        processes = sorted(processes, key=lambda p: p.arrival_time)
-        current_time = 0
-        gantt_chart = []
-        
-        for process in processes:
-            if current_time < process.arrival_time:
-                gantt_chart.append(("IDLE", current_time, process.arrival_time))
-                current_time = process.arrival_time
-            
-            process.start_time = current_time
-            gantt_chart.append((process.pid, current_time, current_time + process.burst_time))
-            current_time += process.burst_time
-            process.completion_time = current_time
-            process.turnaround_time = process.completion_time - process.arrival_time
-            process.waiting_time = process.turnaround_time - process.burst_time
-        
-        return processes, gantt_chart
-    
-    @staticmethod
-    def sjf_preemptive(processes):
-        """Shortest Job First (Preemptive) scheduling"""
-        processes = [copy.deepcopy(p) for p in processes]
-        n = len(processes)
-        current_time = 0
-        completed = 0
-        gantt_chart = []
-        last_process = None
-        
-        while completed < n:
-            available = [p for p in processes if p.arrival_time <= current_time and p.remaining_time > 0]
-            
-            if not available:
-                next_arrival = min([p.arrival_time for p in processes if p.remaining_time > 0])
-                if last_process != "IDLE":
-                    gantt_chart.append(("IDLE", current_time, next_arrival))
-                    last_process = "IDLE"
-                current_time = next_arrival
-                continue
-            
-            current_process = min(available, key=lambda p: p.remaining_time)
-            
-            if current_process.start_time == -1:
-                current_process.start_time = current_time
-            
-            if last_process != current_process.pid:
-                if gantt_chart and last_process == current_process.pid:
-                    gantt_chart[-1] = (gantt_chart[-1][0], gantt_chart[-1][1], current_time + 1)
-                else:
-                    gantt_chart.append((current_process.pid, current_time, current_time + 1))
-                last_process = current_process.pid
-            else:
-                gantt_chart[-1] = (gantt_chart[-1][0], gantt_chart[-1][1], current_time + 1)
-            
-            current_process.remaining_time -= 1
-            current_time += 1
-            
-            if current_process.remaining_time == 0:
-                completed += 1
-                current_process.completion_time = current_time
-                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-        
-        return processes, gantt_chart
-    
-    @staticmethod
-    def priority_preemptive(processes):
-        """Priority (Preemptive) scheduling - Lower priority number = higher priority"""
-        processes = [copy.deepcopy(p) for p in processes]
-        n = len(processes)
-        current_time = 0
-        completed = 0
-        gantt_chart = []
-        last_process = None
-        
-        while completed < n:
-            available = [p for p in processes if p.arrival_time <= current_time and p.remaining_time > 0]
-            
-            if not available:
-                next_arrival = min([p.arrival_time for p in processes if p.remaining_time > 0])
-                if last_process != "IDLE":
-                    gantt_chart.append(("IDLE", current_time, next_arrival))
-                    last_process = "IDLE"
-                current_time = next_arrival
-                continue
-            
-            current_process = min(available, key=lambda p: p.priority)
-            
-            if current_process.start_time == -1:
-                current_process.start_time = current_time
-            
-            if last_process != current_process.pid:
-                gantt_chart.append((current_process.pid, current_time, current_time + 1))
-                last_process = current_process.pid
-            else:
-                gantt_chart[-1] = (gantt_chart[-1][0], gantt_chart[-1][1], current_time + 1)
-            
-            current_process.remaining_time -= 1
-            current_time += 1
-            
-            if current_process.remaining_time == 0:
-                completed += 1
-                current_process.completion_time = current_time
-                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-        
-        return processes, gantt_chart
-    
-    @staticmethod
-    def round_robin(processes, time_quantum):
-        """Round Robin scheduling"""
-        processes = [copy.deepcopy(p) for p in processes]
-        queue = []
-        current_time = 0
-        gantt_chart = []
-        completed = 0
-        n = len(processes)
-        
-        for p in sorted(processes, key=lambda x: x.arrival_time):
-            if p.arrival_time == 0:
-                queue.append(p)
-        
-        while completed < n or queue:
-            if not queue:
-                next_process = min([p for p in processes if p.remaining_time > 0], 
-                                  key=lambda p: p.arrival_time)
-                gantt_chart.append(("IDLE", current_time, next_process.arrival_time))
-                current_time = next_process.arrival_time
-                queue.append(next_process)
-            
-            current_process = queue.pop(0)
-            
-            if current_process.start_time == -1:
-                current_process.start_time = current_time
-            
-            execution_time = min(time_quantum, current_process.remaining_time)
-            gantt_chart.append((current_process.pid, current_time, current_time + execution_time))
-            current_process.remaining_time -= execution_time
-            current_time += execution_time
-            
-            for p in processes:
-                if p.arrival_time <= current_time and p.remaining_time > 0 and p not in queue and p != current_process:
-                    queue.append(p)
-            
-            if current_process.remaining_time == 0:
-                completed += 1
-                current_process.completion_time = current_time
-                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-            else:
-                queue.append(current_process)
-        
-        return processes, gantt_chart
+def bind_wheel(widget, handler):
+    """Bind handler to the mouse wheel on every platform"""
+    for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+        widget.bind(sequence, handler)
 
 
 class SortableTable(ctk.CTkFrame):
-    """A sortable table widget with editable cells"""
+    """A sortable table widget with editable cells
+    
+    The table is virtualized: it owns a fixed pool of visible_rows row
+    widgets and rebinds them to the model rows on scroll, so sorting and
+    scrolling cost the same for 30 rows or 100k. Edits in editable columns
+    are written straight into the data model.
     
-    def __init__(self, master, headers, editable_columns=None, **kwargs):
+    The model keeps its original row order; the view shows it through a
+    permutation. Typed sort keys are computed once per column in set_data
+    and the ascending permutation of each column is cached, so a header
+    click is a lookup (or a reversal for descending). Shift-click adds a
+    column as a secondary key for a stable multi-column sort.
+    column_types maps headers to "numeric" or "text"; missing columns are
+    inferred from the data.
+    """
+    
+    def __init__(self, master, headers, editable_columns=None, visible_rows=15,
+                 column_types=None, **kwargs):
         super().__init__(master, **kwargs)
         self.headers = headers
         self.editable_columns = editable_columns or []
+        self.visible_rows = visible_rows
+        self.column_types = column_types or {}
         self.data = []
-        self.widgets = []
+        self.order = []  # model row index shown at each view position
+        self.first_row = 0
+        self.row_pool = []  # (row frame, [cell widgets]) per visible slot
         self.sort_order = {header: True for header in headers}  # True = ascending
-        self.entry_widgets = {}  # Store entry widgets for editable cells
+        self.sort_spec = []  # (column, ascending) from primary to last key
+        self.numeric_columns = set()
+        self.sort_keys = []  # typed sort key of every model row, per column
+        self.permutations = {}  # cached ascending order, per column
         
         self.setup_header()
+        self.setup_body()
     
     def setup_header(self):
         """Create sortable header"""
@@ -213,91 +118,318 @@ class SortableTable(ctk.CTkFrame):
                                fg_color=("#2B2B2B", "#1A1A1A"),
                                hover_color=("#3A3A3A", "#2A2A2A"))
             btn.grid(row=0, column=col, padx=5, pady=5, sticky="ew")
+            btn.bind("<Shift-Button-1>", lambda e, c=col: self.add_sort_column(c))
+    
+    def setup_body(self):
+        """Create the row area and its scrollbar"""
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="both", expand=True)
+        
+        self.rows_frame = ctk.CTkFrame(body, fg_color="transparent")
+        self.rows_frame.pack(side="left", fill="both", expand=True)
+        
+        self.scrollbar = ctk.CTkScrollbar(body, orientation="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y", padx=(2, 0))
     
     def set_data(self, data):
-        """Set table data"""
+        """Set table data and precompute the sort keys"""
         self.data = data
+        self.order = list(range(len(data)))
+        self.first_row = 0
+        self.sort_spec = []
+        self.permutations = {}
+        
+        self.numeric_columns = set()
+        for col, header in enumerate(self.headers):
+            column_type = self.column_types.get(header)
+            if column_type is None:
+                column_type = "numeric" if all(self.is_number(row[col]) for row in data) else "text"
+            if column_type == "numeric":
+                self.numeric_columns.add(col)
+        self.sort_keys = [[self.sort_key(row[col], col) for row in data]
+                          for col in range(len(self.headers))]
+        
         self.render_table()
     
+    @staticmethod
+    def is_number(value):
+        """Check whether a cell value parses as a number"""
+        if isinstance(value, (int, float)):
+            return True
+        try:
+            float(value)
+            return True
+        except (TypeError, ValueError):
+            return False
+    
+    def sort_key(self, value, col):
+        """Typed sort key of one cell; unparseable numbers sort after the rest"""
+        if col in self.numeric_columns:
+            try:
+                return (0, float(value))
+            except (TypeError, ValueError):
+                return (1, str(value))
+        return str(value)
+    
+    def ascending_permutation(self, col):
+        """Model row indices sorted ascending by one column, cached"""
+        perm = self.permutations.get(col)
+        if perm is None:
+            perm = sorted(range(len(self.data)), key=self.sort_keys[col].__getitem__)
+            self.permutations[col] = perm
+        return perm
+    
     def sort_by_column(self, col):
-        """Sort table by column"""
+        """Sort table by column, toggling the direction on each click"""
         if not self.data:
             return
         
+        self.commit_edits()
         header = self.headers[col]
         ascending = self.sort_order[header]
         
-        # Sort data
-        try:
-            self.data.sort(key=lambda x: float(x[col]) if str(x[col]).replace('.', '').replace('-', '').isdigit() else str(x[col]), 
-                          reverse=not ascending)
-        except:
-            self.data.sort(key=lambda x: str(x[col]), reverse=not ascending)
+        perm = self.ascending_permutation(col)
+        self.order = perm if ascending else perm[::-1]
+        self.sort_spec = [(col, ascending)]
         
         self.sort_order[header] = not ascending
-        self.render_table()
+        self.bind_rows()
+    
+    def add_sort_column(self, col):
+        """Add a column as the next sort key, or flip it if already used"""
+        if not self.data:
+            return "break"
+        
+        self.commit_edits()
+        spec = dict(self.sort_spec)
+        if col in spec:
+            self.sort_spec = [(c, not asc if c == col else asc) for c, asc in self.sort_spec]
+        else:
+            self.sort_spec.append((col, True))
+        self.sort_by_columns(self.sort_spec)
+        return "break"
+    
+    def sort_by_columns(self, spec):
+        """Stable sort by several (column, ascending) keys, primary key first"""
+        if not spec:
+            return
+        self.commit_edits()
+        
+        # Start from the cached order of the last key, then stable-sort by
+        # the remaining keys from least to most significant
+        last_col, last_ascending = spec[-1]
+        perm = self.ascending_permutation(last_col)
+        order = list(perm) if last_ascending else perm[::-1]
+        for col, ascending in reversed(spec[:-1]):
+            order.sort(key=self.sort_keys[col].__getitem__, reverse=not ascending)
+        
+        self.order = order
+        self.sort_spec = list(spec)
+        self.bind_rows()
     
     def render_table(self):
-        """Render table with current data"""
-        # Clear existing rows (but not header)
-        for widget_row in self.widgets:
-            for widget in widget_row:
-                widget.destroy()
-        self.widgets = []
-        self.entry_widgets = {}
+        """Size the row pool to the data and bind it to the current rows"""
+        pool_size = min(self.visible_rows, len(self.data))
         
-        # Clear any existing row frames
-        for widget in self.winfo_children():
-            if widget != self.header_frame:
-                widget.destroy()
+        # Grow or shrink the pool of row widgets
+        while len(self.row_pool) > pool_size:
+            row_frame, _ = self.row_pool.pop()
+            row_frame.destroy()
+        while len(self.row_pool) < pool_size:
+            self.row_pool.append(self.create_row(len(self.row_pool)))
+        
+        self.bind_rows()
+    
+    def create_row(self, slot):
+        """Create the widgets of one visible row slot"""
+        row_frame = ctk.CTkFrame(self.rows_frame)
+        row_frame.pack(fill="x", padx=2, pady=1)
+        bind_wheel(row_frame, self.on_mousewheel)
         
-        # Create rows
-        for idx, row_data in enumerate(self.data):
+        cells = []
+        for col, header in enumerate(self.headers):
+            # Check if this column is editable
+            if header in self.editable_columns:
+                cell = ctk.CTkEntry(row_frame, width=140, height=30,
+                                    font=ctk.CTkFont(size=11))
+                cell.bind("<KeyRelease>", lambda e, s=slot, c=col: self.commit_edit(s, c))
+                cell.bind("<FocusOut>", lambda e, s=slot, c=col: self.commit_edit(s, c))
+            else:
+                cell = ctk.CTkLabel(row_frame, text="", width=140,
+                                    font=ctk.CTkFont(size=11))
+            cell.grid(row=0, column=col, padx=5, pady=5)
+            bind_wheel(cell, self.on_mousewheel)
+            cells.append(cell)
+        
+        return row_frame, cells
+    
+    def bind_rows(self):
+        """Show the model rows starting at first_row in the row pool"""
+        with profiler.stage("render table"):
+            self._bind_rows()
+            profiler.count("table rows bound", len(self.row_pool))
+    
+    def _bind_rows(self):
+        for slot, (row_frame, cells) in enumerate(self.row_pool):
+            idx = self.first_row + slot
+            row_data = self.data[self.order[idx]]
             row_color = ("#252525", "#151515") if idx % 2 == 0 else ("#2B2B2B", "#1A1A1A")
-            row_frame = ctk.CTkFrame(self, fg_color=row_color)
-            row_frame.pack(fill="x", padx=2, pady=1)
+            row_frame.configure(fg_color=row_color)
             
-            row_widgets = []
-            for col, value in enumerate(row_data):
-                # Check if this column is editable
-                if self.headers[col] in self.editable_columns:
-                    entry = ctk.CTkEntry(row_frame, width=140, height=30,
-                                        font=ctk.CTkFont(size=11))
-                    entry.insert(0, str(value))
-                    entry.grid(row=0, column=col, padx=5, pady=5)
-                    row_widgets.append(entry)
-                    # Store reference to entry widget with row index
-                    self.entry_widgets[idx] = self.entry_widgets.get(idx, {})
-                    self.entry_widgets[idx][col] = entry
+            for col, cell in enumerate(cells):
+                if isinstance(cell, ctk.CTkEntry):
+                    cell.delete(0, "end")
+                    cell.insert(0, str(row_data[col]))
                 else:
-                    label = ctk.CTkLabel(row_frame, text=str(value), width=140,
-                                        font=ctk.CTkFont(size=11))
-                    label.grid(row=0, column=col, padx=5, pady=5)
-                    row_widgets.append(label)
-            
-            self.widgets.append(row_widgets)
+                    cell.configure(text=str(row_data[col]))
+        
+        self.update_scrollbar()
+    
+    def update_rows(self, changed=None, added=()):
+        """Append rows and change cells without rebuilding the table
+        
+        changed maps a model row index (which may be one of the added rows)
+        to {column: value}. Only the touched sort keys are recomputed; while
+        the table is sorted, the added rows and the rows whose sort columns
+        changed are moved into place by binary search instead of sorting
+        the whole table again. Only the visible rows are redrawn.
+        """
+        self.commit_edits()
+        sort_columns = {col for col, _ in self.sort_spec}
+        first_added = len(self.data)
+        for values in added:
+            self.data.append(list(values))
+            for col, value in enumerate(values):
+                self.sort_keys[col].append(self.sort_key(value, col))
+        if added:
+            self.permutations = {}
+        moved = []
+        for row, cells in (changed or {}).items():
+            for col, value in cells.items():
+                self.data[row][col] = value
+                self.sort_keys[col][row] = self.sort_key(value, col)
+                self.permutations.pop(col, None)
+            if row < first_added and not sort_columns.isdisjoint(cells):
+                moved.append(row)
+        
+        if self.sort_spec:
+            if moved:
+                moving = set(moved)
+                self.order = [row for row in self.order if row not in moving]
+            for row in moved + list(range(first_added, len(self.data))):
+                self.insert_sorted(row)
+        else:
+            self.order.extend(range(first_added, len(self.data)))
+        if len(self.row_pool) != min(self.visible_rows, len(self.data)):
+            self.render_table()
+        else:
+            self.bind_rows()
+    
+    def insert_sorted(self, row):
+        """Insert a model row into the sorted order, after the rows it ties with"""
+        keys = [(self.sort_keys[col], ascending) for col, ascending in self.sort_spec]
+        
+        def before(a, b):
+            for column_keys, ascending in keys:
+                key_a, key_b = column_keys[a], column_keys[b]
+                if key_a != key_b:
+                    return key_a < key_b if ascending else key_b < key_a
+            return False
+        
+        order = self.order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if before(row, order[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        order.insert(lo, row)
+    
+    def commit_edit(self, slot, col):
+        """Write an edited cell back into the data model"""
+        if slot >= len(self.row_pool):
+            return
+        row = self.order[self.first_row + slot]
+        value = self.row_pool[slot][1][col].get()
+        if str(self.data[row][col]) == value:
+            return
+        self.data[row][col] = value
+        # Only this column's key and cached order are affected
+        self.sort_keys[col][row] = self.sort_key(value, col)
+        self.permutations.pop(col, None)
+    
+    def commit_edits(self):
+        """Write every visible editable cell back into the data model"""
+        for slot, (_, cells) in enumerate(self.row_pool):
+            for col, cell in enumerate(cells):
+                if isinstance(cell, ctk.CTkEntry):
+                    self.commit_edit(slot, col)
+    
+    def scroll_to(self, first_row):
+        """Scroll so that first_row is the top visible row"""
+        first_row = max(0, min(int(first_row), len(self.data) - len(self.row_pool)))
+        if first_row != self.first_row:
+            self.commit_edits()
+            self.first_row = first_row
+            self.bind_rows()
+    
+    def yview(self, action, amount, unit=None):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'/'pages')"""
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.data))
+        elif action == "scroll":
+            step = len(self.row_pool) if unit == "pages" else 1
+            self.scroll_to(self.first_row + int(amount) * step)
+    
+    def on_mousewheel(self, event):
+        """Scroll three rows per wheel notch"""
+        self.scroll_to(self.first_row - 3 * int(wheel_notches(event)))
+        return "break"
+    
+    def update_scrollbar(self):
+        """Reflect the visible row range in the scrollbar"""
+        if not self.data:
+            self.scrollbar.set(0, 1)
+            return
+        n = len(self.data)
+        self.scrollbar.set(self.first_row / n, (self.first_row + len(self.row_pool)) / n)
     
     def get_data(self):
-        """Get current table data including edits"""
-        result = []
-        for idx, row_data in enumerate(self.data):
-            row = []
-            for col, value in enumerate(row_data):
-                if idx in self.entry_widgets and col in self.entry_widgets[idx]:
-                    row.append(self.entry_widgets[idx][col].get())
-                else:
-                    row.append(value)
-            result.append(row)
-        return result
+        """Get current table data including edits, in the original row order"""
+        self.commit_edits()
+        return [list(row) for row in self.data]
 
 
 class InteractiveGanttChart(ctk.CTkFrame):
-    """Interactive Gantt Chart with zoom and pan capabilities"""
+    """Interactive Gantt Chart with zoom and pan capabilities
+    
+    Only the segments inside the visible part of the canvas are drawn.
+    Slices narrower than MIN_BAR_PX are merged into blocks, and labels and
+    time markers are skipped on bars too narrow to fit them, so the number
+    of canvas items depends on the window width rather than the chart size.
+    
+    Canvas items persist across zoom and pan: every drawn segment, block
+    and grid line is indexed, zooming rescales them in place with
+    canvas.scale, and update_view only creates or deletes the items whose
+    visibility or level of detail changed.
+    """
+    
+    MIN_BAR_PX = 2
+    LABEL_MIN_PX = 36
+    TICK_MIN_PX = 30
+    MIXED_COLOR = "#5D6D7E"
+    SWITCH_COLOR = "#E67E22"
+    SHADOW_OFFSET = 3
+    MARGIN_LEFT = 50
+    MARGIN_TOP = 40
+    BAR_HEIGHT = 80
+    BASE_WIDTH = 1200
     
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         
-        self.gantt_data = []
+        self.gantt_data = ColumnarGantt()
         self.process_colors = {}
         self.colors = [
             "#FF6B6B", "#4ECDC4", "#45B7D1", "#FFA07A", "#98D8C8",
@@ -310,6 +442,22 @@ class InteractiveGanttChart(ctk.CTkFrame):
         self.canvas_width = 1400
         self.canvas_height = 200
         
+        # Pending idle redraw and the view it was last drawn for
+        self._render_pending = None
+        self._rendered_view = None
+        
+        # Pixels per time unit the items on the canvas were drawn at
+        self.px_per_unit = 1
+        
+        # Persistent canvas item index: segment index -> {part: item id},
+        # (first, stop) segment range -> block item, grid time -> line item
+        self.bar_items = {}
+        self.block_items = {}
+        self.grid_items = {}
+        self.static_items = {}
+        # Segments whose end moved since their items were drawn
+        self.grown_bars = set()
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -345,15 +493,16 @@ class InteractiveGanttChart(ctk.CTkFrame):
         # Bind mouse events for panning
         self.canvas.bind("<ButtonPress-1>", self.on_pan_start)
         self.canvas.bind("<B1-Motion>", self.on_pan_move)
-        self.canvas.bind("<MouseWheel>", self.on_mousewheel)
+        bind_wheel(self.canvas, self.on_mousewheel)
+        self.canvas.bind("<Configure>", lambda event: self.schedule_render())
         
         self.drag_start_x = 0
         
         # Scrollbar below canvas
-        scrollbar = ctk.CTkScrollbar(canvas_container, orientation="horizontal",
-                                    command=self.canvas.xview)
-        scrollbar.pack(side="bottom", fill="x", pady=(5, 0))
-        self.canvas.configure(xscrollcommand=scrollbar.set)
+        self.scrollbar = ctk.CTkScrollbar(canvas_container, orientation="horizontal",
+                                         command=self.canvas.xview)
+        self.scrollbar.pack(side="bottom", fill="x", pady=(5, 0))
+        self.canvas.configure(xscrollcommand=self.on_xscroll)
         
         # Legend - scrollable for many processes
         legend_container = ctk.CTkFrame(self, fg_color="transparent")
@@ -371,35 +520,81 @@ class InteractiveGanttChart(ctk.CTkFrame):
     
     def set_data(self, gantt_chart):
         """Set Gantt chart data and render"""
+        if not isinstance(gantt_chart, ColumnarGantt):
+            gantt_chart = ColumnarGantt.from_segments(gantt_chart)
         self.gantt_data = gantt_chart
         
-        # Create color mapping
+        # Create color mapping in order of first appearance
         self.process_colors = {}
         color_idx = 0
-        for pid, _, _ in gantt_chart:
-            if pid not in self.process_colors and pid != "IDLE":
+        for pid in dict.fromkeys(gantt_chart.pid):
+            if pid not in LABELS:
                 self.process_colors[pid] = self.colors[color_idx % len(self.colors)]
                 color_idx += 1
         
         self.render_gantt()
         self.render_legend()
-    
+
+    def extend_data(self, pids, starts, ends):
+        """Append finished segments while a simulation is still running"""
+        gantt = self.gantt_data
+        # The first new slice may continue the last segment, which is
+        # then merged into it and must be redrawn longer
+        last = len(gantt) - 1
+        last_end = gantt.end[last] if last >= 0 else None
+        new_pids = False
+        for pid, start, end in zip(pids, starts, ends):
+            if pid in LABELS:
+                gantt.add(LABELS[pid], start, end)
+            else:
+                gantt.add(pid, start, end)
+                if pid not in self.process_colors:
+                    self.process_colors[pid] = self.colors[len(self.process_colors) % len(self.colors)]
+                    new_pids = True
+        if last >= 0 and gantt.end[last] != last_end:
+            self.grown_bars.add(last)
+
+        if not self.static_items:
+            self.render_gantt()
+        else:
+            # The end marker shows the old total time
+            if "end_time" in self.static_items:
+                self.canvas.delete(self.static_items.pop("end_time"), self.static_items.pop("end_tick"))
+            self.set_zoom(self.zoom_level)
+        if new_pids:
+            self.render_legend()
+
     def zoom_in(self):
         """Zoom in on Gantt chart"""
-        self.zoom_level *= 1.3
-        self.render_gantt()
+        self.set_zoom(self.zoom_level * 1.3)
     
     def zoom_out(self):
         """Zoom out on Gantt chart"""
-        self.zoom_level = max(0.3, self.zoom_level / 1.3)
-        self.render_gantt()
+        self.set_zoom(max(0.3, self.zoom_level / 1.3))
     
     def reset_view(self):
         """Reset zoom and pan"""
-        self.zoom_level = 1.0
         self.pan_offset = 0
         self.canvas.xview_moveto(0)
-        self.render_gantt()
+        self.set_zoom(1.0)
+    
+    def set_zoom(self, zoom_level):
+        """Rescale the items already drawn, then update only what changed"""
+        self.zoom_level = zoom_level
+        old_scale = self.px_per_unit
+        self.px_per_unit = self.compute_scale()
+        factor = self.px_per_unit / old_scale
+        if factor != 1:
+            self.canvas.scale("zoomable", self.MARGIN_LEFT, 0, factor, 1)
+            # Shadows keep a fixed pixel offset from their bar
+            self.canvas.move("shadow", self.SHADOW_OFFSET * (1 - factor), 0)
+        self.update_view()
+    
+    def compute_scale(self):
+        """Pixels per simulated time unit at the current zoom level"""
+        total_time = self.gantt_data.total_time
+        chart_width = int(self.BASE_WIDTH * self.zoom_level)
+        return chart_width / total_time if total_time > 0 else 1
     
     def on_pan_start(self, event):
         """Start panning"""
@@ -413,96 +608,229 @@ class InteractiveGanttChart(ctk.CTkFrame):
     
     def on_mousewheel(self, event):
         """Handle mouse wheel for horizontal scrolling"""
-        self.canvas.xview_scroll(int(-1 * (event.delta / 120)), "units")
+        self.canvas.xview_scroll(int(-wheel_notches(event)), "units")
+    
+    def on_xscroll(self, first, last):
+        """Keep the scrollbar in sync and redraw when the visible range moves"""
+        self.scrollbar.set(first, last)
+        if (first, last) != self._rendered_view:
+            self.schedule_render()
+    
+    def schedule_render(self):
+        """Coalesce redraw requests into one update when Tk is idle"""
+        if self._render_pending is None:
+            self._render_pending = self.after_idle(self.update_view)
     
     def render_gantt(self):
-        """Render the Gantt chart"""
+        """Render the Gantt chart from scratch"""
         self.canvas.delete("all")
+        self.bar_items = {}
+        self.block_items = {}
+        self.grid_items = {}
+        self.static_items = {}
+        self.grown_bars = set()
+        self.px_per_unit = self.compute_scale()
+        
+        if self.gantt_data:
+            # Timeline background and time axis are moved, never recreated
+            self.static_items["background"] = self.canvas.create_rectangle(
+                0, 0, 0, 0, fill="#1A1A1A", outline="")
+            self.static_items["axis"] = self.canvas.create_line(
+                0, 0, 0, 0, fill="#555555", width=2)
+        
+        self.update_view()
+    
+    def update_view(self):
+        """Bring the canvas in line with the current zoom and scroll position"""
+        if self._render_pending is not None:
+            self.after_cancel(self._render_pending)
+            self._render_pending = None
         
         if not self.gantt_data:
             return
+        with profiler.stage("render gantt"):
+            self._update_view()
+    
+    def _update_view(self):
+        gantt = self.gantt_data
         
         # Calculate dimensions
-        total_time = max([end for _, _, end in self.gantt_data])
-        base_width = 1200
-        chart_width = int(base_width * self.zoom_level)
-        scale = chart_width / total_time if total_time > 0 else 1
-        
-        margin_left = 50
-        margin_top = 40
-        bar_height = 80
+        total_time = gantt.total_time
+        chart_width = int(self.BASE_WIDTH * self.zoom_level)
+        scale = self.px_per_unit
+        margin_left = self.MARGIN_LEFT
+        axis_y = self.MARGIN_TOP + self.BAR_HEIGHT + 20
         
         # Configure scroll region
         self.canvas.configure(scrollregion=(0, 0, chart_width + 200, self.canvas_height))
         
-        # Draw timeline background
-        self.canvas.create_rectangle(0, 0, chart_width + 200, self.canvas_height,
-                                     fill="#1A1A1A", outline="")
-        
-        # Draw time axis
-        self.canvas.create_line(margin_left, margin_top + bar_height + 20,
-                               margin_left + chart_width, margin_top + bar_height + 20,
-                               fill="#555555", width=2)
-        
-        # Draw Gantt bars
-        for pid, start, end in self.gantt_data:
-            x1 = margin_left + (start * scale)
-            x2 = margin_left + (end * scale)
-            y1 = margin_top
-            y2 = margin_top + bar_height
+        # Visible part of the canvas plus half a screen on each side, so
+        # short pans reuse the items already drawn
+        view_x1 = self.canvas.canvasx(0)
+        view_x2 = self.canvas.canvasx(max(self.canvas.winfo_width(), 1))
+        pad = (view_x2 - view_x1) / 2
+        view_x1 -= pad
+        view_x2 += pad
+        t_lo = (view_x1 - margin_left) / scale
+        t_hi = (view_x2 - margin_left) / scale
+        
+        self.canvas.coords(self.static_items["background"],
+                           view_x1, 0, view_x2, self.canvas_height)
+        self.canvas.coords(self.static_items["axis"],
+                           max(margin_left, view_x1), axis_y,
+                           min(margin_left + chart_width, view_x2), axis_y)
+        
+        # Work out which segments are bars (with their level of detail) and
+        # which are merged into blocks; segments are chronological, so the
+        # visible ones form one index range found by bisection
+        starts, ends = gantt.start, gantt.end
+        i = bisect_right(ends, t_lo)
+        stop = bisect_left(starts, t_hi)
+        min_bar_time = self.MIN_BAR_PX / scale
+        wanted_bars = {}
+        wanted_blocks = set()
+        
+        while i < stop:
+            width = (ends[i] - starts[i]) * scale
+            if width >= self.MIN_BAR_PX:
+                wanted_bars[i] = width
+                i += 1
+                continue
             
+            # Merge the run of narrow slices inside the next MIN_BAR_PX pixels
+            j = bisect_left(starts, starts[i] + min_bar_time, i + 1, stop)
+            if j - 1 > i and ends[j - 1] - starts[j - 1] >= min_bar_time:
+                j -= 1
+            wanted_blocks.add((i, j))
+            i = j
+        
+        # Drop what left the view, then add or adjust what is in it
+        for i in [i for i in self.bar_items if i not in wanted_bars]:
+            self.canvas.delete(*self.bar_items.pop(i).values())
+        for i, width in wanted_bars.items():
+            self.sync_bar(i, width)
+        self.grown_bars.clear()
+        profiler.count("gantt bars drawn", len(wanted_bars))
+        profiler.count("gantt blocks drawn", len(wanted_blocks))
+        
+        for key in [key for key in self.block_items if key not in wanted_blocks]:
+            self.canvas.delete(self.block_items.pop(key))
+        for first, last in wanted_blocks:
+            x1 = margin_left + (starts[first] * scale)
+            x2 = max(margin_left + (ends[last - 1] * scale), x1 + 1)
+            if (first, last) in self.block_items:
+                # Blocks are padded to at least a pixel, which scaling distorts
+                self.canvas.coords(self.block_items[(first, last)],
+                                   x1, self.MARGIN_TOP, x2, self.MARGIN_TOP + self.BAR_HEIGHT)
+            else:
+                self.block_items[(first, last)] = self.canvas.create_rectangle(
+                    x1, self.MARGIN_TOP, x2, self.MARGIN_TOP + self.BAR_HEIGHT,
+                    fill=self.MIXED_COLOR, outline="", tags=("zoomable", "gantt_block"))
+        
+        # Final time marker
+        x_end = margin_left + (total_time * scale)
+        end_visible = view_x1 <= x_end <= view_x2
+        if end_visible and "end_time" not in self.static_items:
+            self.static_items["end_time"] = self.canvas.create_text(
+                x_end, axis_y + 15, text=str(total_time),
+                fill="#AAAAAA", font=("Arial", 10), tags=("zoomable", "time"))
+            self.static_items["end_tick"] = self.canvas.create_line(
+                x_end, axis_y, x_end, axis_y + 5,
+                fill="#555555", width=1, tags=("zoomable", "tick"))
+        elif not end_visible and "end_time" in self.static_items:
+            self.canvas.delete(self.static_items.pop("end_time"), self.static_items.pop("end_tick"))
+        
+        # Add grid lines for better readability
+        grid_interval = max(1, total_time // 20)
+        first_line = max(0, int(t_lo) // grid_interval * grid_interval)
+        wanted_grid = range(first_line, min(total_time, int(t_hi)) + 1, grid_interval)
+        for t in [t for t in self.grid_items if t not in wanted_grid]:
+            self.canvas.delete(self.grid_items.pop(t))
+        for t in wanted_grid:
+            if t not in self.grid_items:
+                x = margin_left + (t * scale)
+                self.grid_items[t] = self.canvas.create_line(
+                    x, self.MARGIN_TOP, x, self.MARGIN_TOP + self.BAR_HEIGHT,
+                    fill="#2A2A2A", dash=(2, 4), tags=("zoomable", "grid"))
+        
+        self._rendered_view = self.canvas.xview()
+    
+    def sync_bar(self, i, width):
+        """Create or adjust the items of segment i for its on-screen width"""
+        items = self.bar_items.get(i)
+        pid = self.gantt_data.pid[i]
+        start = self.gantt_data.start[i]
+        end = self.gantt_data.end[i]
+        x1 = self.MARGIN_LEFT + (start * self.px_per_unit)
+        x2 = self.MARGIN_LEFT + (end * self.px_per_unit)
+        y1 = self.MARGIN_TOP
+        y2 = self.MARGIN_TOP + self.BAR_HEIGHT
+        show_label = width >= self.LABEL_MIN_PX
+        show_ticks = width >= self.TICK_MIN_PX
+        
+        if items is None:
             # Choose color
-            if pid == "IDLE":
+            if pid == IDLE_PID:
                 fill_color = "#3A3A3A"
                 outline_color = "#555555"
+            elif pid == SWITCH_PID:
+                fill_color = self.SWITCH_COLOR
+                outline_color = "#555555"
             else:
                 fill_color = self.process_colors.get(pid, "#4ECDC4")
                 outline_color = "#FFFFFF"
             
+            items = self.bar_items[i] = {}
+            
             # Draw shadow
-            self.canvas.create_rectangle(x1 + 3, y1 + 3, x2 + 3, y2 + 3,
-                                        fill="#000000", outline="", tags="shadow")
+            items["shadow"] = self.canvas.create_rectangle(
+                x1 + self.SHADOW_OFFSET, y1 + self.SHADOW_OFFSET,
+                x2 + self.SHADOW_OFFSET, y2 + self.SHADOW_OFFSET,
+                fill="#000000", outline="", tags=("zoomable", "shadow"))
             
             # Draw main rectangle
-            rect_id = self.canvas.create_rectangle(x1, y1, x2, y2,
-                                                   fill=fill_color, outline=outline_color,
-                                                   width=3, tags="gantt_bar")
-            
-            # Add process label
-            label = f"P{pid}" if pid != "IDLE" else "IDLE"
+            items["bar"] = self.canvas.create_rectangle(
+                x1, y1, x2, y2, fill=fill_color, outline=outline_color,
+                width=3 if show_label else 1, tags=("zoomable", "gantt_bar"))
+        else:
+            if i in self.grown_bars:
+                self.canvas.coords(items["shadow"],
+                                   x1 + self.SHADOW_OFFSET, y1 + self.SHADOW_OFFSET,
+                                   x2 + self.SHADOW_OFFSET, y2 + self.SHADOW_OFFSET)
+                self.canvas.coords(items["bar"], x1, y1, x2, y2)
+                if "label" in items:
+                    text_x = (x1 + x2) / 2
+                    text_y = (y1 + y2) / 2
+                    self.canvas.coords(items["label"], text_x, text_y)
+                    self.canvas.coords(items["duration"], text_x, text_y + 20)
+                    self.canvas.itemconfigure(items["duration"], text=f"({end - start}u)")
+            if show_label != ("label" in items):
+                self.canvas.itemconfigure(items["bar"], width=3 if show_label else 1)
+        
+        # Add process label and duration when they fit
+        if show_label and "label" not in items:
+            label = LABELS[pid] if pid in LABELS else f"P{pid}"
             text_x = (x1 + x2) / 2
             text_y = (y1 + y2) / 2
             
-            self.canvas.create_text(text_x, text_y, text=label,
-                                   fill="black", font=("Arial", 12, "bold"),
-                                   tags="label")
-            
-            # Add time duration below label
-            duration = end - start
-            self.canvas.create_text(text_x, text_y + 20, text=f"({duration}u)",
-                                   fill="black", font=("Arial", 9),
-                                   tags="duration")
-            
-            # Time markers
-            self.canvas.create_text(x1, y2 + 35, text=str(start),
-                                   fill="#AAAAAA", font=("Arial", 10), tags="time")
-            self.canvas.create_line(x1, y2 + 20, x1, y2 + 25,
-                                   fill="#555555", width=1, tags="tick")
-        
-        # Final time marker
-        x_end = margin_left + (total_time * scale)
-        self.canvas.create_text(x_end, margin_top + bar_height + 35, text=str(total_time),
-                               fill="#AAAAAA", font=("Arial", 10), tags="time")
-        self.canvas.create_line(x_end, margin_top + bar_height + 20, 
-                               x_end, margin_top + bar_height + 25,
-                               fill="#555555", width=1, tags="tick")
-        
-        # Add grid lines for better readability
-        grid_interval = max(1, total_time // 20)
-        for i in range(0, total_time + 1, grid_interval):
-            x = margin_left + (i * scale)
-            self.canvas.create_line(x, margin_top, x, margin_top + bar_height,
-                                   fill="#2A2A2A", dash=(2, 4), tags="grid")
+            items["label"] = self.canvas.create_text(
+                text_x, text_y, text=label, fill="black",
+                font=("Arial", 12, "bold"), tags=("zoomable", "label"))
+            items["duration"] = self.canvas.create_text(
+                text_x, text_y + 20, text=f"({end - start}u)", fill="black",
+                font=("Arial", 9), tags=("zoomable", "duration"))
+        elif not show_label and "label" in items:
+            self.canvas.delete(items.pop("label"), items.pop("duration"))
+        
+        # Time markers
+        if show_ticks and "time" not in items:
+            items["time"] = self.canvas.create_text(
+                x1, y2 + 35, text=str(start), fill="#AAAAAA",
+                font=("Arial", 10), tags=("zoomable", "time"))
+            items["tick"] = self.canvas.create_line(
+                x1, y2 + 20, x1, y2 + 25, fill="#555555", width=1, tags=("zoomable", "tick"))
+        elif not show_ticks and "time" in items:
+            self.canvas.delete(items.pop("time"), items.pop("tick"))
     
     def render_legend(self):
         """Render legend for all processes"""
@@ -511,7 +839,7 @@ class InteractiveGanttChart(ctk.CTkFrame):
             widget.destroy()
         
         # Show ALL process colors
-        all_pids = sorted(list(set([pid for pid, _, _ in self.gantt_data if pid != "IDLE"])))
+        all_pids = sorted(self.process_colors)
         
         for pid in all_pids:
             color = self.process_colors.get(pid, "#4ECDC4")
@@ -547,18 +875,43 @@ class CPUSchedulerApp(ctk.CTk):
         # Loading overlay
         self.loading_overlay = None
         
+        # Set to stop the simulation running in the background
+        self.cancel_event = None
+        
+        # Live monitor mode: the running LiveSimulation, its table and the
+        # model row of every simulated process
+        self.live = None
+        self.live_table = None
+        self.live_rows = {}
+        self.live_arrivals = []
+        self.live_done = 0
+        
+        # Finished runs, so comparing algorithms on the same table is instant
+        self.result_cache = ResultCache()
+        
+        # Checkpointed runs per (algorithm, quantum), so editing a few burst
+        # times only re-simulates from the first affected process
+        self.simulators = {}
+        
         self.setup_ui()
     
-    def show_loading(self, message="Loading..."):
-        """Show modern loading popup with animation"""
+    def show_loading(self, message="Loading...", cancel_command=None):
+        """Show modern loading popup with animation
+        
+        With a cancel_command the popup gets a Cancel button, and its
+        status line can be changed with update_loading.
+        """
         if self.loading_overlay:
             self.loading_overlay.destroy()
         
+        self.loading_size = (280, 250 if cancel_command else 200)
+        
         # Create ONLY the popup card, no full-screen overlay
         self.loading_overlay = ctk.CTkFrame(self, 
                                            fg_color=("#2B2B2B", "#1E1E1E"),
                                            corner_radius=20,
-                                           width=280, height=200,
+                                           width=self.loading_size[0],
+                                           height=self.loading_size[1],
                                            border_width=3,
                                            border_color="#4ECDC4")
         
@@ -582,10 +935,17 @@ class CPUSchedulerApp(ctk.CTk):
                     font=ctk.CTkFont(size=14, weight="bold"),
                     text_color="#FFFFFF").pack(pady=5)
         
-        ctk.CTkLabel(self.loading_overlay, 
-                    text="Please wait...",
-                    font=ctk.CTkFont(size=11),
-                    text_color="#AAAAAA").pack(pady=(0, 20))
+        self.loading_status = ctk.CTkLabel(self.loading_overlay, 
+                                           text="Please wait...",
+                                           font=ctk.CTkFont(size=11),
+                                           text_color="#AAAAAA")
+        self.loading_status.pack(pady=(0, 10 if cancel_command else 20))
+        
+        if cancel_command:
+            ctk.CTkButton(self.loading_overlay, text="✕ Cancel",
+                         command=cancel_command,
+                         width=120, height=30,
+                         fg_color="#C0392B", hover_color="#922B21").pack(pady=(0, 15))
         
         # Start animation with scale effect
         self.loading_scale = 0.5
@@ -601,8 +961,8 @@ class CPUSchedulerApp(ctk.CTk):
         if self.loading_scale < 1.0:
             self.loading_scale += 0.1
             # Scale effect (simulated by adjusting size)
-            scale_width = int(280 * self.loading_scale)
-            scale_height = int(200 * self.loading_scale)
+            scale_width = int(self.loading_size[0] * self.loading_scale)
+            scale_height = int(self.loading_size[1] * self.loading_scale)
             
             self.loading_overlay.configure(width=scale_width, height=scale_height)
             self.after(20, self.animate_popup_entrance)
@@ -661,6 +1021,11 @@ class CPUSchedulerApp(ctk.CTk):
         if self.spinner_running:
             self.after(40, self.animate_loading)
     
+    def update_loading(self, text):
+        """Change the status line of the loading popup"""
+        if self.loading_overlay:
+            self.loading_status.configure(text=text)
+    
     def hide_loading(self):
         """Hide loading overlay immediately"""
         self.spinner_running = False
@@ -703,6 +1068,51 @@ class CPUSchedulerApp(ctk.CTk):
                                          corner_radius=10)
         self.fetch_button.pack(pady=10, padx=15, fill="x")
         
+        # Process limit and selection
+        limit_frame = ctk.CTkFrame(fetch_frame, fg_color="transparent")
+        limit_frame.pack(pady=(0, 5), padx=15, fill="x")
+        ctk.CTkLabel(limit_frame, text="Process Limit:",
+                    font=ctk.CTkFont(size=12)).pack(side="left", padx=5)
+        self.limit_entry = ctk.CTkEntry(limit_frame, width=80, height=30)
+        self.limit_entry.insert(0, "30")
+        self.limit_entry.pack(side="left", padx=5)
+        
+        self.top_cpu_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(fetch_frame, text="Top processes by CPU usage",
+                       variable=self.top_cpu_var,
+                       font=ctk.CTkFont(size=12)).pack(pady=(0, 10), padx=20, anchor="w")
+        
+        # Live monitor: sample the host every interval and simulate online
+        interval_frame = ctk.CTkFrame(fetch_frame, fg_color="transparent")
+        interval_frame.pack(pady=(0, 5), padx=15, fill="x")
+        ctk.CTkLabel(interval_frame, text="Live interval (s):",
+                    font=ctk.CTkFont(size=12)).pack(side="left", padx=5)
+        self.interval_entry = ctk.CTkEntry(interval_frame, width=60, height=30)
+        self.interval_entry.insert(0, "1.0")
+        self.interval_entry.pack(side="left", padx=5)
+        
+        self.live_button = ctk.CTkButton(fetch_frame, text="📡 Start Live Monitor",
+                                        command=self.toggle_live_monitor,
+                                        height=38, font=ctk.CTkFont(size=13, weight="bold"),
+                                        corner_radius=10)
+        self.live_button.pack(pady=(5, 5), padx=15, fill="x")
+        
+        self.record_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(fetch_frame, text="Record samples to a log",
+                       variable=self.record_var,
+                       font=ctk.CTkFont(size=12)).pack(pady=(0, 5), padx=20, anchor="w")
+        
+        # Replay of a recorded log, at full speed or spaced as recorded
+        self.replay_button = ctk.CTkButton(fetch_frame, text="⏯ Replay Recording",
+                                          command=self.replay_recording,
+                                          height=38, font=ctk.CTkFont(size=13, weight="bold"),
+                                          corner_radius=10)
+        self.replay_button.pack(pady=(5, 5), padx=15, fill="x")
+        self.realtime_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(fetch_frame, text="Replay in real time",
+                       variable=self.realtime_var,
+                       font=ctk.CTkFont(size=12)).pack(pady=(0, 10), padx=20, anchor="w")
+        
         # Burst time info
         info_label = ctk.CTkLabel(fetch_frame, 
                                  text="Burst times (0-100) auto-generated\nYou can edit them in the table",
@@ -719,8 +1129,7 @@ class CPUSchedulerApp(ctk.CTk):
         
         self.algorithm_var = ctk.StringVar(value="FCFS")
         self.algorithm_menu = ctk.CTkOptionMenu(algo_frame, 
-                                                values=["FCFS", "SJF (Preemptive)", 
-                                                       "Priority (Preemptive)", "Round Robin"],
+                                                values=list(ALGORITHM_NAMES),
                                                 variable=self.algorithm_var,
                                                 command=self.on_algorithm_change,
                                                 height=35,
@@ -736,6 +1145,35 @@ class CPUSchedulerApp(ctk.CTk):
         self.quantum_entry.insert(0, "20")
         self.quantum_entry.pack(side="left", padx=5)
         
+        # Multi-CPU (SMP) options
+        self.cpu_frame = ctk.CTkFrame(algo_frame, fg_color="transparent")
+        self.cpu_frame.pack(pady=(0, 10), padx=10, fill="x")
+        cpu_row = ctk.CTkFrame(self.cpu_frame, fg_color="transparent")
+        cpu_row.pack(fill="x")
+        ctk.CTkLabel(cpu_row, text="CPUs:",
+                    font=ctk.CTkFont(size=12)).pack(side="left", padx=5)
+        self.cpus_entry = ctk.CTkEntry(cpu_row, width=50, height=30)
+        self.cpus_entry.insert(0, "1")
+        self.cpus_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(cpu_row, text="Migration:",
+                    font=ctk.CTkFont(size=12)).pack(side="left", padx=5)
+        self.migration_entry = ctk.CTkEntry(cpu_row, width=50, height=30)
+        self.migration_entry.insert(0, "0")
+        self.migration_entry.pack(side="left", padx=5)
+        switch_row = ctk.CTkFrame(self.cpu_frame, fg_color="transparent")
+        switch_row.pack(fill="x", pady=(5, 0))
+        ctk.CTkLabel(switch_row, text="Context switch cost:",
+                    font=ctk.CTkFont(size=12)).pack(side="left", padx=5)
+        self.switch_entry = ctk.CTkEntry(switch_row, width=50, height=30)
+        self.switch_entry.insert(0, "0")
+        self.switch_entry.pack(side="left", padx=5)
+        
+        self.queue_var = ctk.StringVar(value="Global queue")
+        ctk.CTkOptionMenu(self.cpu_frame, values=list(QUEUE_OPTIONS),
+                         variable=self.queue_var,
+                         height=30, font=ctk.CTkFont(size=12),
+                         corner_radius=8).pack(pady=(5, 0), padx=5, fill="x")
+        
         # Action Buttons
         action_frame = ctk.CTkFrame(left_frame, fg_color="transparent")
         action_frame.pack(pady=20, padx=20, fill="x")
@@ -754,6 +1192,31 @@ class CPUSchedulerApp(ctk.CTk):
                                          corner_radius=10)
         self.reset_button.pack(pady=5, padx=10, fill="x")
         
+        # Profiling Section
+        profile_frame = ctk.CTkFrame(left_frame, fg_color=("#2B2B2B", "#1E1E1E"))
+        profile_frame.pack(pady=10, padx=20, fill="x")
+        
+        ctk.CTkLabel(profile_frame, text="Profiling",
+                    font=ctk.CTkFont(size=15, weight="bold")).pack(pady=10, padx=10)
+        
+        self.profile_var = ctk.BooleanVar(value=False)
+        self.cprofile_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(profile_frame, text="Collect stage timings",
+                       variable=self.profile_var, command=self.toggle_profiling,
+                       font=ctk.CTkFont(size=12)).pack(pady=(0, 5), padx=20, anchor="w")
+        ctk.CTkCheckBox(profile_frame, text="Capture cProfile data",
+                       variable=self.cprofile_var, command=self.toggle_profiling,
+                       font=ctk.CTkFont(size=12)).pack(pady=(0, 5), padx=20, anchor="w")
+        
+        profile_buttons = ctk.CTkFrame(profile_frame, fg_color="transparent")
+        profile_buttons.pack(pady=(5, 10), padx=15, fill="x")
+        ctk.CTkButton(profile_buttons, text="📊 Profile", command=self.show_profile,
+                     height=32, width=120, font=ctk.CTkFont(size=12),
+                     corner_radius=8).pack(side="left", padx=5, expand=True, fill="x")
+        ctk.CTkButton(profile_buttons, text="💾 Export pstats", command=self.export_profile,
+                     height=32, width=120, font=ctk.CTkFont(size=12),
+                     corner_radius=8).pack(side="left", padx=5, expand=True, fill="x")
+        
         # Info Section
         info_frame = ctk.CTkFrame(left_frame, fg_color=("#2B2B2B", "#1E1E1E"))
         info_frame.pack(pady=10, padx=20, fill="both", expand=True)
@@ -775,6 +1238,62 @@ class CPUSchedulerApp(ctk.CTk):
                     font=ctk.CTkFont(size=11), 
                     text_color="#CCCCCC").pack(pady=5, padx=15)
     
+    def toggle_profiling(self):
+        """Turn the shared profiler on or off to match the checkboxes"""
+        if self.profile_var.get() or self.cprofile_var.get():
+            self.profile_var.set(True)
+            profiler.enable(cprofile=self.cprofile_var.get())
+        else:
+            profiler.disable()
+    
+    def show_profile(self):
+        """Show the stage timings, counters and phase split in a window"""
+        window = ctk.CTkToplevel(self)
+        window.title("Profile")
+        window.geometry("560x480")
+        window.transient(self)
+        
+        textbox = ctk.CTkTextbox(window, font=ctk.CTkFont(family="Courier", size=12))
+        textbox.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+        
+        def refresh():
+            report = profiler.report()
+            text = format_report(report) if report["stages"] else \
+                "Nothing collected yet.\nEnable profiling and run a simulation."
+            textbox.configure(state="normal")
+            textbox.delete("1.0", "end")
+            textbox.insert("1.0", text)
+            textbox.configure(state="disabled")
+        
+        def reset():
+            profiler.reset()
+            refresh()
+        
+        buttons = ctk.CTkFrame(window, fg_color="transparent")
+        buttons.pack(pady=(5, 10), padx=10, fill="x")
+        ctk.CTkButton(buttons, text="🔄 Refresh", command=refresh,
+                     height=32, corner_radius=8).pack(side="left", padx=5, expand=True, fill="x")
+        ctk.CTkButton(buttons, text="🗑 Reset", command=reset,
+                     fg_color="#dc3545", hover_color="#c82333",
+                     height=32, corner_radius=8).pack(side="left", padx=5, expand=True, fill="x")
+        refresh()
+    
+    def export_profile(self):
+        """Save the collected cProfile data as a pstats file"""
+        if profiler.stats is None:
+            messagebox.showwarning("No Profile Data",
+                                   "Enable 'Capture cProfile data' and run a simulation first!")
+            return
+        path = filedialog.asksaveasfilename(title="Export pstats", defaultextension=".pstats",
+                                            filetypes=[("pstats files", "*.pstats"),
+                                                       ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            profiler.dump_stats(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not write {path}:\n{e}")
+    
     def setup_right_panel(self):
         """Setup the right data and results panel"""
         self.right_frame = ctk.CTkScrollableFrame(self, fg_color="transparent")
@@ -787,13 +1306,19 @@ class CPUSchedulerApp(ctk.CTk):
     
     def on_algorithm_change(self, choice):
         """Handle algorithm selection change"""
-        if choice == "Round Robin":
-            self.quantum_frame.pack(pady=5, padx=10, fill="x")
+        if choice in QUANTUM_ALGORITHMS:
+            self.quantum_frame.pack(pady=5, padx=10, fill="x", before=self.cpu_frame)
         else:
             self.quantum_frame.pack_forget()
     
     def fetch_processes(self):
         """Fetch currently running processes from the system"""
+        if self.live is not None:
+            self.stop_live_monitor(keep_processes=False)
+        if self.cancel_event is not None:
+            self.cancel_simulation()
+        self.simulators = {}
+        
         # Auto-reset if processes already exist
         if self.processes:
             # Clear existing data automatically
@@ -809,6 +1334,16 @@ class CPUSchedulerApp(ctk.CTk):
                 if widget != self.process_title:
                     widget.destroy()
         
+        # Read fetch options in the main thread
+        try:
+            limit = int(self.limit_entry.get())
+            if limit <= 0:
+                raise ValueError("Process limit must be positive")
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid process limit!")
+            return
+        top_by_cpu = self.top_cpu_var.get()
+        
         # Show loading screen
         self.show_loading("Fetching processes from your PC...")
         
@@ -816,46 +1351,30 @@ class CPUSchedulerApp(ctk.CTk):
         self.fetch_button.configure(state="disabled")
         
         # Run fetch in separate thread to avoid freezing UI
-        thread = threading.Thread(target=self._do_fetch_processes, daemon=True)
+        thread = threading.Thread(target=self._do_fetch_processes, args=(limit, top_by_cpu),
+                                  daemon=True)
         thread.start()
     
-    def _do_fetch_processes(self):
+    def _do_fetch_processes(self, limit, top_by_cpu):
         """Actually fetch the processes in background thread"""
         try:
             processes = []
             
-            # Get all running processes
-            for proc in psutil.process_iter(['pid', 'name', 'nice', 'cpu_percent']):
-                try:
-                    pid = proc.info['pid']
-                    name = proc.info['name']
-                    priority = proc.info['nice'] if proc.info['nice'] is not None else 0
-                    
-                    # Generate burst time between 0-100
-                    try:
-                        cpu_percent = proc.cpu_percent(interval=0.1)
-                    except:
-                        cpu_percent = 0
-                    
-                    # Generate burst time: weighted by CPU usage with randomization
-                    base_burst = random.randint(5, 50)
-                    cpu_influence = int(cpu_percent / 2) if cpu_percent > 0 else 0
-                    burst_time = min(100, max(0, base_burst + cpu_influence + random.randint(-10, 10)))
-                    
-                    process = Process(pid, name, priority, burst_time=burst_time, arrival_time=0)
-                    processes.append(process)
-                    
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            # Sample all running processes over a single CPU measurement window
+            samples = take_snapshot(interval=0.1, limit=limit, top_by_cpu=top_by_cpu,
+                                    workers=SNAPSHOT_WORKERS)
             
-            # Limit to first 30 processes
-            processes = processes[:30]
+            for sample in samples:
+                # Generate burst time: weighted by CPU usage with randomization
+                process = Process(sample.pid, sample.name, sample.nice,
+                                  burst_time=estimate_burst(sample.cpu_percent), arrival_time=0)
+                processes.append(process)
             
             # Update UI in main thread
             self.after(0, lambda: self._finish_fetch(processes))
             
         except Exception as e:
-            self.after(0, lambda: self._fetch_error(str(e)))
+            self.after(0, lambda message=str(e): self._fetch_error(message))
     
     def _finish_fetch(self, processes):
         """Complete the fetch operation in main thread"""
@@ -871,6 +1390,222 @@ class CPUSchedulerApp(ctk.CTk):
         self.fetch_button.configure(state="normal")
         messagebox.showerror("Error", f"Failed to fetch processes: {error_msg}")
     
+    def toggle_live_monitor(self):
+        """Start the live monitor, or stop it if it is running"""
+        if self.live is not None:
+            self.stop_live_monitor()
+            return
+        
+        options = self._live_options()
+        if options is None:
+            return
+        algorithm, time_quantum, limit, interval = options
+        
+        recorder = None
+        if self.record_var.get():
+            path = filedialog.asksaveasfilename(title="Record samples to",
+                                                defaultextension=".snap",
+                                                filetypes=[("Snapshot logs", "*.snap"),
+                                                           ("All files", "*.*")])
+            if not path:
+                return
+            try:
+                recorder = SnapshotWriter(path, append=True)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Error", f"Could not open {path}:\n{e}")
+                return
+        
+        live = LiveSimulation(ALGORITHM_NAMES[algorithm], time_quantum, interval,
+                              limit=limit, top_by_cpu=self.top_cpu_var.get())
+        live.recorder = recorder
+        self._start_live_view(live, f"📡 Live Monitor - {algorithm}", "Sampling processes...")
+        live.start(lambda update: self.after(0, lambda: self._apply_live_update(live, update)),
+                   lambda error: self.after(
+                       0, lambda message=str(error): self._live_error(live, message)))
+    
+    def replay_recording(self):
+        """Replay a recorded snapshot log through the selected algorithm"""
+        options = self._live_options()
+        if options is None:
+            return
+        algorithm, time_quantum, limit, _ = options
+        
+        path = filedialog.askopenfilename(title="Replay snapshot log",
+                                          filetypes=[("Snapshot logs", "*.snap"),
+                                                     ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            log = SnapshotLog(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not read {path}:\n{e}")
+            return
+        if not len(log):
+            log.close()
+            messagebox.showwarning("Warning", "The log contains no samples!")
+            return
+        
+        # A fixed seed gives the same burst times on every replay
+        live = LiveSimulation(ALGORITHM_NAMES[algorithm], time_quantum,
+                              limit=limit, top_by_cpu=self.top_cpu_var.get(), seed=0)
+        self._start_live_view(live, f"⏯ Replay - {algorithm}", f"Replaying {len(log)} samples...")
+        thread = threading.Thread(target=self._do_replay,
+                                 args=(live, log, self.realtime_var.get()),
+                                 daemon=True)
+        thread.start()
+    
+    def _do_replay(self, live, log, realtime):
+        """Replay a log (in background thread) and post every tick to the UI"""
+        try:
+            with log:
+                replay(log, live, realtime,
+                       on_update=lambda update: self.after(
+                           0, lambda: self._apply_live_update(live, update)))
+            if not live.stop_event.is_set():
+                update = live.finish()
+                self.after(0, lambda: self._finish_replay(live, update))
+        except Exception as e:
+            self.after(0, lambda message=str(e): self._live_error(live, message))
+    
+    def _finish_replay(self, live, update):
+        """Show the end of a replay and keep its processes (main thread)"""
+        if live is not self.live:
+            return
+        self._apply_live_update(live, update)
+        self.stop_live_monitor()
+    
+    def _live_options(self):
+        """(algorithm, time_quantum, limit, interval) for live mode, or None after an error"""
+        algorithm = self.algorithm_var.get()
+        if ALGORITHM_NAMES[algorithm] not in ONLINE_ALGORITHMS:
+            messagebox.showerror("Error", "Live monitoring supports FCFS, SJF, Priority "
+                                          "and Round Robin!")
+            return None
+        try:
+            limit = int(self.limit_entry.get())
+            interval = float(self.interval_entry.get())
+            time_quantum = int(self.quantum_entry.get()) if algorithm in QUANTUM_ALGORITHMS else None
+            if limit <= 0 or interval <= 0 or (time_quantum is not None and time_quantum <= 0):
+                raise ValueError("Limit, interval and time quantum must be positive")
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid process limit, interval "
+                                          "and time quantum!")
+            return None
+        return algorithm, time_quantum, limit, interval
+    
+    def _start_live_view(self, live, title, status):
+        """Clear the panel and show an empty live table and Gantt chart for live"""
+        if self.cancel_event is not None:
+            self.cancel_simulation()
+        self.processes = []
+        self.simulators = {}
+        if self.process_table:
+            self.process_table.destroy()
+            self.process_table = None
+        for widget in self.right_frame.winfo_children():
+            if widget != self.process_title:
+                widget.destroy()
+        
+        # Live view: status line, process table and a growing Gantt chart
+        live_header = ctk.CTkFrame(self.right_frame, fg_color=("#1E1E1E", "#0D0D0D"),
+                                  corner_radius=10)
+        live_header.pack(pady=15, fill="x", padx=10)
+        ctk.CTkLabel(live_header, text=title,
+                    font=ctk.CTkFont(size=22, weight="bold"),
+                    text_color="#4ECDC4").pack(pady=(15, 5))
+        self.live_status = ctk.CTkLabel(live_header, text=status,
+                                       font=ctk.CTkFont(size=12), text_color="#CCCCCC")
+        self.live_status.pack(pady=(0, 15))
+        
+        table_container = ctk.CTkFrame(self.right_frame, fg_color=("#2B2B2B", "#1E1E1E"))
+        table_container.pack(pady=10, fill="both", expand=False, padx=10)
+        self.live_table = SortableTable(table_container, LIVE_HEADERS,
+                                       column_types={"PID": "numeric", "Process Name": "text",
+                                                     "OS Priority": "numeric", "CPU %": "numeric",
+                                                     "Arrival": "numeric", "Burst Time": "numeric",
+                                                     "State": "text"},
+                                       fg_color="transparent")
+        self.live_table.pack(fill="both", expand=True, padx=5, pady=5)
+        self.live_table.set_data([])
+        
+        gantt_container = ctk.CTkFrame(self.right_frame, fg_color=("#2B2B2B", "#1E1E1E"),
+                                      corner_radius=10)
+        gantt_container.pack(pady=15, fill="both", expand=True, padx=10)
+        self.gantt_chart = InteractiveGanttChart(gantt_container, fg_color="transparent")
+        self.gantt_chart.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        self.live = live
+        self.live_rows = {}
+        self.live_arrivals = []
+        self.live_done = 0
+        self.live_button.configure(text="⏹ Stop Live Monitor",
+                                   fg_color="#dc3545", hover_color="#c82333")
+        self.fetch_button.configure(state="disabled")
+        self.replay_button.configure(state="disabled")
+        self.run_button.configure(state="disabled")
+    
+    def _apply_live_update(self, live, update):
+        """Apply one tick of the live monitor to the table and Gantt chart (main thread)"""
+        if live is not self.live:
+            return
+        
+        # Exits refer to the old row of a PID that is reused in this tick
+        changed = {}
+        for pid in update.exited:
+            changed.setdefault(self.live_rows[pid], {})[3] = "exited"
+        
+        # New processes get a row; a reused PID gets a new one
+        added = []
+        for pid, name, priority, cpu_percent, arrival, burst in update.arrivals:
+            self.live_rows[pid] = len(self.live_arrivals)
+            self.live_arrivals.append((pid, name, priority, arrival, burst))
+            name_display = name[:25] + "..." if len(name) > 25 else name
+            added.append([pid, name_display, priority, cpu_percent, arrival, burst, "waiting"])
+        
+        # Only the cells that changed are touched
+        for pid, cpu_percent in update.cpu.items():
+            changed.setdefault(self.live_rows[pid], {})[3] = cpu_percent
+        for pid, (state, remaining, completion) in update.states.items():
+            text = f"done at {completion}" if state == "done" else f"{state} ({remaining} left)"
+            changed.setdefault(self.live_rows[pid], {})[6] = text
+        self.live_table.update_rows(changed, added)
+        
+        pids, starts, ends = update.segments
+        if pids:
+            self.gantt_chart.extend_data(pids, starts, ends)
+        
+        self.live_done += len(update.completed)
+        self.live_status.configure(
+            text=f"Simulated time {update.time}   •   {len(self.live_arrivals)} processes   •   "
+                 f"{len(self.live_arrivals) - self.live_done} in the system   •   "
+                 f"{self.live_done} completed")
+    
+    def _live_error(self, live, error_msg):
+        """Stop the live monitor after a sampling error (main thread)"""
+        if live is not self.live:
+            return
+        self.stop_live_monitor(keep_processes=False)
+        messagebox.showerror("Error", f"Live monitoring failed: {error_msg}")
+    
+    def stop_live_monitor(self, keep_processes=True):
+        """Stop sampling; the processes seen so far can then be simulated offline
+        
+        With keep_processes they become the process list, with their real
+        arrival times, so other algorithms can be run on the same workload.
+        """
+        self.live.stop()
+        self.live = None
+        self.live_button.configure(text="📡 Start Live Monitor",
+                                   fg_color=("#3B8ED0", "#1F6AA5"),
+                                   hover_color=("#36719F", "#144870"))
+        self.fetch_button.configure(state="normal")
+        self.replay_button.configure(state="normal")
+        self.run_button.configure(state="normal")
+        if keep_processes and self.live_arrivals:
+            self.processes = [Process(pid, name, priority, burst_time=burst, arrival_time=arrival)
+                              for pid, name, priority, arrival, burst in self.live_arrivals]
+            self.display_process_table()
+    
     def display_process_table(self):
         """Display the process table with sortable columns and editable burst times"""
         # Clear existing table
@@ -891,6 +1626,8 @@ class CPUSchedulerApp(ctk.CTk):
         # Create sortable table with editable burst time column
         self.process_table = SortableTable(table_container, headers, 
                                           editable_columns=["Burst Time"],
+                                          column_types={"PID": "numeric", "Process Name": "text",
+                                                        "OS Priority": "numeric", "Burst Time": "numeric"},
                                           fg_color="transparent")
         self.process_table.pack(fill="both", expand=True, padx=5, pady=5)
         self.process_table.set_data(table_data)
@@ -920,30 +1657,165 @@ class CPUSchedulerApp(ctk.CTk):
             messagebox.showwarning("Warning", "No processes with valid burst times!")
             return
         
-        # Run simulation
+        # Read options in the main thread
         algorithm = self.algorithm_var.get()
-        simulator = SchedulingSimulator()
-        
-        try:
-            if algorithm == "FCFS":
-                results, gantt_chart = simulator.fcfs(valid_processes)
-            elif algorithm == "SJF (Preemptive)":
-                results, gantt_chart = simulator.sjf_preemptive(valid_processes)
-            elif algorithm == "Priority (Preemptive)":
-                results, gantt_chart = simulator.priority_preemptive(valid_processes)
-            elif algorithm == "Round Robin":
+        time_quantum = None
+        if algorithm in QUANTUM_ALGORITHMS:
+            try:
                 time_quantum = int(self.quantum_entry.get())
                 if time_quantum <= 0:
                     raise ValueError("Time quantum must be positive")
-                results, gantt_chart = simulator.round_robin(valid_processes, time_quantum)
-            
-            self.display_results(results, gantt_chart, algorithm)
-            
-        except Exception as e:
+            except ValueError as e:
+                messagebox.showerror("Error", f"Simulation failed: {str(e)}")
+                return
+        try:
+            cpus = int(self.cpus_entry.get())
+            migration_cost = int(self.migration_entry.get())
+            switch_cost = int(self.switch_entry.get())
+            if cpus < 1 or migration_cost < 0 or switch_cost < 0:
+                raise ValueError("CPUs must be at least 1 and costs not negative")
+        except ValueError as e:
             messagebox.showerror("Error", f"Simulation failed: {str(e)}")
+            return
+        table = ProcessTable.from_processes(valid_processes)
+        
+        if cpus > 1:
+            if ALGORITHM_NAMES[algorithm] not in SMPSimulator.ALGORITHMS:
+                messagebox.showerror("Error", f"{algorithm} only runs on a single CPU")
+                return
+            queues, stealing = QUEUE_OPTIONS[self.queue_var.get()]
+            simulator = SMPSimulator(ALGORITHM_NAMES[algorithm], cpus, time_quantum,
+                                     queues, stealing, migration_cost, switch_cost)
+            self.prepare_results(f"{algorithm} on {cpus} CPUs")
+            self.cancel_event = threading.Event()
+            self.run_button.configure(state="disabled")
+            self.show_loading("Running simulation...")
+            thread = threading.Thread(target=self._do_run_smp,
+                                     args=(simulator, table, self.cancel_event),
+                                     daemon=True)
+            thread.start()
+            return
+        
+        options = {"switch_cost": switch_cost} if switch_cost else {}
+        key = workload_key(ALGORITHM_NAMES[algorithm], table, time_quantum, **options)
+        cached = self.result_cache.get(key, table)
+        if cached is not None:
+            result, gantt_chart = cached
+            self.display_results(result.to_processes(), gantt_chart, algorithm)
+            return
+        
+        # Run the engine in a thread; the Gantt chart fills in as it goes
+        self.prepare_results(algorithm)
+        self.cancel_event = threading.Event()
+        self.run_button.configure(state="disabled")
+        self.show_loading("Running simulation...", cancel_command=self.cancel_simulation)
+        
+        # Re-runs after edits resume from the checkpoints of the last run
+        name = ALGORITHM_NAMES[algorithm]
+        simulator = self.simulators.get((name, time_quantum, switch_cost))
+        if simulator is None:
+            simulator = IncrementalSimulator(name, time_quantum, **options)
+            self.simulators[name, time_quantum, switch_cost] = simulator
+        
+        thread = threading.Thread(target=self._do_run_simulation,
+                                 args=(name, time_quantum, simulator, table, key, self.cancel_event,
+                                       options),
+                                 daemon=True)
+        thread.start()
     
-    def display_results(self, results, gantt_chart, algorithm):
-        """Display simulation results"""
+    def _do_run_simulation(self, algorithm, time_quantum, simulator, table, key, cancel_event, options):
+        """Run the engine (in background thread) and post results to the UI"""
+        def progress(fraction, segments):
+            self.after(0, lambda: self._simulation_progress(cancel_event, fraction, segments))
+        
+        try:
+            result, gantt_chart = run_monitored(algorithm, table, time_quantum,
+                                                progress=progress, cancel=cancel_event,
+                                                simulator=simulator, **options)
+        except SimulationCancelled:
+            self.after(0, lambda: self._simulation_cancelled(cancel_event))
+        except Exception as e:
+            # e is unbound once the except block ends, so bind the message now
+            self.after(0, lambda message=str(e): self._simulation_failed(cancel_event, message))
+        else:
+            self.after(0, lambda: self._finish_simulation(cancel_event, key, result, gantt_chart))
+    
+    def _do_run_smp(self, simulator, table, cancel_event):
+        """Run a multi-CPU simulation (in background thread)"""
+        try:
+            result, lanes = simulator.run(table)
+        except Exception as e:
+            self.after(0, lambda message=str(e): self._simulation_failed(cancel_event, message))
+        else:
+            self.after(0, lambda: self._finish_smp_simulation(cancel_event, result, lanes))
+    
+    def _finish_smp_simulation(self, cancel_event, result, lanes):
+        """Show a multi-CPU run with a lane selector for its Gantt chart (main thread)"""
+        if cancel_event is not self.cancel_event:
+            return
+        self.hide_loading()
+        self.run_button.configure(state="normal")
+        if cancel_event.is_set():
+            return
+        
+        lane_names = [f"CPU {c}" for c in range(len(lanes))]
+        lane_var = ctk.StringVar(value=lane_names[0])
+        ctk.CTkOptionMenu(self.gantt_chart.master, values=lane_names, variable=lane_var,
+                         command=lambda name: self.gantt_chart.set_data(lanes[lane_names.index(name)]),
+                         width=140, height=30).pack(before=self.gantt_chart, pady=(10, 0), padx=10,
+                                                    anchor="w")
+        self.gantt_chart.set_data(lanes[0])
+        
+        results = result.to_processes()
+        self.display_kpis(results, lanes[0], smp_metrics(result, lanes))
+        self.display_results_table(results)
+    
+    def _simulation_progress(self, cancel_event, fraction, segments):
+        """Show progress and the Gantt segments finished so far (main thread)"""
+        if cancel_event.is_set() or cancel_event is not self.cancel_event:
+            return
+        self.update_loading(f"{fraction:.0%} of work simulated")
+        self.gantt_chart.extend_data(*segments)
+    
+    def _finish_simulation(self, cancel_event, key, result, gantt_chart):
+        """Cache and show the results of a completed run (main thread)"""
+        self.result_cache.put(key, result, gantt_chart)
+        if cancel_event is not self.cancel_event:
+            return
+        self.hide_loading()
+        self.run_button.configure(state="normal")
+        if cancel_event.is_set():
+            return
+        
+        results = result.to_processes()
+        self.gantt_chart.set_data(gantt_chart)
+        self.display_kpis(results, gantt_chart)
+        self.display_results_table(results)
+    
+    def _simulation_cancelled(self, cancel_event):
+        """Clean up after a cancelled run (main thread)"""
+        if cancel_event is not self.cancel_event:
+            return
+        self.hide_loading()
+        self.run_button.configure(state="normal")
+    
+    def _simulation_failed(self, cancel_event, error):
+        """Report a failed run (main thread)"""
+        if cancel_event is not self.cancel_event:
+            return
+        self.hide_loading()
+        self.run_button.configure(state="normal")
+        messagebox.showerror("Error", f"Simulation failed: {error}")
+    
+    def cancel_simulation(self):
+        """Stop the running simulation at its next checkpoint"""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        self.hide_loading()
+        self.run_button.configure(state="normal")
+    
+    def prepare_results(self, algorithm):
+        """Clear the results panel and add the header and an empty Gantt chart"""
         # Clear previous results
         for widget in self.right_frame.winfo_children():
             if widget != self.process_title and widget != self.process_table.master:
@@ -966,6 +1838,10 @@ class CPUSchedulerApp(ctk.CTk):
         
         self.gantt_chart = InteractiveGanttChart(gantt_container, fg_color="transparent")
         self.gantt_chart.pack(fill="both", expand=True, padx=5, pady=5)
+    
+    def display_results(self, results, gantt_chart, algorithm):
+        """Display simulation results"""
+        self.prepare_results(algorithm)
         self.gantt_chart.set_data(gantt_chart)
         
         # KPIs
@@ -974,8 +1850,11 @@ class CPUSchedulerApp(ctk.CTk):
         # Results Table
         self.display_results_table(results)
     
-    def display_kpis(self, results, gantt_chart):
-        """Display Key Performance Indicators in single row"""
+    def display_kpis(self, results, gantt_chart, kpis=None):
+        """Display Key Performance Indicators in two rows
+        
+        kpis can be passed in precomputed, e.g. from smp_metrics.
+        """
         kpi_container = ctk.CTkFrame(self.right_frame, fg_color="transparent")
         kpi_container.pack(pady=15, fill="x", padx=10)
         
@@ -983,15 +1862,10 @@ class CPUSchedulerApp(ctk.CTk):
                     font=ctk.CTkFont(size=18, weight="bold")).pack(pady=10)
         
         # Calculate metrics
-        total_time = max([end for _, _, end in gantt_chart])
-        idle_time = sum([end - start for pid, start, end in gantt_chart if pid == "IDLE"])
-        cpu_utilization = ((total_time - idle_time) / total_time * 100) if total_time > 0 else 0
+        if kpis is None:
+            kpis = compute_kpis(results, gantt_chart)
         
-        throughput = len(results) / total_time if total_time > 0 else 0
-        avg_turnaround = sum([p.turnaround_time for p in results]) / len(results)
-        avg_waiting = sum([p.waiting_time for p in results]) / len(results)
-        
-        # Display metrics in single row (1x4 layout)
+        # Display metrics in rows of four
         metrics_grid = ctk.CTkFrame(kpi_container, fg_color="transparent")
         metrics_grid.pack(pady=10, padx=20, fill="x")
         
@@ -1000,16 +1874,23 @@ class CPUSchedulerApp(ctk.CTk):
             metrics_grid.grid_columnconfigure(i, weight=1)
         
         metrics = [
-            ("CPU Utilization", f"{cpu_utilization:.2f}%", "#28a745"),
-            ("Throughput", f"{throughput:.3f} proc/unit", "#4ECDC4"),
-            ("Avg Turnaround", f"{avg_turnaround:.2f} units", "#FFA07A"),
-            ("Avg Waiting", f"{avg_waiting:.2f} units", "#BB8FCE")
+            ("CPU Utilization", f"{kpis['cpu_utilization']:.2f}%", "#28a745"),
+            ("Throughput", f"{kpis['throughput']:.3f} proc/unit", "#4ECDC4"),
+            ("Avg Turnaround", f"{kpis['avg_turnaround']:.2f} units", "#FFA07A"),
+            ("Avg Waiting", f"{kpis['avg_waiting']:.2f} units", "#BB8FCE"),
+            ("Avg Response", f"{kpis['avg_response']:.2f} units", "#45B7D1"),
+            ("P95 Waiting", f"{kpis['p95_waiting']:.2f} units", "#F7DC6F"),
+            ("Max Waiting", f"{kpis['max_waiting']} units", "#FF6B6B"),
+            ("Jain Fairness", f"{kpis['jain_fairness']:.3f}", "#98D8C8"),
+            ("Effective Util.", f"{kpis['effective_utilization']:.2f}%", "#2ECC71"),
+            ("Context Switches", f"{kpis['context_switches']}", "#E67E22"),
+            ("Switch Overhead", f"{kpis['switch_time']} units", "#E59866")
         ]
         
         for idx, (label, value, color) in enumerate(metrics):
             card = ctk.CTkFrame(metrics_grid, fg_color=("#2B2B2B", "#1E1E1E"),
                                corner_radius=10, height=100)
-            card.grid(row=0, column=idx, padx=10, pady=0, sticky="ew")
+            card.grid(row=idx // 4, column=idx % 4, padx=10, pady=(0, 10), sticky="ew")
             
             ctk.CTkLabel(card, text=label, 
                         font=ctk.CTkFont(size=13, weight="bold"),
@@ -1018,6 +1899,13 @@ class CPUSchedulerApp(ctk.CTk):
             ctk.CTkLabel(card, text=value, 
                         font=ctk.CTkFont(size=20, weight="bold"), 
                         text_color=color).pack(pady=(0, 15))
+        
+        if "per_cpu_utilization" in kpis:
+            per_cpu = "   ".join(f"CPU {c}: {u:.1f}%"
+                                 for c, u in enumerate(kpis["per_cpu_utilization"]))
+            ctk.CTkLabel(kpi_container, text=f"Per-CPU Utilization   {per_cpu}",
+                        font=ctk.CTkFont(size=12), text_color="#CCCCCC",
+                        wraplength=1000, justify="left").pack(pady=(0, 10), padx=20)
     
     def display_results_table(self, results):
         """Display detailed results table with sorting"""
@@ -1038,13 +1926,21 @@ class CPUSchedulerApp(ctk.CTk):
         
         # Create sortable table
         self.results_table = SortableTable(table_container, headers,
+                                          column_types={"PID": "numeric", "Process Name": "text",
+                                                        "Completion": "numeric", "Turnaround": "numeric",
+                                                        "Waiting": "numeric"},
                                           fg_color="transparent")
         self.results_table.pack(fill="both", expand=True, padx=10, pady=10)
         self.results_table.set_data(table_data)
     
     def reset_data(self):
         """Reset all data and clear the interface"""
+        if self.live is not None:
+            self.stop_live_monitor(keep_processes=False)
+        if self.cancel_event is not None:
+            self.cancel_simulation()
         self.processes = []
+        self.simulators = {}
         
         # Clear tables
         if self.process_table:
@@ -0,0 +1,10 @@
+"""Headless CPU scheduling core
+
+Pure-Python process model and scheduling engines, importable without
+customtkinter, tkinter or psutil.
+"""
+
+from .process import Process
+from .simulator import SchedulingSimulator
+
+__all__ = ["Process", "SchedulingSimulator"]
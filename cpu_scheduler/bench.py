@@ -0,0 +1,171 @@
+"""Engine benchmarks over synthetic workloads
+
+run_benchmarks times every engine on workloads of growing size from
+workload.generate and reports the best wall time of `repeat` runs,
+processes per second and the peak memory the run allocated. Memory is
+measured with tracemalloc in a separate run, since tracing slows the
+engine down about tenfold, and only up to memory_max_n processes. An
+engine is not run at a size its last two timings extrapolate to taking
+longer than max_seconds, which keeps the quadratic reference engines in
+check.
+
+Results can be saved as a JSON baseline and later compared against: a
+run that got slower than the baseline by more than the tolerance, or
+whose makespan changed, is reported as a regression.
+"""
+import json
+import math
+import platform
+import time
+import tracemalloc
+
+from .simulator import SchedulingSimulator
+from .workload import generate
+
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+MEMORY_MAX_N = 100_000
+BASELINE_FORMAT = 1
+# Runs faster than this in the baseline are too noisy to compare
+MIN_COMPARE_SECONDS = 0.01
+
+
+def _table_engine(algorithm):
+    def run(table, processes, time_quantum):
+        return SchedulingSimulator.run_table(algorithm, table, time_quantum)[1].total_time
+    return run
+
+
+def _reference_engine(method, quantum=False):
+    def run(table, processes, time_quantum):
+        engine = getattr(SchedulingSimulator, method)
+        _, gantt_chart = engine(processes, time_quantum) if quantum else engine(processes)
+        return max((end for _, _, end in gantt_chart), default=0)
+    return run
+
+
+# Table engines by their short names, plus the original Process-object engines
+ENGINES = {name: _table_engine(name) for name in SchedulingSimulator.ALGORITHMS}
+ENGINES.update({
+    "ref-fcfs": _reference_engine("fcfs"),
+    "ref-sjf": _reference_engine("sjf_preemptive"),
+    "ref-priority": _reference_engine("priority_preemptive"),
+    "ref-rr": _reference_engine("round_robin", quantum=True),
+})
+
+
+def _predicted_seconds(history, n):
+    """Extrapolate the time at size n from the (n, seconds) measured so far"""
+    if not history:
+        return 0.0
+    n1, t1 = history[-1]
+    exponent = 1.0
+    if len(history) > 1:
+        n0, t0 = history[-2]
+        if t0 > 0 and t1 > 0:
+            exponent = max(1.0, math.log(t1 / t0) / math.log(n1 / n0))
+    return t1 * (n / n1) ** exponent
+
+
+def run_benchmarks(sizes=SIZES, algorithms=None, workload=None, time_quantum=4, repeat=3,
+                   max_seconds=30.0, memory_max_n=MEMORY_MAX_N, progress=None):
+    """Time each engine at each size and return one row per (engine, size)
+
+    workload holds keyword arguments for workload.generate (arrivals,
+    bursts, priorities, seed, ...). peak_memory is None above
+    memory_max_n processes (pass 0 to skip it). progress, if given, is
+    called with every row as soon as it is measured.
+    """
+    algorithms = list(algorithms or ENGINES)
+    for algorithm in algorithms:
+        if algorithm not in ENGINES:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+    workload = workload or {}
+    rows = []
+    history = {algorithm: [] for algorithm in algorithms}
+    for n in sorted(set(sizes)):
+        active = [a for a in algorithms if _predicted_seconds(history[a], n) <= max_seconds]
+        if not active:
+            break
+        table = generate(n, **workload)
+        processes = table.to_processes() if any(a.startswith("ref-") for a in active) else None
+        for algorithm in active:
+            engine = ENGINES[algorithm]
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                makespan = engine(table, processes, time_quantum)
+                elapsed = time.perf_counter() - started
+                if best is None or elapsed < best:
+                    best = elapsed
+                if elapsed > max_seconds:
+                    break
+            history[algorithm].append((n, best))
+
+            row = {
+                "algorithm": algorithm,
+                "n": n,
+                "seconds": best,
+                "processes_per_second": n / best if best > 0 else 0,
+                "makespan": makespan,
+                "peak_memory": None,
+            }
+            if n <= memory_max_n:
+                tracemalloc.start()
+                try:
+                    engine(table, processes, time_quantum)
+                    row["peak_memory"] = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+            rows.append(row)
+            if progress is not None:
+                progress(row)
+    return rows
+
+
+def save_baseline(rows, path, workload=None, time_quantum=4):
+    """Write benchmark rows and the settings they were measured with to a JSON file"""
+    baseline = {
+        "format": BASELINE_FORMAT,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "workload": workload or {},
+        "time_quantum": time_quantum,
+        "results": rows,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def load_baseline(path):
+    """Read a JSON baseline written by save_baseline"""
+    with open(path) as f:
+        baseline = json.load(f)
+    if baseline.get("format") != BASELINE_FORMAT:
+        raise ValueError(f"{path} is not a benchmark baseline")
+    return baseline
+
+
+def compare_baseline(rows, baseline, tolerance=0.25):
+    """Return the rows that regressed against a baseline
+
+    Each entry is (row, baseline_row, reason). Rows without a baseline
+    counterpart are skipped.
+    """
+    previous = {(row["algorithm"], row["n"]): row for row in baseline["results"]}
+    regressions = []
+    for row in rows:
+        base = previous.get((row["algorithm"], row["n"]))
+        if base is None:
+            continue
+        if row["makespan"] != base["makespan"]:
+            regressions.append((row, base, f"makespan {base['makespan']} -> {row['makespan']}"))
+        elif base["seconds"] >= MIN_COMPARE_SECONDS and row["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append((row, base, f"{row['seconds'] / base['seconds']:.2f}x slower"))
+    return regressions
+
+
+def format_row(row):
+    """One line of the benchmark table"""
+    memory = f"{row['peak_memory'] / 2 ** 20:10.2f} MiB" if row["peak_memory"] is not None else ""
+    return (f"{row['algorithm']:<14}{row['n']:>10}{row['seconds']:>12.4f}s"
+            f"{row['processes_per_second']:>14.0f}/s{memory}")
@@ -0,0 +1,155 @@
+"""Memoized engine results keyed on a workload fingerprint
+
+The engines are deterministic, so a run is fully determined by the
+workload columns (pid, arrival, burst, priority), the algorithm and its
+parameters. ResultCache keys runs on a SHA-256 of exactly those, keeps the
+most recently used ones in memory and can also persist them to a
+directory, one binary file per run.
+"""
+import hashlib
+import os
+import struct
+from array import array
+from collections import OrderedDict
+
+from .gantt import ColumnarGantt
+from .simulator import SchedulingSimulator
+from .table import ScheduleResult
+
+MAGIC = b"CPURES02"
+# processes, segments, total_time, idle_time, switch_time, switches
+HEADER = struct.Struct("<qqqqqq")
+COLUMNS = ("pid", "arrival_time", "burst_time", "priority")
+
+
+def workload_key(algorithm, table, time_quantum=None, **options):
+    """Fingerprint of one run: workload columns plus algorithm and parameters
+
+    Names are left out since they do not affect the schedule, and the
+    quantum only counts for Round Robin and MLFQ. options are the extra
+    engine parameters passed to run_table.
+    """
+    digest = hashlib.sha256()
+    quantum = time_quantum if algorithm in ("rr", "mlfq") else ""
+    params = f"{algorithm}:{quantum}:{sorted(options.items())}:{len(table)}"
+    digest.update(params.encode())
+    for column in COLUMNS:
+        digest.update(getattr(table, column).tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """LRU cache of (ScheduleResult, ColumnarGantt) with an optional disk store
+
+    Entries hold copies of the output arrays, not the table they were
+    computed for, so a hit is rebound to the caller's table (and its
+    names). maxsize bounds the in-memory entries; directory, if given,
+    keeps every stored run on disk as well and is consulted on a miss.
+    """
+
+    def __init__(self, maxsize=32, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, table):
+        """Return (result, gantt) for key bound to table, or None on a miss"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        elif self.directory:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None or len(entry[0]) != len(table):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._unpack(entry, table)
+
+    def put(self, key, result, gantt_chart):
+        """Store a finished run under key"""
+        entry = (result.start_time[:], result.completion_time[:],
+                 gantt_chart.pid[:], gantt_chart.start[:], gantt_chart.end[:],
+                 gantt_chart.total_time, gantt_chart.idle_time,
+                 gantt_chart.switch_time, gantt_chart.switches)
+        self._remember(key, entry)
+        if self.directory:
+            self._save(key, entry)
+
+    def run(self, algorithm, table, time_quantum=None, **options):
+        """SchedulingSimulator.run_table, answered from the cache when possible"""
+        key = workload_key(algorithm, table, time_quantum, **options)
+        cached = self.get(key, table)
+        if cached is not None:
+            return cached
+        result, gantt_chart = SchedulingSimulator.run_table(algorithm, table, time_quantum, **options)
+        self.put(key, result, gantt_chart)
+        return result, gantt_chart
+
+    def clear(self):
+        """Drop the in-memory entries (the disk store is kept)"""
+        self.entries.clear()
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    @staticmethod
+    def _unpack(entry, table):
+        start_time, completion_time, pid, start, end, total_time, idle_time, switch_time, switches = entry
+        result = ScheduleResult(table)
+        result.start_time = start_time[:]
+        result.completion_time = completion_time[:]
+        gantt = ColumnarGantt()
+        gantt.pid, gantt.start, gantt.end = pid[:], start[:], end[:]
+        gantt.total_time = total_time
+        gantt.idle_time = idle_time
+        gantt.switch_time = switch_time
+        gantt.switches = switches
+        return result, gantt
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".res")
+
+    def _save(self, key, entry):
+        start_time, completion_time, pid, start, end, *totals = entry
+        path = self._path(key)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            f.write(HEADER.pack(len(start_time), len(pid), *totals))
+            for column in (start_time, completion_time, pid, start, end):
+                column.tofile(f)
+        os.replace(tmp, path)
+
+    def _load(self, key):
+        try:
+            f = open(self._path(key), "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                return None
+            n, segments, *totals = HEADER.unpack(header)
+            columns = []
+            try:
+                for count in (n, n, segments, segments, segments):
+                    column = array("q")
+                    column.fromfile(f, count)
+                    columns.append(column)
+            except EOFError:
+                return None
+        return (*columns, *totals)
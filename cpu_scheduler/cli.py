@@ -0,0 +1,546 @@
+import argparse
+import sys
+import time
+
+from .bench import ENGINES, MEMORY_MAX_N, SIZES, compare_baseline, format_row, load_baseline, run_benchmarks, save_baseline
+from .cache import ResultCache
+from .gantt import GanttFileSink, NullGantt
+from .metrics import StreamingMetrics, result_metrics, smp_metrics
+from .monitor import PRIME_SECONDS, UNITS_PER_SECOND, LiveSimulation
+from .profiling import format_report, profiler
+from .recording import SnapshotLog, SnapshotWriter, record, replay
+from .simulator import SchedulingSimulator
+from .online import ALGORITHMS as ONLINE_ALGORITHMS
+from .smp import QUEUE_MODES, SMPSimulator
+from .stream import STREAM_ENGINES, stream
+from .sweep import build_grid, parse_quanta, run_sweep, write_csv
+from .trace import iter_trace, read_table, sort_trace, write_binary
+from .verify import ALGORITHMS as VERIFY_ALGORITHMS, FAST_PATHS, check, supports
+from .workload import ARRIVALS, BURSTS, PRIORITY_MIXES, iter_workload
+
+
+def format_gantt(gantt_chart):
+    """Format a Gantt chart as one line per segment"""
+    lines = []
+    for pid, start, end in gantt_chart:
+        label = f"P{pid}" if pid not in ("IDLE", "SWITCH") else pid
+        lines.append(f"{start:>8} -> {end:<8} {label} ({end - start}u)")
+    return "\n".join(lines)
+
+
+def format_kpis(kpis):
+    """Format KPIs the way the GUI cards show them"""
+    lines = [
+        f"CPU Utilization: {kpis['cpu_utilization']:.2f}%",
+        f"Effective Util.: {kpis['effective_utilization']:.2f}%",
+        f"Throughput:      {kpis['throughput']:.3f} proc/unit",
+        f"Context Switches: {kpis['context_switches']} ({kpis['switch_time']} units overhead)",
+    ]
+    if kpis["processes"]:
+        lines += [
+            f"Avg Turnaround:  {kpis['avg_turnaround']:.2f} units",
+            f"Avg Waiting:     {kpis['avg_waiting']:.2f} units",
+            f"Avg Response:    {kpis['avg_response']:.2f} units",
+            f"Max Waiting:     {kpis['max_waiting']} units",
+        ]
+    if "p50_waiting" in kpis:
+        lines += [
+            f"Waiting p50/p95/p99:    {kpis['p50_waiting']:.2f} / {kpis['p95_waiting']:.2f}"
+            f" / {kpis['p99_waiting']:.2f}",
+            f"Turnaround p50/p95/p99: {kpis['p50_turnaround']:.2f} / {kpis['p95_turnaround']:.2f}"
+            f" / {kpis['p99_turnaround']:.2f}",
+        ]
+    if kpis["processes"]:
+        lines.append(f"Jain Fairness:   {kpis['jain_fairness']:.3f}")
+    if "per_cpu_utilization" in kpis:
+        lines.append("Per-CPU Utilization: " + " ".join(
+            f"CPU{c}={u:.1f}%" for c, u in enumerate(kpis["per_cpu_utilization"])))
+    return "\n".join(lines)
+
+
+def cmd_simulate(args):
+    """Run one simulation over a trace and print the timeline and metrics"""
+    if not (args.profile or args.profile_out):
+        return simulate(args)
+    profiler.enable(cprofile=bool(args.profile_out))
+    try:
+        status = simulate(args)
+    finally:
+        profiler.disable()
+    print()
+    print("Profile")
+    print(format_report(profiler.report()))
+    if args.profile_out:
+        profiler.dump_stats(args.profile_out)
+    return status
+
+
+def simulate(args):
+    table = read_table(args.trace)
+    if not len(table):
+        print("Trace contains no processes")
+        return 1
+
+    if args.cpus > 1:
+        return simulate_smp(args, table)
+    options = engine_options(args)
+    if args.cache_dir:
+        result, gantt_chart = ResultCache(directory=args.cache_dir).run(args.algo, table, args.quantum,
+                                                                        **options)
+    else:
+        result, gantt_chart = SchedulingSimulator.run_table(args.algo, table, args.quantum, **options)
+
+    if not args.no_gantt:
+        print("Gantt timeline")
+        print(format_gantt(gantt_chart))
+        print()
+    print("Key Performance Indicators")
+    print(format_kpis(result_metrics(result, gantt_chart)))
+    return 0
+
+
+def engine_options(args):
+    """Extra engine parameters given on the command line"""
+    options = {}
+    if args.switch_cost:
+        options["switch_cost"] = args.switch_cost
+    if args.algo == "mlfq":
+        if args.levels is not None and args.quantum is not None:
+            options["quanta"] = tuple(args.quantum << level for level in range(args.levels))
+        elif args.levels is not None:
+            options["quanta"] = tuple(2 << level for level in range(args.levels))
+        if args.boost_period is not None:
+            options["boost_period"] = args.boost_period
+    if args.algo == "cfs":
+        if args.latency is not None:
+            options["latency"] = args.latency
+        if args.min_granularity is not None:
+            options["min_granularity"] = args.min_granularity
+    return options
+
+
+def simulate_smp(args, table):
+    """Run one simulation on several CPUs and print one timeline per CPU"""
+    simulator = SMPSimulator(args.algo, args.cpus, args.quantum, args.queues,
+                             args.steal, args.migration_cost, args.switch_cost)
+    result, lanes = simulator.run(table)
+
+    if not args.no_gantt:
+        for c, lane in enumerate(lanes):
+            print(f"Gantt timeline - CPU {c}")
+            print(format_gantt(lane))
+            print()
+    print("Key Performance Indicators")
+    print(format_kpis(smp_metrics(result, lanes)))
+    return 0
+
+
+def cmd_sweep(args):
+    """Run a grid of algorithms and quanta over a trace and print a CSV table"""
+    table = read_table(args.trace)
+    if not len(table):
+        print("Trace contains no processes")
+        return 1
+
+    algorithms = [a for a in args.algos.split(",") if a]
+    for algorithm in algorithms:
+        if algorithm not in SchedulingSimulator.ALGORITHMS:
+            print(f"Unknown algorithm: {algorithm}")
+            return 1
+    points = build_grid(algorithms, parse_quanta(args.quanta))
+
+    cache = ResultCache(directory=args.cache_dir) if args.cache_dir else None
+    options = {"switch_cost": args.switch_cost} if args.switch_cost else {}
+    rows = run_sweep(table, points, args.workers, cache, **options)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_csv(rows, f)
+    else:
+        write_csv(rows, sys.stdout)
+    return 0
+
+
+def cmd_replay(args):
+    """Stream a trace through an engine and print running KPIs"""
+    metrics = StreamingMetrics()
+    gantt = GanttFileSink(args.gantt_out) if args.gantt_out else NullGantt()
+    try:
+        with gantt:
+            for record in stream(args.algo, iter_trace(args.trace), args.quantum, gantt,
+                                 **engine_options(args)):
+                metrics.add(record)
+    except ValueError as e:
+        print(f"Replay failed: {e}")
+        return 1
+    print("Key Performance Indicators")
+    print(format_kpis(metrics.kpis(gantt)))
+    return 0
+
+
+def live_simulation(args):
+    """LiveSimulation with the options shared by monitor and playback"""
+    return LiveSimulation(args.algo, args.quantum, units_per_second=args.units_per_second,
+                          limit=args.limit, top_by_cpu=args.top_by_cpu, seed=args.seed,
+                          switch_cost=args.switch_cost)
+
+
+def print_update(update, live, metrics):
+    """Print one tick of a live simulation and add its completions to metrics"""
+    for completion in update.completed:
+        metrics.add(completion)
+    print(f"t={update.time:<8} +{len(update.arrivals)} arrived  {len(update.exited)} exited  "
+          f"{len(update.completed)} completed  {len(live.scheduler)} in the system")
+
+
+def cmd_monitor(args):
+    """Simulate the processes of this host online for a while and print each tick"""
+    live = live_simulation(args)
+    metrics = StreamingMetrics()
+    if args.record:
+        live.recorder = SnapshotWriter(args.record, append=True)
+    try:
+        live.monitor.prime()
+        time.sleep(PRIME_SECONDS)
+        deadline = time.monotonic() + args.duration
+        while True:
+            started = time.monotonic()
+            print_update(live.tick(), live, metrics)
+            if started + args.interval > deadline:
+                break
+            time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+    finally:
+        if live.recorder is not None:
+            live.recorder.close()
+    print()
+    print("Key Performance Indicators")
+    print(format_kpis(metrics.kpis(live.scheduler.gantt)))
+    return 0
+
+
+def cmd_record(args):
+    """Record samples of this host's processes to a snapshot log"""
+    def progress(timestamp, records):
+        print(f"{time.strftime('%H:%M:%S', time.localtime(timestamp))} {len(records)} processes")
+
+    try:
+        record(args.log, args.interval, args.duration, append=True, on_sample=progress)
+    except KeyboardInterrupt:
+        pass
+    with SnapshotLog(args.log) as log:
+        print(f"{args.log}: {len(log)} samples, {len(log.names)} process names")
+    return 0
+
+
+def cmd_playback(args):
+    """Replay a snapshot log through an online simulation"""
+    live = live_simulation(args)
+    metrics = StreamingMetrics()
+    try:
+        log = SnapshotLog(args.log)
+    except (OSError, ValueError) as e:
+        print(f"Playback failed: {e}")
+        return 1
+    with log:
+        if not len(log):
+            print("Log contains no samples")
+            return 1
+        first = log.timestamps[0]
+        start = first + args.start if args.start is not None else None
+        end = first + args.end if args.end is not None else None
+        replay(log, live, args.realtime, args.speed, start, end,
+               on_update=lambda update: print_update(update, live, metrics))
+    if args.finish:
+        print_update(live.finish(), live, metrics)
+    print()
+    print("Key Performance Indicators")
+    print(format_kpis(metrics.kpis(live.scheduler.gantt)))
+    return 0
+
+
+def add_live_arguments(parser):
+    """Options of the online simulation, shared by monitor and playback"""
+    parser.add_argument("--algo", choices=sorted(ONLINE_ALGORITHMS), default="fcfs")
+    parser.add_argument("--quantum", type=int, default=None, help="time quantum for rr")
+    parser.add_argument("--units-per-second", type=int, default=UNITS_PER_SECOND,
+                        help=f"simulated time units per second (default: {UNITS_PER_SECOND})")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="at most this many of the processes running at the first sample")
+    parser.add_argument("--top-by-cpu", action="store_true",
+                        help="with --limit, take the busiest processes")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the burst time estimates")
+    parser.add_argument("--switch-cost", type=int, default=0,
+                        help="time charged for every context switch (default: 0)")
+
+
+def cmd_convert(args):
+    """Sort a trace by arrival time into the binary format"""
+    count = sort_trace(iter_trace(args.trace), args.output, args.chunk_size)
+    print(f"Wrote {count} records to {args.output}")
+    return 0
+
+
+def workload_options(args):
+    """Synthetic workload parameters given on the command line"""
+    return {"arrivals": args.arrivals, "bursts": args.bursts, "priorities": args.priorities,
+            "seed": args.seed, "mean_burst": args.mean_burst, "load": args.load}
+
+
+def cmd_generate(args):
+    """Write a synthetic workload to a binary trace"""
+    count = write_binary(iter_workload(args.n, **workload_options(args)), args.output)
+    print(f"Wrote {count} records to {args.output}")
+    return 0
+
+
+def cmd_bench(args):
+    """Time the engines over synthetic workloads and compare with a baseline"""
+    algorithms = [a for a in args.algos.split(",") if a] if args.algos else list(ENGINES)
+    for algorithm in algorithms:
+        if algorithm not in ENGINES:
+            print(f"Unknown algorithm: {algorithm}")
+            return 1
+    baseline = load_baseline(args.compare) if args.compare else None
+    workload = workload_options(args)
+    if baseline is not None and (baseline["workload"] != workload
+                                 or baseline["time_quantum"] != args.quantum):
+        print(f"{args.compare} was measured on a different workload")
+        return 1
+
+    print(f"{'algorithm':<14}{'n':>10}{'time':>13}{'throughput':>16}{'peak memory':>14}")
+    rows = run_benchmarks([int(n) for n in args.sizes.split(",") if n], algorithms, workload,
+                          args.quantum, args.repeat, args.max_seconds, args.memory_max_n,
+                          progress=lambda row: print(format_row(row), flush=True))
+    if args.save:
+        save_baseline(rows, args.save, workload, args.quantum)
+    if baseline is not None:
+        regressions = compare_baseline(rows, baseline, args.tolerance)
+        for row, _, reason in regressions:
+            print(f"REGRESSION {row['algorithm']} n={row['n']}: {reason}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+def cmd_verify(args):
+    """Compare the fast engines with the reference engines on random workloads"""
+    algorithms = [a for a in args.algos.split(",") if a]
+    paths = [p for p in args.paths.split(",") if p]
+    for algorithm in algorithms:
+        if algorithm not in VERIFY_ALGORITHMS:
+            print(f"Unknown algorithm: {algorithm}")
+            return 1
+    for path in paths:
+        if path not in FAST_PATHS:
+            print(f"Unknown fast path: {path}")
+            return 1
+
+    failed = False
+    for algorithm in algorithms:
+        checked = [path for path in paths if supports(path, algorithm)]
+        if not checked:
+            print(f"{algorithm}: no selected fast path supports it")
+            continue
+        mismatch = check(algorithm, paths, args.trials, args.seed, args.quantum, args.any_order,
+                         max_processes=args.max_processes)
+        if mismatch is None:
+            print(f"{algorithm}: {args.trials} workloads match on {', '.join(checked)}")
+        else:
+            failed = True
+            print(f"MISMATCH {mismatch}")
+    return 1 if failed else 0
+
+
+def add_workload_arguments(parser):
+    """Options shared by the commands that generate synthetic workloads"""
+    parser.add_argument("--arrivals", choices=ARRIVALS, default="poisson", help="arrival pattern")
+    parser.add_argument("--bursts", choices=BURSTS, default="exponential", help="burst time distribution")
+    parser.add_argument("--priorities", choices=PRIORITY_MIXES, default="uniform", help="priority mix")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--mean-burst", type=int, default=10, help="mean burst time (default: 10)")
+    parser.add_argument("--load", type=float, default=0.9, help="offered CPU load (default: 0.9)")
+
+
+def add_engine_arguments(parser):
+    """Engine options, shared by simulate and replay"""
+    parser.add_argument("--quantum", type=int, default=None,
+                        help="time quantum for rr, top-level quantum for mlfq")
+    parser.add_argument("--levels", type=int, default=None,
+                        help="mlfq levels; the quantum doubles at each level (default: 3)")
+    parser.add_argument("--boost-period", type=int, default=None,
+                        help="mlfq: move everything back to the top level this often")
+    parser.add_argument("--latency", type=int, default=None, help="cfs target latency (default: 24)")
+    parser.add_argument("--min-granularity", type=int, default=None,
+                        help="cfs minimum time slice (default: 3)")
+    parser.add_argument("--switch-cost", type=int, default=0,
+                        help="time charged for every context switch (default: 0)")
+
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(prog="python -m cpu_scheduler",
+                                     description="Headless CPU scheduling simulator")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    simulate = subparsers.add_parser("simulate", help="run one algorithm over a trace")
+    simulate.add_argument("trace", help="CSV trace with pid,name,priority,burst_time,arrival_time")
+    simulate.add_argument("--algo", choices=sorted(SchedulingSimulator.ALGORITHMS), default="fcfs")
+    add_engine_arguments(simulate)
+    simulate.add_argument("--no-gantt", action="store_true", help="only print the metrics")
+    simulate.add_argument("--cache-dir", help="reuse and store results in this directory")
+    simulate.add_argument("--cpus", type=int, default=1, help="number of CPUs (default: 1)")
+    simulate.add_argument("--queues", choices=QUEUE_MODES, default="global",
+                          help="one shared run queue or one per CPU (with --cpus)")
+    simulate.add_argument("--steal", action="store_true",
+                          help="let idle CPUs steal from per-CPU queues")
+    simulate.add_argument("--migration-cost", type=int, default=0,
+                          help="warm-up time when a process moves to another CPU")
+    simulate.add_argument("--profile", action="store_true",
+                          help="print stage timings and event counters after the run")
+    simulate.add_argument("--profile-out",
+                          help="also run under cProfile and write the pstats data to this file")
+    simulate.set_defaults(func=cmd_simulate)
+
+    sweep = subparsers.add_parser("sweep", help="run a grid of algorithms and quanta in parallel")
+    sweep.add_argument("trace", help="CSV trace with pid,name,priority,burst_time,arrival_time")
+    sweep.add_argument("--algos", default=",".join(SchedulingSimulator.ALGORITHMS),
+                       help="comma separated algorithms (default: all)")
+    sweep.add_argument("--quanta", default="1:100",
+                       help="rr quanta as start:stop[:step] or a comma list (default: 1:100)")
+    sweep.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    sweep.add_argument("--output", help="write the results table to this CSV file")
+    sweep.add_argument("--cache-dir", help="reuse and store results in this directory")
+    sweep.add_argument("--switch-cost", type=int, default=0,
+                       help="time charged for every context switch (default: 0)")
+    sweep.set_defaults(func=cmd_sweep)
+
+    replay = subparsers.add_parser("replay", help="stream a large sorted trace through one algorithm")
+    replay.add_argument("trace", help="trace (.csv, .jsonl or .bin) sorted by arrival_time")
+    replay.add_argument("--algo", choices=sorted(STREAM_ENGINES), default="fcfs")
+    add_engine_arguments(replay)
+    replay.add_argument("--gantt-out", help="stream the Gantt segments to this binary file")
+    replay.set_defaults(func=cmd_replay)
+
+    monitor = subparsers.add_parser("monitor", help="simulate the processes of this host online "
+                                                    "(needs psutil)")
+    add_live_arguments(monitor)
+    monitor.add_argument("--interval", type=float, default=1.0, help="seconds between samples (default: 1)")
+    monitor.add_argument("--duration", type=float, default=10.0, help="seconds to run (default: 10)")
+    monitor.add_argument("--record", help="also append the samples to this snapshot log")
+    monitor.set_defaults(func=cmd_monitor)
+
+    record_parser = subparsers.add_parser("record", help="record process samples of this host to a "
+                                                         "snapshot log (needs psutil)")
+    record_parser.add_argument("log", help="snapshot log to append to")
+    record_parser.add_argument("--interval", type=float, default=1.0,
+                               help="seconds between samples (default: 1)")
+    record_parser.add_argument("--duration", type=float, default=None,
+                               help="seconds to record (default: until interrupted)")
+    record_parser.set_defaults(func=cmd_record)
+
+    playback = subparsers.add_parser("playback", help="replay a snapshot log through an online simulation")
+    playback.add_argument("log", help="snapshot log written by record or monitor --record")
+    add_live_arguments(playback)
+    playback.add_argument("--realtime", action="store_true",
+                          help="space the samples as recorded instead of replaying at full speed")
+    playback.add_argument("--speed", type=float, default=1.0,
+                          help="with --realtime, replay this many times faster (default: 1)")
+    playback.add_argument("--from", dest="start", type=float, default=None,
+                          help="start this many seconds into the log")
+    playback.add_argument("--to", dest="end", type=float, default=None,
+                          help="stop this many seconds into the log")
+    playback.add_argument("--finish", action="store_true",
+                          help="run the processes left at the end of the log to completion")
+    playback.set_defaults(func=cmd_playback)
+
+    convert = subparsers.add_parser("convert", help="sort a trace by arrival into the binary format")
+    convert.add_argument("trace", help="input trace (.csv, .jsonl or .bin)")
+    convert.add_argument("output", help="output .bin trace")
+    convert.add_argument("--chunk-size", type=int, default=1_000_000,
+                         help="records sorted in memory per chunk")
+    convert.set_defaults(func=cmd_convert)
+
+    generate = subparsers.add_parser("generate", help="write a synthetic workload as a binary trace")
+    generate.add_argument("output", help="output .bin trace")
+    generate.add_argument("-n", type=int, default=1000, help="number of processes (default: 1000)")
+    add_workload_arguments(generate)
+    generate.set_defaults(func=cmd_generate)
+
+    bench = subparsers.add_parser("bench", help="time the engines over synthetic workloads")
+    bench.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                       help="comma separated workload sizes (default: 10 to 1000000)")
+    bench.add_argument("--algos", help="comma separated engines (default: all, ref-* are the "
+                                       "original Process engines)")
+    bench.add_argument("--quantum", type=int, default=4, help="quantum for rr and mlfq (default: 4)")
+    bench.add_argument("--repeat", type=int, default=3, help="runs per point, the best counts (default: 3)")
+    bench.add_argument("--max-seconds", type=float, default=30.0,
+                       help="skip sizes an engine is expected to take longer than this on "
+                            "(default: 30)")
+    bench.add_argument("--memory-max-n", type=int, default=MEMORY_MAX_N,
+                       help="only measure peak memory up to this size, 0 for never "
+                            f"(default: {MEMORY_MAX_N})")
+    bench.add_argument("--save", help="write the results to this JSON baseline")
+    bench.add_argument("--compare", help="compare against this JSON baseline")
+    bench.add_argument("--tolerance", type=float, default=0.25,
+                       help="allowed slowdown against the baseline (default: 0.25)")
+    add_workload_arguments(bench)
+    bench.set_defaults(func=cmd_bench)
+
+    verify = subparsers.add_parser("verify", help="check the fast engines against the reference engines")
+    verify.add_argument("--algos", default=",".join(VERIFY_ALGORITHMS),
+                        help="comma separated algorithms (default: all; mlfq and cfs are "
+                             "checked against the table engine only)")
+    verify.add_argument("--paths", default=",".join(FAST_PATHS),
+                        help=f"comma separated fast paths (default: {','.join(FAST_PATHS)})")
+    verify.add_argument("--trials", type=int, default=1000, help="random workloads (default: 1000)")
+    verify.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    verify.add_argument("--quantum", type=int, default=None,
+                        help="rr or mlfq quantum (default: random per workload)")
+    verify.add_argument("--max-processes", type=int, default=12,
+                        help="largest random workload (default: 12)")
+    verify.add_argument("--any-order", action="store_true",
+                        help="check every workload in random order against the reference, "
+                             "so tie-breaking differences with it show up")
+    verify.set_defaults(func=cmd_verify)
+
+    return parser
+
+
+def main(argv=None):
+    """CLI entry point"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "verify" and ((args.quantum is not None and args.quantum <= 0)
+                                     or args.max_processes < 1):
+        parser.error("--quantum must be positive and --max-processes at least 1")
+    if args.command in ("simulate", "replay", "monitor", "playback") and args.algo == "rr" \
+            and args.quantum is None:
+        parser.error("--quantum is required for rr")
+    if args.command in ("simulate", "replay", "monitor", "playback") and args.quantum is not None \
+            and args.quantum <= 0:
+        parser.error("--quantum must be positive")
+    if args.command in ("monitor", "playback") and (args.units_per_second <= 0
+                                                    or (args.limit is not None and args.limit < 1)):
+        parser.error("--units-per-second and --limit must be positive")
+    if args.command in ("monitor", "record") and args.interval <= 0:
+        parser.error("--interval must be positive")
+    if args.command == "playback" and args.speed <= 0:
+        parser.error("--speed must be positive")
+    if args.command == "simulate" and args.cpus < 1:
+        parser.error("--cpus must be at least 1")
+    if args.command == "simulate" and args.cpus > 1 and args.algo not in SMPSimulator.ALGORITHMS:
+        parser.error(f"--cpus is not supported for {args.algo}")
+    if args.command in ("simulate", "replay") and args.levels is not None and args.levels < 1:
+        parser.error("--levels must be at least 1")
+    if args.command in ("simulate", "sweep", "replay", "monitor", "playback") and args.switch_cost < 0:
+        parser.error("--switch-cost must not be negative")
+    if args.command in ("generate", "bench") and (args.mean_burst <= 0 or args.load <= 0):
+        parser.error("--mean-burst and --load must be positive")
+    if args.command == "bench" and (args.quantum <= 0 or args.repeat < 1):
+        parser.error("--quantum must be positive and --repeat at least 1")
+    # What only the engines or trace readers can check (an unknown trace
+    # format, an option out of range) is a usage error too, not a traceback
+    try:
+        return args.func(args)
+    except ValueError as e:
+        parser.error(str(e))
@@ -0,0 +1,189 @@
+"""Gantt chart recorders
+
+Engines report every slice they run through a recorder's add(pid, start,
+end). All recorders track the total, idle and switch time and count the
+context switches, so metrics never need to walk the segments.
+
+- ColumnarGantt keeps the chart in three int64 arrays and merges adjacent
+  slices of the same PID, so a process running several quanta back to back
+  costs one segment.
+- GanttFileSink streams the merged segments to a binary file as they are
+  produced, keeping nothing in memory.
+- NullGantt only keeps the totals.
+
+Iterating a ColumnarGantt yields the usual (pid, start, end) tuples, with
+"IDLE" for idle time and "SWITCH" for switching overhead (such as the
+cache warm-up after a migration), so it can be used anywhere a list of
+tuples was.
+"""
+import struct
+from array import array
+
+# PID column values used for idle time and switching overhead
+IDLE_PID = -1
+SWITCH_PID = -2
+LABELS = {IDLE_PID: "IDLE", SWITCH_PID: "SWITCH"}
+
+GANTT_MAGIC = b"CPUGNT01"
+SEGMENT = struct.Struct("<qqq")
+# Segments buffered before GanttFileSink writes them out
+FLUSH_SEGMENTS = 65536
+
+
+class GanttRecorder:
+    """Recorder interface; subclasses store segments in _record"""
+
+    def __init__(self):
+        self.total_time = 0
+        self.idle_time = 0
+        self.switch_time = 0
+        # A context switch is a "SWITCH" segment or, where the engine charges
+        # none, a process following a different one (idle time in between
+        # does not matter)
+        self.switches = 0
+        self.last_pid = None
+        self.switching = False
+
+    def add(self, pid, start, end):
+        """Record that pid (or "IDLE" or "SWITCH") ran from start to end
+
+        Empty slices (end <= start) are dropped.
+        """
+        if end <= start:
+            return
+        if end > self.total_time:
+            self.total_time = end
+        if pid == "IDLE":
+            self.idle_time += end - start
+            self._record(IDLE_PID, start, end)
+        elif pid == "SWITCH":
+            self.switch_time += end - start
+            self.switches += 1
+            self.switching = True
+            self._record(SWITCH_PID, start, end)
+        else:
+            if pid != self.last_pid:
+                if self.last_pid is not None and not self.switching:
+                    self.switches += 1
+                self.last_pid = pid
+            self.switching = False
+            self._record(pid, start, end)
+
+    def _record(self, pid, start, end):
+        pass
+
+    def close(self):
+        """Flush anything still buffered"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NullGantt(GanttRecorder):
+    """Keeps only the totals and the switch count"""
+
+
+class ColumnarGantt(GanttRecorder):
+    """In-memory Gantt chart as pid/start/end int64 columns"""
+
+    def __init__(self):
+        super().__init__()
+        self.pid = array("q")
+        self.start = array("q")
+        self.end = array("q")
+
+    def _record(self, pid, start, end):
+        # Run-length merge with the previous slice
+        if self.pid and self.pid[-1] == pid and self.end[-1] == start:
+            self.end[-1] = end
+            return
+        self.pid.append(pid)
+        self.start.append(start)
+        self.end.append(end)
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __getitem__(self, i):
+        """(pid, start, end) of segment i, or a list of them for a slice"""
+        if isinstance(i, slice):
+            return [(LABELS.get(pid, pid), start, end)
+                    for pid, start, end in zip(self.pid[i], self.start[i], self.end[i])]
+        pid = self.pid[i]
+        return (LABELS.get(pid, pid), self.start[i], self.end[i])
+
+    def __iter__(self):
+        for pid, start, end in zip(self.pid, self.start, self.end):
+            yield (LABELS.get(pid, pid), start, end)
+
+    def __eq__(self, other):
+        if isinstance(other, ColumnarGantt):
+            return (self.pid, self.start, self.end) == (other.pid, other.start, other.end)
+        return list(self) == list(other)
+
+    @classmethod
+    def from_segments(cls, segments):
+        """Build a columnar chart from (pid, start, end) tuples"""
+        gantt = cls()
+        for pid, start, end in segments:
+            gantt.add(pid, start, end)
+        return gantt
+
+
+class GanttFileSink(GanttRecorder):
+    """Stream merged Gantt segments to a binary file
+
+    The file is an 8 byte magic followed by little-endian int64
+    (pid, start, end) records, idle time having pid IDLE_PID and switching
+    overhead SWITCH_PID. Read it back
+    with iter_gantt_file.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(GANTT_MAGIC)
+        self.buffer = []
+        self.pending = None
+        self.segments = 0
+
+    def _record(self, pid, start, end):
+        pending = self.pending
+        if pending is not None and pending[0] == pid and pending[2] == start:
+            self.pending = (pid, pending[1], end)
+            return
+        if pending is not None:
+            self.buffer.append(SEGMENT.pack(*pending))
+            self.segments += 1
+            if len(self.buffer) >= FLUSH_SEGMENTS:
+                self.file.write(b"".join(self.buffer))
+                self.buffer = []
+        self.pending = (pid, start, end)
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.pending is not None:
+            self.buffer.append(SEGMENT.pack(*self.pending))
+            self.segments += 1
+            self.pending = None
+        self.file.write(b"".join(self.buffer))
+        self.buffer = []
+        self.file.close()
+
+
+def iter_gantt_file(path):
+    """Stream (pid, start, end) tuples back from a GanttFileSink file"""
+    with open(path, "rb") as f:
+        if f.read(len(GANTT_MAGIC)) != GANTT_MAGIC:
+            raise ValueError(f"{path} is not a Gantt file")
+        while True:
+            block = f.read(SEGMENT.size * FLUSH_SEGMENTS)
+            if not block:
+                return
+            for pid, start, end in SEGMENT.iter_unpack(block):
+                yield (LABELS.get(pid, pid), start, end)
@@ -0,0 +1,258 @@
+"""KPI computation shared by the GUI, the CLI and batch jobs
+
+Works on column arrays (arrival, burst, start, completion). NumPy is used
+when it is installed; otherwise the same numbers are computed in pure
+Python.
+"""
+from array import array
+
+from .gantt import GanttRecorder, NullGantt
+from .profiling import profiler
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+PERCENTILES = (50, 95, 99)
+
+
+def gantt_totals(gantt_chart):
+    """Return (total_time, idle_time) of a Gantt chart
+
+    Recorders already track both; plain lists of tuples are walked.
+    """
+    if isinstance(gantt_chart, GanttRecorder):
+        return gantt_chart.total_time, gantt_chart.idle_time
+    total_time = 0
+    idle_time = 0
+    for pid, start, end in gantt_chart:
+        if end > total_time:
+            total_time = end
+        if pid == "IDLE":
+            idle_time += end - start
+    return total_time, idle_time
+
+
+def gantt_overhead(gantt_chart):
+    """Return (context switches, switch time) of a Gantt chart
+
+    Recorders count both as segments come in; plain lists of tuples are
+    replayed through a NullGantt.
+    """
+    if not isinstance(gantt_chart, GanttRecorder):
+        recorder = NullGantt()
+        for pid, start, end in gantt_chart:
+            recorder.add(pid, start, end)
+        gantt_chart = recorder
+    return gantt_chart.switches, gantt_chart.switch_time
+
+
+def _overhead_kpis(gantt_chart, capacity, idle_time):
+    """Context switch count, overhead time and the share of capacity spent on real work"""
+    switches, switch_time = gantt_overhead(gantt_chart)
+    return {
+        "context_switches": switches,
+        "switch_time": switch_time,
+        "effective_utilization": ((capacity - idle_time - switch_time) / capacity * 100)
+                                 if capacity > 0 else 0,
+    }
+
+
+def _jain(total, squares, n):
+    """Jain's index from the sum and the sum of squares of n shares
+
+    Equal shares are perfectly fair, including all-zero ones (every
+    burst 0 but some waiting), which would otherwise divide by zero.
+    """
+    if squares == 0:
+        return 1.0
+    return total ** 2 / (n * squares)
+
+
+def _percentile(sorted_values, q):
+    """Linear-interpolated percentile, same as numpy's default method"""
+    if not sorted_values:
+        return 0
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _column_stats_numpy(arrival, burst, start, completion):
+    arrival = np.frombuffer(arrival, dtype=np.int64) if isinstance(arrival, array) else np.asarray(arrival)
+    burst = np.frombuffer(burst, dtype=np.int64) if isinstance(burst, array) else np.asarray(burst)
+    start = np.frombuffer(start, dtype=np.int64) if isinstance(start, array) else np.asarray(start)
+    completion = np.frombuffer(completion, dtype=np.int64) if isinstance(completion, array) else np.asarray(completion)
+
+    turnaround = completion - arrival
+    waiting = turnaround - burst
+    response = start - arrival
+    # Share of its time in the system that each process spent running
+    share = np.divide(burst, turnaround, out=np.ones(len(burst)), where=turnaround > 0)
+
+    stats = {
+        "avg_turnaround": float(turnaround.mean()),
+        "avg_waiting": float(waiting.mean()),
+        "avg_response": float(response.mean()),
+        "max_waiting": int(waiting.max()),
+        "jain_fairness": _jain(float(share.sum()), float((share ** 2).sum()), len(share)),
+    }
+    for q, w, t in zip(PERCENTILES, np.percentile(waiting, PERCENTILES),
+                       np.percentile(turnaround, PERCENTILES)):
+        stats[f"p{q}_waiting"] = float(w)
+        stats[f"p{q}_turnaround"] = float(t)
+    return stats
+
+
+def _column_stats_python(arrival, burst, start, completion):
+    n = len(arrival)
+    turnaround = list(map(int.__sub__, completion, arrival))
+    waiting = list(map(int.__sub__, turnaround, burst))
+    response_total = sum(start) - sum(arrival)
+    # Share of its time in the system that each process spent running
+    share = [b / t if t > 0 else 1.0 for b, t in zip(burst, turnaround)]
+
+    stats = {
+        "avg_turnaround": sum(turnaround) / n,
+        "avg_waiting": sum(waiting) / n,
+        "avg_response": response_total / n,
+        "max_waiting": max(waiting),
+        "jain_fairness": _jain(sum(share), sum(x * x for x in share), n),
+    }
+    turnaround.sort()
+    waiting.sort()
+    for q in PERCENTILES:
+        stats[f"p{q}_waiting"] = _percentile(waiting, q)
+        stats[f"p{q}_turnaround"] = _percentile(turnaround, q)
+    return stats
+
+
+def compute_metrics(arrival, burst, start, completion, gantt_chart):
+    """Compute the full KPI set from per-process columns and a Gantt chart
+
+    Response time is start - arrival. Jain fairness is taken over each
+    process's running share burst / turnaround, so 1.0 means every
+    process was slowed down equally. cpu_utilization counts switching
+    overhead as busy time; effective_utilization only counts process work.
+    """
+    with profiler.stage("metrics"):
+        return _compute_metrics(arrival, burst, start, completion, gantt_chart)
+
+
+def _compute_metrics(arrival, burst, start, completion, gantt_chart):
+    total_time, idle_time = gantt_totals(gantt_chart)
+    n = len(arrival)
+
+    kpis = {
+        "processes": n,
+        "total_time": total_time,
+        "idle_time": idle_time,
+        "cpu_utilization": ((total_time - idle_time) / total_time * 100) if total_time > 0 else 0,
+        "throughput": n / total_time if total_time > 0 else 0,
+    }
+    kpis.update(_overhead_kpis(gantt_chart, total_time, idle_time))
+    if n == 0:
+        return kpis
+
+    if np is not None:
+        kpis.update(_column_stats_numpy(arrival, burst, start, completion))
+    else:
+        kpis.update(_column_stats_python(arrival, burst, start, completion))
+    return kpis
+
+
+def result_metrics(result, gantt_chart):
+    """Compute the full KPI set for a ScheduleResult"""
+    table = result.table
+    return compute_metrics(table.arrival_time, table.burst_time,
+                           result.start_time, result.completion_time, gantt_chart)
+
+
+def smp_metrics(result, lanes):
+    """Compute the KPI set of a multi-CPU run with one Gantt lane per CPU
+
+    idle_time is summed over all CPUs and cpu_utilization is the share of
+    the total CPU time spent busy; per_cpu_utilization lists each lane's.
+    """
+    totals = [gantt_totals(lane) for lane in lanes]
+    overheads = [gantt_overhead(lane) for lane in lanes]
+    combined = GanttRecorder()
+    combined.total_time = max((total for total, _ in totals), default=0)
+    combined.idle_time = sum(idle for _, idle in totals)
+    combined.switches = sum(switches for switches, _ in overheads)
+    combined.switch_time = sum(switch_time for _, switch_time in overheads)
+    kpis = result_metrics(result, combined)
+
+    capacity = combined.total_time * len(lanes)
+    kpis["cpus"] = len(lanes)
+    kpis["cpu_utilization"] = ((capacity - combined.idle_time) / capacity * 100) if capacity > 0 else 0
+    kpis.update(_overhead_kpis(combined, capacity, combined.idle_time))
+    kpis["per_cpu_utilization"] = [((total - idle) / total * 100) if total > 0 else 0
+                                   for total, idle in totals]
+    return kpis
+
+
+def compute_kpis(results, gantt_chart):
+    """Compute the full KPI set for a list of finished Process objects"""
+    return compute_metrics(array("q", [p.arrival_time for p in results]),
+                           array("q", [p.burst_time for p in results]),
+                           array("q", [p.start_time for p in results]),
+                           array("q", [p.completion_time for p in results]),
+                           gantt_chart)
+
+
+class StreamingMetrics:
+    """Running KPI accumulator for the streaming engines
+
+    Feed every completion record to add, then pass the engine's Gantt
+    recorder to kpis for the total and idle time. Percentiles need the full
+    distribution and are not reported.
+    """
+
+    def __init__(self):
+        self.processes = 0
+        self.turnaround_sum = 0
+        self.waiting_sum = 0
+        self.response_sum = 0
+        self.max_waiting = 0
+        self.share_sum = 0.0
+        self.share_sq_sum = 0.0
+
+    def add(self, record):
+        pid, arrival, burst, priority, start, completion = record
+        turnaround = completion - arrival
+        waiting = turnaround - burst
+        share = burst / turnaround if turnaround > 0 else 1.0
+        self.processes += 1
+        self.turnaround_sum += turnaround
+        self.waiting_sum += waiting
+        self.response_sum += start - arrival
+        if waiting > self.max_waiting:
+            self.max_waiting = waiting
+        self.share_sum += share
+        self.share_sq_sum += share * share
+
+    def kpis(self, gantt):
+        """Return the KPIs accumulated so far, with compute_metrics' keys"""
+        n = self.processes
+        total_time, idle_time = gantt_totals(gantt)
+        kpis = {
+            "processes": n,
+            "total_time": total_time,
+            "idle_time": idle_time,
+            "cpu_utilization": ((total_time - idle_time) / total_time * 100) if total_time > 0 else 0,
+            "throughput": n / total_time if total_time > 0 else 0,
+        }
+        kpis.update(_overhead_kpis(gantt, total_time, idle_time))
+        if n:
+            kpis.update({
+                "avg_turnaround": self.turnaround_sum / n,
+                "avg_waiting": self.waiting_sum / n,
+                "avg_response": self.response_sum / n,
+                "max_waiting": self.max_waiting,
+                "jain_fairness": _jain(self.share_sum, self.share_sq_sum, n),
+            })
+        return kpis
@@ -0,0 +1,260 @@
+"""Live process monitor feeding an online scheduling simulation
+
+Sampling the host needs psutil, which is imported on first use, so
+recorded samples (see cpu_scheduler.recording) can be diffed and replayed
+where psutil is not installed.
+
+ProcessMonitor samples the running processes and diffs every sample
+against the previous one: the processes that appeared, the ones that
+exited, and the CPU usage of the rest, worked out from the change in
+their CPU times since the last sample instead of a blocking cpu_percent
+window. A PID reused by a new process (another create time) counts as an
+exit plus an arrival.
+
+LiveSimulation runs a ProcessMonitor on a background thread every
+`interval` seconds and submits each new process to an OnlineScheduler at
+its real arrival time, units_per_second simulated time units per second
+since the first sample, then advances the simulation to now. Every tick
+hands on_update a LiveUpdate with only what changed: new processes,
+processes whose CPU usage or simulated state changed, and the Gantt
+slices since the previous tick. apply() takes a diff and a timestamp
+directly, which is how recordings are replayed.
+"""
+import random
+import threading
+import time
+from bisect import bisect_right
+from collections import namedtuple
+
+from .gantt import LABELS
+from .online import OnlineScheduler
+
+UNITS_PER_SECOND = 10
+# Seconds between the baseline sample and the first one, so the first
+# processes arrive with a measured CPU usage
+PRIME_SECONDS = 0.1
+
+# One process in a sample; user_time and system_time are its CPU times in
+# seconds, create_time tells a reused PID apart
+ProcessRecord = namedtuple("ProcessRecord", ["pid", "name", "nice", "cpu_percent",
+                                             "create_time", "user_time", "system_time"])
+
+# new and changed hold ProcessRecords, exited PIDs
+SampleDiff = namedtuple("SampleDiff", ["elapsed", "new", "exited", "changed"])
+
+# arrivals: (pid, name, priority, cpu_percent, arrival_time, burst_time) per
+# new process; cpu: {pid: cpu_percent} for changed usage; states: {pid:
+# (state, remaining, completion_time)} for changed simulated state;
+# segments: (pids, starts, ends) of the new Gantt slices
+LiveUpdate = namedtuple("LiveUpdate", ["time", "arrivals", "exited", "cpu", "states",
+                                       "completed", "segments"])
+
+
+def estimate_burst(cpu_percent, rng=random):
+    """Burst time (0-100) for a sampled process, weighted by its CPU usage"""
+    base_burst = rng.randint(5, 50)
+    cpu_influence = int(cpu_percent / 2) if cpu_percent > 0 else 0
+    return min(100, max(0, base_burst + cpu_influence + rng.randint(-10, 10)))
+
+
+class ProcessMonitor:
+    """Diffs successive samples of the running processes"""
+
+    def __init__(self):
+        self.cpu_times = {}  # pid -> (create_time, user + system seconds)
+        self.known = {}  # pid -> (create_time, cpu_percent) as last reported
+        self.sampled_at = None
+        self.records = []  # ProcessRecords of the last sample
+
+    def _read(self):
+        """{pid: (create_time, user_time, system_time, name, nice)} of the running processes"""
+        import psutil
+
+        current = {}
+        for proc in psutil.process_iter(["pid", "name", "nice", "create_time", "cpu_times"]):
+            info = proc.info
+            pid = info["pid"]
+            times = info["cpu_times"]
+            user, system = (times.user, times.system) if times is not None else (0.0, 0.0)
+            nice = info["nice"]
+            current[pid] = (info["create_time"] or 0.0, user, system, info["name"] or str(pid),
+                            nice if nice is not None else 0)
+        return current
+
+    def prime(self):
+        """Take a baseline for the CPU deltas without reporting anything"""
+        current = self._read()
+        self.sampled_at = time.monotonic()
+        self.cpu_times = {pid: (created, user + system)
+                          for pid, (created, user, system, _, _) in current.items()}
+
+    def sample(self):
+        """Read the running processes and return a SampleDiff against the last sample"""
+        current = self._read()
+        now = time.monotonic()
+        elapsed = now - self.sampled_at if self.sampled_at is not None else 0.0
+
+        records = []
+        for pid, (created, user, system, name, nice) in current.items():
+            previous = self.cpu_times.get(pid)
+            cpu_percent = 0.0
+            if previous is not None and previous[0] == created and elapsed > 0:
+                cpu_percent = round(max(0.0, user + system - previous[1]) / elapsed * 100, 1)
+            records.append(ProcessRecord(pid, name, nice, cpu_percent, created, user, system))
+        self.cpu_times = {pid: (created, user + system)
+                          for pid, (created, user, system, _, _) in current.items()}
+        self.sampled_at = now
+        self.records = records
+        return self.diff(records, elapsed)
+
+    def diff(self, records, elapsed=0.0):
+        """Diff ProcessRecords against the ones reported last"""
+        new = []
+        changed = []
+        known = {}
+        for record in records:
+            reported = self.known.get(record.pid)
+            if reported is None or reported[0] != record.create_time:
+                new.append(record)
+            elif reported[1] != record.cpu_percent:
+                changed.append(record)
+            known[record.pid] = (record.create_time, record.cpu_percent)
+
+        exited = [pid for pid, (created, _) in self.known.items()
+                  if pid not in known or known[pid][0] != created]
+        self.known = known
+        return SampleDiff(elapsed, new, exited, changed)
+
+
+class LiveSimulation:
+    """An online scheduling simulation fed by process samples
+
+    The processes found by the first sample arrive at time 0 (at most
+    `limit` of them, the busiest first when top_by_cpu is set); later ones
+    arrive when they are first seen. Burst times come from estimate_burst,
+    drawn from a generator seeded with `seed`. switch_cost goes to the
+    OnlineScheduler.
+    """
+
+    def __init__(self, algorithm, time_quantum=None, interval=1.0,
+                 units_per_second=UNITS_PER_SECOND, limit=None, top_by_cpu=False, seed=None,
+                 switch_cost=0):
+        if interval <= 0 or units_per_second <= 0:
+            raise ValueError("Interval and time units per second must be positive")
+        self.scheduler = OnlineScheduler(algorithm, time_quantum, switch_cost=switch_cost)
+        self.monitor = ProcessMonitor()
+        self.interval = interval
+        self.units_per_second = units_per_second
+        self.limit = limit
+        self.top_by_cpu = top_by_cpu
+        self.rng = random.Random(seed)
+        self.started = None
+        self.sent_time = 0  # Gantt time already handed out in updates
+        self.last_running = None
+        self.stop_event = threading.Event()
+        self.thread = None
+        # recording.SnapshotWriter that gets every sample; start() closes it
+        # when the thread ends
+        self.recorder = None
+
+    def start(self, on_update, on_error=None):
+        """Sample and simulate on a background thread until stop()
+
+        on_update(LiveUpdate) and on_error(exception) are called from that
+        thread.
+        """
+        self.thread = threading.Thread(target=self._run, args=(on_update, on_error), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Ask the background thread to stop after its current tick"""
+        self.stop_event.set()
+
+    def _run(self, on_update, on_error):
+        try:
+            self.monitor.prime()
+            if self.stop_event.wait(PRIME_SECONDS):
+                return
+            while True:
+                started = time.monotonic()
+                on_update(self.tick())
+                if self.stop_event.wait(max(0.0, self.interval - (time.monotonic() - started))):
+                    return
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+        finally:
+            # Closed here, since only this thread writes to it
+            if self.recorder is not None:
+                self.recorder.close()
+
+    def tick(self):
+        """Take one sample, submit the new processes and advance to now"""
+        diff = self.monitor.sample()
+        timestamp = time.time()
+        if self.recorder is not None:
+            self.recorder.write(timestamp, self.monitor.records)
+        return self.apply(diff, timestamp)
+
+    def apply(self, diff, timestamp):
+        """Submit the new processes of a SampleDiff taken at timestamp (seconds)
+        and advance the simulation to it"""
+        scheduler = self.scheduler
+        if self.started is None:
+            self.started = timestamp
+            new = diff.new
+            if self.top_by_cpu:
+                new = sorted(new, key=lambda s: s.cpu_percent, reverse=True)
+            if self.limit is not None:
+                new = new[:self.limit]
+        else:
+            new = diff.new
+        now = max(scheduler.time, int((timestamp - self.started) * self.units_per_second))
+
+        arrivals = []
+        for sample in sorted(new, key=lambda s: s.pid):
+            burst_time = estimate_burst(sample.cpu_percent, self.rng)
+            scheduler.submit(sample.pid, now, burst_time, sample.nice)
+            arrivals.append((sample.pid, sample.name, sample.nice, sample.cpu_percent, now, burst_time))
+        completed = scheduler.advance(now)
+        return self._update(now, arrivals, diff.exited, diff.changed, completed)
+
+    def finish(self):
+        """Run the processes still in the system to completion"""
+        completed = self.scheduler.finish()
+        return self._update(self.scheduler.time, [], [], [], completed)
+
+    def _update(self, now, arrivals, exited, changed, completed):
+        """LiveUpdate of what changed since the previous one"""
+        scheduler = self.scheduler
+
+        # Gantt slices since the last tick, the first one clipped where it
+        # stopped. A switch still in progress is not in the chart yet, so
+        # this goes by the chart's end rather than the clock
+        gantt = scheduler.gantt
+        first = bisect_right(gantt.end, self.sent_time)
+        pids = list(gantt.pid[first:])
+        starts = [max(start, self.sent_time) for start in gantt.start[first:]]
+        ends = list(gantt.end[first:])
+        self.sent_time = gantt.total_time
+
+        # Processes that ran, completed, or stopped or started running
+        touched = {pid for pid in pids if pid not in LABELS}
+        touched.update(record[0] for record in completed)
+        touched.update(pid for pid, *_ in arrivals)
+        running = scheduler.running[0] if scheduler.running is not None else None
+        touched.update(pid for pid in (self.last_running, running) if pid is not None)
+        self.last_running = running
+        states = {pid: scheduler.status(pid) for pid in touched if pid in scheduler.jobs}
+
+        simulated = scheduler.jobs
+        return LiveUpdate(
+            time=now,
+            arrivals=arrivals,
+            exited=[pid for pid in exited if pid in simulated],
+            cpu={s.pid: s.cpu_percent for s in changed if s.pid in simulated},
+            states=states,
+            completed=completed,
+            segments=(pids, starts, ends),
+        )
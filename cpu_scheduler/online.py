@@ -0,0 +1,210 @@
+"""Online scheduling of arrivals that only become known as time passes
+
+The table and streaming engines see the whole arrival sequence, or at
+least the next arrival, up front. OnlineScheduler is fed arrivals as they
+happen, from the live process monitor or a replayed recording, and is
+advanced to a simulated time once every arrival before that time has been
+submitted. Decisions due exactly at that time (picking the next process,
+re-queueing a preempted one) wait for the next advance, since more
+arrivals at the same instant may still come in. Fed arrivals in
+(arrival_time, pid) order, it produces the same schedule as the streaming
+engines however the advances are spaced.
+
+A context switch (switch_cost) is not interrupted by arrivals and may
+span several advances; its "SWITCH" slice is recorded once it is over, so
+the Gantt chart can lag the clock by the switch in progress.
+"""
+import heapq
+import math
+from collections import deque
+
+from .gantt import ColumnarGantt
+from .profiling import profiler
+
+ALGORITHMS = ("fcfs", "sjf", "priority", "rr")
+
+# Fields of a job record
+PID, ARRIVAL, BURST, PRIORITY, REMAINING, START, COMPLETION, SEQ = range(8)
+
+
+class OnlineScheduler:
+    """One algorithm over arrivals submitted while the simulation runs
+
+    submit() adds a process arriving at or after the current time, and
+    advance(until) simulates up to `until`, returning the processes that
+    completed on the way as (pid, arrival_time, burst_time, priority,
+    start_time, completion_time) records, like the streaming engines.
+    finish() runs until every submitted process has completed. Gantt
+    slices go to `gantt`, a ColumnarGantt unless another recorder is given.
+    """
+
+    def __init__(self, algorithm, time_quantum=None, gantt=None, switch_cost=0):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm for online scheduling: {algorithm} "
+                             f"(use one of {', '.join(ALGORITHMS)})")
+        if algorithm == "rr" and (time_quantum is None or time_quantum <= 0):
+            raise ValueError("Time quantum must be positive")
+        if switch_cost < 0:
+            raise ValueError("Switch cost must not be negative")
+        self.algorithm = algorithm
+        self.time_quantum = time_quantum if algorithm == "rr" else None
+        self.preemptive = algorithm in ("sjf", "priority")
+        self.gantt = gantt if gantt is not None else ColumnarGantt()
+        self.time = 0
+        self.jobs = {}  # latest job record per pid
+        self.pending = deque()  # submitted jobs that have not arrived yet
+        self.ready = [] if self.preemptive else deque()
+        self.running = None
+        self.quantum_left = 0
+        self.seq = 0
+        self.switch_cost = switch_cost
+        self.last = None  # job that ran last, for switch_cost
+        self.switch_start = -1  # start of the switch in progress, or -1
+
+    def submit(self, pid, arrival_time, burst_time, priority=0):
+        """Add a process; arrivals must come in time order, none before self.time"""
+        if arrival_time < self.time:
+            raise ValueError(f"P{pid} arrives at {arrival_time}, before the current time {self.time}")
+        if self.pending and arrival_time < self.pending[-1][ARRIVAL]:
+            raise ValueError(f"P{pid} is submitted out of arrival order")
+        if burst_time < 0:
+            raise ValueError(f"P{pid} has a negative burst time")
+        job = [pid, arrival_time, burst_time, priority, burst_time, -1, -1, -1]
+        self.jobs[pid] = job
+        self.pending.append(job)
+
+    def _admit(self, current_time):
+        """Move the jobs that have arrived by current_time to the ready set"""
+        pending = self.pending
+        while pending and pending[0][ARRIVAL] <= current_time:
+            job = pending.popleft()
+            job[SEQ] = self.seq
+            self.seq += 1
+            if self.preemptive:
+                self._push(job)
+            else:
+                self.ready.append(job)
+
+    def _push(self, job):
+        """Put a job on the ready heap; ties keep the admission order"""
+        if self.algorithm == "sjf":
+            heapq.heappush(self.ready, (job[REMAINING], job[SEQ], job))
+        else:
+            heapq.heappush(self.ready, (job[PRIORITY], job[ARRIVAL], job[PID], job[SEQ], job))
+
+    def _pick(self):
+        """Take the next job to run from the ready set, or None"""
+        if not self.ready:
+            return None
+        if self.preemptive:
+            return heapq.heappop(self.ready)[-1]
+        return self.ready.popleft()
+
+    def advance(self, until):
+        """Simulate up to time `until` and return the jobs completed on the way"""
+        with profiler.stage("simulate online"):
+            return self._advance(until)
+
+    def _advance(self, until):
+        gantt = self.gantt
+        completed = []
+        current_time = self.time
+
+        while True:
+            self._admit(current_time)
+            if current_time >= until:
+                break
+
+            job = self.running
+            if self.switch_start != -1:
+                # Finish the switch to the running job first. What arrived
+                # meanwhile is looked at next, unless the job has no time
+                # left and completes right away
+                switch_end = self.switch_start + self.switch_cost
+                current_time = min(switch_end, until)
+                if current_time < switch_end:
+                    continue
+                gantt.add("SWITCH", self.switch_start, switch_end)
+                self.switch_start = -1
+                if job[REMAINING]:
+                    continue
+            elif job is not None and self.preemptive:
+                # Arrivals may have changed the best choice
+                self._push(job)
+                job = None
+            elif job is not None and self.time_quantum is not None and self.quantum_left == 0:
+                # New arrivals go ahead of the process that was just preempted
+                self.ready.append(job)
+                job = None
+
+            if job is None:
+                job = self._pick()
+                self.running = job
+                if job is None:
+                    if self.pending:
+                        idle_until = min(self.pending[0][ARRIVAL], until)
+                    elif until == math.inf:
+                        break
+                    else:
+                        idle_until = until
+                    gantt.add("IDLE", current_time, idle_until)
+                    current_time = idle_until
+                    continue
+                if self.time_quantum is not None:
+                    self.quantum_left = self.time_quantum
+                switched = self.switch_cost and self.last is not None and self.last is not job
+                self.last = job
+                if switched:
+                    self.switch_start = current_time
+                    continue
+
+            if job[START] == -1:
+                job[START] = current_time
+
+            # Run until completion, the end of the quantum, the next arrival
+            # (preemptive algorithms only) or `until`, whichever comes first.
+            # Arrivals during a switch are already due when it ends
+            run_until = current_time + job[REMAINING]
+            if self.time_quantum is not None:
+                run_until = min(run_until, current_time + self.quantum_left)
+            if self.preemptive and self.pending:
+                run_until = min(run_until, max(self.pending[0][ARRIVAL], current_time))
+            run_until = min(run_until, until)
+            if run_until > current_time:
+                gantt.add(job[PID], current_time, run_until)
+            job[REMAINING] -= run_until - current_time
+            if self.time_quantum is not None:
+                self.quantum_left -= run_until - current_time
+            current_time = run_until
+
+            if job[REMAINING] == 0:
+                job[COMPLETION] = current_time
+                completed.append((job[PID], job[ARRIVAL], job[BURST], job[PRIORITY],
+                                  job[START], current_time))
+                self.running = None
+
+        self.time = current_time
+        return completed
+
+    def finish(self):
+        """Run until every submitted process has completed"""
+        return self.advance(math.inf)
+
+    def status(self, pid):
+        """(state, remaining, completion_time) of the latest process with pid
+
+        state is "waiting", "running" or "done"; completion_time is -1
+        until the process completes.
+        """
+        job = self.jobs[pid]
+        if job[COMPLETION] != -1:
+            state = "done"
+        elif job is self.running:
+            state = "running"
+        else:
+            state = "waiting"
+        return state, job[REMAINING], job[COMPLETION]
+
+    def __len__(self):
+        """Processes submitted and not completed yet"""
+        return len(self.pending) + len(self.ready) + (self.running is not None)
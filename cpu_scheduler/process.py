@@ -0,0 +1,16 @@
+class Process:
+    """Represents a process with scheduling attributes"""
+    __slots__ = ("pid", "name", "priority", "burst_time", "arrival_time", "remaining_time",
+                 "completion_time", "turnaround_time", "waiting_time", "start_time")
+
+    def __init__(self, pid, name, priority, burst_time=0, arrival_time=0):
+        self.pid = pid
+        self.name = name
+        self.priority = priority
+        self.burst_time = burst_time
+        self.arrival_time = arrival_time
+        self.remaining_time = burst_time
+        self.completion_time = 0
+        self.turnaround_time = 0
+        self.waiting_time = 0
+        self.start_time = -1
@@ -0,0 +1,200 @@
+"""Per-stage timers, counters and optional cProfile capture
+
+The module-level `profiler` is shared by the engines, the metrics and the
+GUI. It starts disabled, and then stage() hands back one shared no-op
+context manager and count() returns at once, so the hooks cost an
+attribute check per run or render, never per scheduling event.
+
+Once enabled, every stage (simulate, metrics, render gantt, ...) adds its
+wall time and call count, and record_run derives event counts from each
+finished schedule: processes, Gantt segments, preemptions, context
+switches and events (arrivals, completions and preemptions). With
+cprofile=True the stages also run under cProfile; report() then splits
+the profiled time into phases (ready-set operations, Gantt bookkeeping,
+metrics, rendering), counts the ready-set queue operations, and
+dump_stats writes a pstats file. cProfile and pstats are only imported
+once cprofile is enabled, so importing the package stays cheap.
+"""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from .gantt import IDLE_PID, SWITCH_PID, ColumnarGantt
+
+# Entry functions of each phase as (file name suffix, function name); "~"
+# is the file name cProfile gives builtins
+PHASES = {
+    "ready set": (("~", "<built-in method _heapq.heappush>"),
+                  ("~", "<built-in method _heapq.heappop>"),
+                  ("~", "<method 'append' of 'collections.deque' objects>"),
+                  ("~", "<method 'popleft' of 'collections.deque' objects>")),
+    "gantt bookkeeping": (("gantt.py", "add"),),
+    "metrics": (("metrics.py", "_compute_metrics"),),
+    "rendering": (("CPUSchedulingSimulator.py", "render_gantt"),
+                  ("CPUSchedulingSimulator.py", "update_view"),
+                  ("CPUSchedulingSimulator.py", "render_table"),
+                  ("CPUSchedulingSimulator.py", "bind_rows")),
+}
+
+_NULL_STAGE = nullcontext()
+
+
+class Profiler:
+    """Collects stage timings and counters while enabled"""
+
+    def __init__(self):
+        self.enabled = False
+        self.cprofile = False
+        self.stages = {}
+        self.counters = {}
+        self.stats = None
+        self._lock = threading.Lock()
+        # cProfile can only run in one thread at a time on newer Pythons
+        self._profile_lock = threading.Lock()
+
+    def enable(self, cprofile=False):
+        """Start collecting; cprofile also runs each stage under cProfile"""
+        self.cprofile = cprofile
+        self.enabled = True
+
+    def disable(self):
+        """Stop collecting; what was collected stays until reset"""
+        self.enabled = False
+
+    def reset(self):
+        """Drop everything collected so far"""
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+            self.stats = None
+
+    def stage(self, name):
+        """Context manager timing one run of the named stage"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        profile = None
+        if self.cprofile and self._profile_lock.acquire(blocking=False):
+            import cProfile
+
+            profile = cProfile.Profile()
+            profile.enable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+                self._profile_lock.release()
+            with self._lock:
+                calls, seconds = self.stages.get(name, (0, 0.0))
+                self.stages[name] = (calls + 1, seconds + elapsed)
+                if profile is not None:
+                    if self.stats is None:
+                        import pstats
+
+                        self.stats = pstats.Stats(profile)
+                    else:
+                        self.stats.add(profile)
+
+    def count(self, name, value=1):
+        """Add value to the named counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_run(self, table, gantt_chart):
+        """Count the events of one finished single-CPU schedule"""
+        if not self.enabled:
+            return
+        n = len(table)
+        self.count("runs")
+        self.count("processes", n)
+        self.count("context switches", gantt_chart.switches)
+        if isinstance(gantt_chart, ColumnarGantt):
+            # Merged segments per process, minus the one it finishes in
+            slices = sum(1 for pid in gantt_chart.pid if pid not in (IDLE_PID, SWITCH_PID))
+            preemptions = max(0, slices - n)
+            self.count("gantt segments", len(gantt_chart))
+            self.count("preemptions", preemptions)
+            self.count("events", 2 * n + preemptions)
+
+    def _members(self, phase):
+        entries = PHASES[phase]
+        return {func for func in self.stats.stats
+                if any(func[0].endswith(suffix) and func[2] == name for suffix, name in entries)}
+
+    def queue_operations(self):
+        """Ready-set pushes and pops seen by cProfile (None without cprofile)"""
+        if self.stats is None:
+            return None
+        return sum(self.stats.stats[func][1] for func in self._members("ready set"))
+
+    def phases(self):
+        """Seconds of profiled time per phase (empty without cprofile)
+
+        A phase's time is the cumulative time of its entry functions,
+        counting only calls from outside the phase so nested entries are
+        not counted twice. "other" is what remains, mostly the engine
+        loops themselves.
+        """
+        if self.stats is None:
+            return {}
+        stats = self.stats.stats
+        totals = {}
+        for phase in PHASES:
+            members = self._members(phase)
+            seconds = 0.0
+            for func in members:
+                cumtime, callers = stats[func][3], stats[func][4]
+                if not callers:
+                    seconds += cumtime
+                else:
+                    seconds += sum(calls[3] for caller, calls in callers.items() if caller not in members)
+            totals[phase] = seconds
+        totals["other"] = max(0.0, self.stats.total_tt - sum(totals.values()))
+        return totals
+
+    def report(self):
+        """Snapshot of the stages, counters and (with cprofile) phases"""
+        with self._lock:
+            counters = dict(self.counters)
+            if self.stats is not None:
+                counters["queue operations"] = self.queue_operations()
+            return {
+                "stages": {name: {"calls": calls, "seconds": seconds}
+                           for name, (calls, seconds) in self.stages.items()},
+                "counters": counters,
+                "phases": self.phases(),
+            }
+
+    def dump_stats(self, path):
+        """Write the cProfile data collected so far to a pstats file"""
+        with self._lock:
+            if self.stats is None:
+                raise ValueError("No cProfile data collected; enable with cprofile=True")
+            self.stats.dump_stats(path)
+
+
+def format_report(report):
+    """Format a Profiler report as plain text"""
+    lines = ["Stages"]
+    for name, stage in sorted(report["stages"].items(), key=lambda item: -item[1]["seconds"]):
+        lines.append(f"  {name:<20}{stage['calls']:>8} calls{stage['seconds'] * 1000:>12.2f} ms")
+    if report["counters"]:
+        lines.append("Counters")
+        for name, value in sorted(report["counters"].items()):
+            lines.append(f"  {name:<20}{value:>14}")
+    if report["phases"]:
+        lines.append("Profiled time by phase")
+        for name, seconds in report["phases"].items():
+            lines.append(f"  {name:<20}{seconds * 1000:>14.2f} ms")
+    return "\n".join(lines)
+
+
+profiler = Profiler()
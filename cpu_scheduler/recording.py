@@ -0,0 +1,293 @@
+"""Record process samples to a compact binary log and replay them
+
+A live host cannot be sampled twice: the process set keeps changing. The
+recorder appends timestamped samples to a log that the replay feeds to a
+LiveSimulation at full speed or in real time, so one capture can back
+any number of scheduling experiments.
+
+The log is an 8 byte magic followed by frames. A frame is a FRAME header
+(kind, timestamp in seconds since the epoch, count) and count entries:
+
+- kind b"N": NAME headers (name id, byte length) each followed by the
+  UTF-8 name, for names not seen before in the log
+- kind b"S": one sample of count fixed-size RECORDs (pid, name id, nice,
+  cpu_percent, create_time, user_time, system_time)
+
+Closing the writer appends the name table, an index of (timestamp,
+offset) per sample and a TRAILER pointing at both, so SnapshotLog finds
+any timestamp by bisection without reading the frames. A log whose
+writer never closed (the recorder was killed) has no trailer and is
+indexed by scanning the frames once; a torn last frame is ignored.
+Appending to a log drops its trailer and writes a new one on close.
+"""
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left
+
+from .monitor import ProcessMonitor, ProcessRecord
+
+LOG_MAGIC = b"CPUREC01"
+TRAILER_MAGIC = b"CPURIX01"
+FRAME = struct.Struct("<cdI")
+RECORD = struct.Struct("<iIifddd")
+NAME = struct.Struct("<IH")
+INDEX = struct.Struct("<dQ")
+# Index offset, samples, name table offset, names, magic
+TRAILER = struct.Struct("<QQQQ8s")
+
+
+class SnapshotWriter:
+    """Appends timestamped samples to a snapshot log"""
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.names = {}  # name -> id
+        self.index = []  # (timestamp, offset) per sample
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            with SnapshotLog(path) as log:
+                self.names = {name: i for i, name in enumerate(log.names)}
+                self.index = list(zip(log.timestamps, log.offsets))
+                data_end = log.data_end
+            self.file = open(path, "r+b")
+            self.file.truncate(data_end)
+            self.file.seek(data_end)
+        else:
+            self.file = open(path, "wb")
+            self.file.write(LOG_MAGIC)
+
+    def write(self, timestamp, records):
+        """Append one sample of ProcessRecords taken at timestamp"""
+        if self.index and timestamp < self.index[-1][0]:
+            raise ValueError(f"Sample at {timestamp} is older than the last one recorded")
+        buffer = bytearray()
+        new_names = [record.name for record in records if record.name not in self.names]
+        if new_names:
+            new_names = list(dict.fromkeys(new_names))
+            buffer += FRAME.pack(b"N", timestamp, len(new_names))
+            for name in new_names:
+                encoded = name.encode("utf-8")[:0xFFFF]
+                buffer += NAME.pack(len(self.names), len(encoded)) + encoded
+                self.names[name] = len(self.names)
+
+        offset = self.file.tell() + len(buffer)
+        buffer += FRAME.pack(b"S", timestamp, len(records))
+        names = self.names
+        for pid, name, nice, cpu_percent, create_time, user_time, system_time in records:
+            buffer += RECORD.pack(pid, names[name], nice, cpu_percent, create_time,
+                                  user_time, system_time)
+        self.file.write(buffer)
+        # A killed recorder loses at most the sample being written
+        self.file.flush()
+        self.index.append((timestamp, offset))
+
+    def close(self):
+        """Write the name table, the index and the trailer"""
+        if self.file.closed:
+            return
+        names_offset = self.file.tell()
+        buffer = bytearray()
+        for name in self.names:
+            encoded = name.encode("utf-8")[:0xFFFF]
+            buffer += NAME.pack(self.names[name], len(encoded)) + encoded
+        index_offset = names_offset + len(buffer)
+        for timestamp, offset in self.index:
+            buffer += INDEX.pack(timestamp, offset)
+        buffer += TRAILER.pack(index_offset, len(self.index), names_offset, len(self.names),
+                               TRAILER_MAGIC)
+        self.file.write(buffer)
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SnapshotLog:
+    """Memory-mapped read access to a snapshot log
+
+    timestamps and offsets index the samples; sample(i) decodes one and
+    samples(start, end) iterates over a time range.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{path} is empty")
+        if self.map[:len(LOG_MAGIC)] != LOG_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a snapshot log")
+        self.timestamps = array("d")
+        self.offsets = array("Q")
+        self.names = []
+        if len(self.map) >= len(LOG_MAGIC) + TRAILER.size and \
+                self.map[-len(TRAILER_MAGIC):] == TRAILER_MAGIC:
+            self._read_trailer()
+        else:
+            self._scan()
+
+    def _read_names(self, pos, count):
+        """Read count NAME entries at pos; return them as (id, name) and where they end
+
+        Returns None if the entries run past the end of the log.
+        """
+        size = len(self.map)
+        entries = []
+        for _ in range(count):
+            if pos + NAME.size > size:
+                return None
+            name_id, length = NAME.unpack_from(self.map, pos)
+            pos += NAME.size
+            if pos + length > size:
+                return None
+            entries.append((name_id, self.map[pos:pos + length].decode("utf-8", errors="replace")))
+            pos += length
+        return entries, pos
+
+    def _register(self, entries):
+        names = self.names
+        for name_id, name in entries:
+            if name_id >= len(names):
+                names.extend([None] * (name_id + 1 - len(names)))
+            names[name_id] = name
+
+    def _read_trailer(self):
+        index_offset, samples, names_offset, names, _ = TRAILER.unpack_from(
+            self.map, len(self.map) - TRAILER.size)
+        read = self._read_names(names_offset, names)
+        if read is None:
+            raise ValueError(f"{self.path} has a corrupt name table")
+        self._register(read[0])
+        for timestamp, offset in INDEX.iter_unpack(
+                self.map[index_offset:index_offset + samples * INDEX.size]):
+            self.timestamps.append(timestamp)
+            self.offsets.append(offset)
+        self.data_end = names_offset
+
+    def _scan(self):
+        """Index a log without a trailer by walking its frames"""
+        size = len(self.map)
+        pos = len(LOG_MAGIC)
+        while pos + FRAME.size <= size:
+            kind, timestamp, count = FRAME.unpack_from(self.map, pos)
+            if kind == b"N":
+                # A torn name frame ends the usable log; none of its names
+                # count, so an append writes them again
+                read = self._read_names(pos + FRAME.size, count)
+                if read is None:
+                    break
+                entries, end = read
+                self._register(entries)
+            elif kind == b"S":
+                end = pos + FRAME.size + count * RECORD.size
+                if end > size:
+                    break
+                self.timestamps.append(timestamp)
+                self.offsets.append(pos)
+            else:
+                break
+            pos = end
+        self.data_end = pos
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def sample(self, i):
+        """(timestamp, [ProcessRecord]) of the i-th sample"""
+        pos = self.offsets[i]
+        _, timestamp, count = FRAME.unpack_from(self.map, pos)
+        pos += FRAME.size
+        names = self.names
+        records = [ProcessRecord(pid, names[name_id], nice, round(cpu_percent, 1), create_time,
+                                 user_time, system_time)
+                   for pid, name_id, nice, cpu_percent, create_time, user_time, system_time
+                   in RECORD.iter_unpack(self.map[pos:pos + count * RECORD.size])]
+        return timestamp, records
+
+    def find(self, timestamp):
+        """Index of the first sample taken at or after timestamp"""
+        return bisect_left(self.timestamps, timestamp)
+
+    def samples(self, start=None, end=None):
+        """Yield (timestamp, records) for samples with start <= timestamp < end"""
+        i = self.find(start) if start is not None else 0
+        stop = self.find(end) if end is not None else len(self)
+        for k in range(i, stop):
+            yield self.sample(k)
+
+    def close(self):
+        if getattr(self, "map", None) is not None and not self.map.closed:
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record(path, interval=1.0, duration=None, append=False, stop_event=None, on_sample=None):
+    """Sample this host every interval seconds into a snapshot log
+
+    Runs for duration seconds, until stop_event is set, or (with neither)
+    until interrupted. on_sample(timestamp, records), if given, is called
+    after every sample. Needs psutil.
+    """
+    monitor = ProcessMonitor()
+    deadline = time.monotonic() + duration if duration is not None else None
+    with SnapshotWriter(path, append) as writer:
+        monitor.prime()
+        while deadline is None or time.monotonic() + interval <= deadline:
+            if stop_event is not None:
+                if stop_event.wait(interval):
+                    break
+            else:
+                time.sleep(interval)
+            monitor.sample()
+            timestamp = time.time()
+            writer.write(timestamp, monitor.records)
+            if on_sample is not None:
+                on_sample(timestamp, monitor.records)
+
+
+def replay(log, live, realtime=False, speed=1.0, start=None, end=None, on_update=None):
+    """Feed the samples of a SnapshotLog to a LiveSimulation
+
+    At full speed the samples are applied back to back; with realtime
+    they are spaced as recorded, divided by speed. Stops early once
+    live.stop() is called. Returns the LiveUpdates unless on_update is
+    given, in which case each is passed to it instead.
+    """
+    if speed <= 0:
+        raise ValueError("Replay speed must be positive")
+    monitor = ProcessMonitor()
+    updates = []
+    first = None
+    replay_started = time.monotonic()
+    previous = None
+    for timestamp, records in log.samples(start, end):
+        if first is None:
+            first = timestamp
+        if realtime:
+            delay = replay_started + (timestamp - first) / speed - time.monotonic()
+            if live.stop_event.wait(max(0.0, delay)):
+                break
+        elif live.stop_event.is_set():
+            break
+        elapsed = timestamp - previous if previous is not None else 0.0
+        update = live.apply(monitor.diff(records, elapsed), timestamp)
+        previous = timestamp
+        if on_update is not None:
+            on_update(update)
+        else:
+            updates.append(update)
+    return updates
@@ -0,0 +1,86 @@
+"""Monitored simulation runs with progress reporting and cancellation
+
+The engines report every slice to their Gantt recorder, so progress and
+cancellation hook in there: MonitoredGantt checks a cancel flag and
+reports progress every few thousand slices, without any change to the
+engines themselves.
+"""
+import time
+
+from .gantt import ColumnarGantt
+from .simulator import SchedulingSimulator
+
+
+class SimulationCancelled(Exception):
+    """Raised inside an engine run when its cancel flag is set"""
+
+
+class MonitoredGantt(ColumnarGantt):
+    """ColumnarGantt that reports progress and honours cancellation
+
+    progress(fraction, segments) is called at most every interval seconds
+    with the fraction of the total burst time simulated so far and the
+    (pid, start, end) column slices recorded since the previous call.
+    The newest segment can still grow by run-length merging, so it is only
+    sent once it is final. cancel is anything with is_set(), such as a
+    threading.Event.
+    """
+
+    def __init__(self, total_work, progress=None, cancel=None, interval=0.1, check_every=1024):
+        super().__init__()
+        self.total_work = total_work
+        self.progress = progress
+        self.cancel = cancel
+        self.interval = interval
+        self.check_every = check_every
+        self._since_check = 0
+        self._sent = 0
+        self._last_report = time.monotonic()
+
+    def _record(self, pid, start, end):
+        super()._record(pid, start, end)
+        self._since_check += 1
+        if self._since_check >= self.check_every:
+            self._since_check = 0
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Raise if cancelled; report progress if the interval has passed"""
+        if self.cancel is not None and self.cancel.is_set():
+            raise SimulationCancelled()
+        now = time.monotonic()
+        if self.progress is not None and now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report(len(self.pid) - 1)
+
+    def report(self, upto):
+        """Send progress and the segments in [sent, upto)"""
+        busy = self.total_time - self.idle_time
+        fraction = min(1.0, busy / self.total_work) if self.total_work > 0 else 1.0
+        segments = (self.pid[self._sent:upto], self.start[self._sent:upto], self.end[self._sent:upto])
+        self._sent = max(self._sent, upto)
+        self.progress(fraction, segments)
+
+    def finish(self):
+        """Send the remaining segments and the final progress"""
+        if self.progress is not None:
+            self.report(len(self.pid))
+
+
+def run_monitored(algorithm, table, time_quantum=None, progress=None, cancel=None, interval=0.1,
+                  simulator=None, **options):
+    """Run an engine by its short name with progress and cancellation
+
+    With an IncrementalSimulator, which carries its own algorithm and
+    options, the run resumes from its checkpoints instead of starting
+    over; otherwise options (such as switch_cost) go to run_table. Raises
+    SimulationCancelled if cancel is set during the run.
+    """
+    gantt = MonitoredGantt(sum(table.burst_time), progress, cancel, interval)
+    if simulator is not None:
+        result, gantt_chart = simulator.rerun(table, gantt)
+    else:
+        result, gantt_chart = SchedulingSimulator.run_table(algorithm, table, time_quantum, gantt,
+                                                            **options)
+    gantt.finish()
+    return result, gantt_chart
@@ -0,0 +1,766 @@
+import copy
+import heapq
+import math
+from array import array
+from collections import deque
+
+from .gantt import ColumnarGantt
+from .profiling import profiler
+from .table import ProcessTable, ScheduleResult
+
+# CFS load weight of nice -20..19 (the kernel's sched_prio_to_weight table)
+NICE_WEIGHTS = (
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+)
+
+# Next checkpoint time of a run without a checkpoint hook
+NO_CHECKPOINT = math.inf
+
+
+class SchedulingSimulator:
+    """Implements various CPU scheduling algorithms"""
+
+    # Short algorithm names used by the CLI, mapped to ProcessTable engines
+    ALGORITHMS = {
+        "fcfs": "fcfs_table",
+        "sjf": "sjf_table",
+        "priority": "priority_table",
+        "rr": "round_robin_table",
+        "mlfq": "mlfq_table",
+        "cfs": "cfs_table",
+    }
+
+    @staticmethod
+    def fcfs(processes):
+        """First Come First Serve scheduling"""
+        processes = sorted(processes, key=lambda p: p.arrival_time)
+        current_time = 0
+        gantt_chart = []
+        
+        for process in processes:
+            if current_time < process.arrival_time:
+                gantt_chart.append(("IDLE", current_time, process.arrival_time))
+                current_time = process.arrival_time
+            
+            process.start_time = current_time
+            gantt_chart.append((process.pid, current_time, current_time + process.burst_time))
+            current_time += process.burst_time
+            process.completion_time = current_time
+            process.turnaround_time = process.completion_time - process.arrival_time
+            process.waiting_time = process.turnaround_time - process.burst_time
+        
+        return processes, gantt_chart
+    
+    @staticmethod
+    def sjf_preemptive(processes):
+        """Shortest Job First (Preemptive) scheduling"""
+        processes = [copy.deepcopy(p) for p in processes]
+        n = len(processes)
+        current_time = 0
+        completed = 0
+        gantt_chart = []
+        last_process = None
+        
+        while completed < n:
+            available = [p for p in processes if p.arrival_time <= current_time and p.remaining_time > 0]
+            
+            if not available:
+                next_arrival = min([p.arrival_time for p in processes if p.remaining_time > 0])
+                if last_process != "IDLE":
+                    gantt_chart.append(("IDLE", current_time, next_arrival))
+                    last_process = "IDLE"
+                current_time = next_arrival
+                continue
+            
+            current_process = min(available, key=lambda p: p.remaining_time)
+            
+            if current_process.start_time == -1:
+                current_process.start_time = current_time
+            
+            if last_process != current_process.pid:
+                if gantt_chart and last_process == current_process.pid:
+                    gantt_chart[-1] = (gantt_chart[-1][0], gantt_chart[-1][1], current_time + 1)
+                else:
+                    gantt_chart.append((current_process.pid, current_time, current_time + 1))
+                last_process = current_process.pid
+            else:
+                gantt_chart[-1] = (gantt_chart[-1][0], gantt_chart[-1][1], current_time + 1)
+            
+            current_process.remaining_time -= 1
+            current_time += 1
+            
+            if current_process.remaining_time == 0:
+                completed += 1
+                current_process.completion_time = current_time
+                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
+                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
+        
+        return processes, gantt_chart
+
+    @staticmethod
+    def sjf_preemptive_fast(processes):
+        """Shortest Job First (Preemptive) scheduling - event driven
+
+        Same schedule as sjf_preemptive without copying or mutating the
+        input; see sjf_table.
+        """
+        result, gantt_chart = SchedulingSimulator.sjf_table(ProcessTable.from_processes(processes))
+        return result.to_processes(), gantt_chart
+
+    @staticmethod
+    def sjf_table(table, gantt=None, switch_cost=0, checkpoints=None):
+        """Shortest Job First (Preemptive) over a ProcessTable
+
+        The clock jumps straight to the next arrival or completion and the
+        ready set lives in a heap keyed on remaining_time and then arrival
+        order (like the streaming engines), so a run costs O(n log n).
+        Results go to a ScheduleResult and slices to the gantt recorder (a
+        ColumnarGantt by default).
+
+        Every engine takes switch_cost: dispatching a process other than
+        the one that ran last first spends that long in a "SWITCH" segment.
+        A preemptive engine looks at what arrived during the switch as soon
+        as it ends.
+
+        Every engine also takes checkpoints, the hook IncrementalSimulator
+        uses to resume a run: it supplies the arrival order, may replace
+        the initial loop state and result columns with a saved checkpoint,
+        and is handed the loop state whenever the clock passes the next
+        checkpoint time. Without it that check never fires. The state tuple
+        starts with (current_time, next_idx, last, remaining), remaining
+        being None for engines that keep no per-row array of it.
+        """
+        n = len(table)
+        arrival = table.arrival_time
+        pids = table.pid
+        result = ScheduleResult(table)
+        start = result.start_time
+        completion = result.completion_time
+        order = checkpoints.order if checkpoints is not None else sorted(range(n), key=arrival.__getitem__)
+        ready = []
+        current_time = 0
+        gantt_chart = gantt if gantt is not None else ColumnarGantt()
+        next_idx = 0
+        last = -1  # row that ran last, for switch_cost
+        next_checkpoint = NO_CHECKPOINT
+        if checkpoints is not None:
+            current_time, next_idx, last, _, ready = checkpoints.resume(
+                result, (current_time, next_idx, last, None, ready))
+            next_checkpoint = current_time
+
+        while next_idx < n or ready:
+            if current_time >= next_checkpoint:
+                next_checkpoint = checkpoints.save(gantt_chart, result,
+                                                   (current_time, next_idx, last, None, ready))
+
+            # Admit everything that has arrived by now
+            while next_idx < n and arrival[order[next_idx]] <= current_time:
+                i = order[next_idx]
+                heapq.heappush(ready, (table.burst_time[i], next_idx, i))
+                next_idx += 1
+
+            if not ready:
+                next_arrival = arrival[order[next_idx]]
+                gantt_chart.add("IDLE", current_time, next_arrival)
+                current_time = next_arrival
+                continue
+
+            remaining, seq, i = heapq.heappop(ready)
+            pid = pids[i]
+
+            if switch_cost and last not in (-1, i):
+                gantt_chart.add("SWITCH", current_time, current_time + switch_cost)
+                current_time += switch_cost
+            last = i
+
+            # Run until completion or the next arrival, whichever comes first
+            run_until = current_time + remaining
+            if next_idx < n and arrival[order[next_idx]] < run_until:
+                run_until = max(arrival[order[next_idx]], current_time)
+
+            if run_until > current_time:
+                if start[i] == -1:
+                    start[i] = current_time
+                gantt_chart.add(pid, current_time, run_until)
+
+            remaining -= run_until - current_time
+            current_time = run_until
+
+            if remaining == 0:
+                if start[i] == -1:
+                    start[i] = current_time
+                completion[i] = current_time
+            else:
+                heapq.heappush(ready, (remaining, seq, i))
+
+        return result, gantt_chart
+
+    @staticmethod
+    def priority_preemptive(processes):
+        """Priority (Preemptive) scheduling - Lower priority number = higher priority"""
+        processes = [copy.deepcopy(p) for p in processes]
+        n = len(processes)
+        current_time = 0
+        completed = 0
+        gantt_chart = []
+        last_process = None
+        
+        while completed < n:
+            available = [p for p in processes if p.arrival_time <= current_time and p.remaining_time > 0]
+            
+            if not available:
+                next_arrival = min([p.arrival_time for p in processes if p.remaining_time > 0])
+                if last_process != "IDLE":
+                    gantt_chart.append(("IDLE", current_time, next_arrival))
+                    last_process = "IDLE"
+                current_time = next_arrival
+                continue
+            
+            current_process = min(available, key=lambda p: p.priority)
+            
+            if current_process.start_time == -1:
+                current_process.start_time = current_time
+            
+            if last_process != current_process.pid:
+                gantt_chart.append((current_process.pid, current_time, current_time + 1))
+                last_process = current_process.pid
+            else:
+                gantt_chart[-1] = (gantt_chart[-1][0], gantt_chart[-1][1], current_time + 1)
+            
+            current_process.remaining_time -= 1
+            current_time += 1
+            
+            if current_process.remaining_time == 0:
+                completed += 1
+                current_process.completion_time = current_time
+                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
+                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
+        
+        return processes, gantt_chart
+
+    @staticmethod
+    def priority_preemptive_fast(processes):
+        """Priority (Preemptive) scheduling - event driven
+
+        Ties are broken by arrival time and then PID; see priority_table.
+        """
+        result, gantt_chart = SchedulingSimulator.priority_table(ProcessTable.from_processes(processes))
+        return result.to_processes(), gantt_chart
+
+    @staticmethod
+    def priority_table(table, gantt=None, switch_cost=0, checkpoints=None):
+        """Priority (Preemptive) over a ProcessTable
+
+        Ready rows sit in a heap keyed on (priority, arrival_time, pid), so
+        ties are deterministic. The running process is only re-evaluated at
+        arrivals and completions.
+        """
+        n = len(table)
+        arrival = table.arrival_time
+        pids = table.pid
+        priority = table.priority
+        result = ScheduleResult(table)
+        start = result.start_time
+        completion = result.completion_time
+        remaining = array("q", table.burst_time)
+        order = checkpoints.order if checkpoints is not None else sorted(range(n), key=arrival.__getitem__)
+        ready = []
+        current_time = 0
+        gantt_chart = gantt if gantt is not None else ColumnarGantt()
+        next_idx = 0
+        last = -1  # row that ran last, for switch_cost
+        next_checkpoint = NO_CHECKPOINT
+        if checkpoints is not None:
+            current_time, next_idx, last, remaining, ready = checkpoints.resume(
+                result, (current_time, next_idx, last, remaining, ready))
+            next_checkpoint = current_time
+
+        while next_idx < n or ready:
+            if current_time >= next_checkpoint:
+                next_checkpoint = checkpoints.save(gantt_chart, result,
+                                                   (current_time, next_idx, last, remaining, ready))
+
+            # Admit everything that has arrived by now
+            while next_idx < n and arrival[order[next_idx]] <= current_time:
+                i = order[next_idx]
+                heapq.heappush(ready, (priority[i], arrival[i], pids[i], i))
+                next_idx += 1
+
+            if not ready:
+                next_arrival = arrival[order[next_idx]]
+                gantt_chart.add("IDLE", current_time, next_arrival)
+                current_time = next_arrival
+                continue
+
+            i = ready[0][3]
+            pid = pids[i]
+
+            if switch_cost and last not in (-1, i):
+                gantt_chart.add("SWITCH", current_time, current_time + switch_cost)
+                current_time += switch_cost
+            last = i
+
+            # Run until completion or the next arrival, whichever comes first
+            run_until = current_time + remaining[i]
+            if next_idx < n and arrival[order[next_idx]] < run_until:
+                run_until = max(arrival[order[next_idx]], current_time)
+
+            if run_until > current_time:
+                if start[i] == -1:
+                    start[i] = current_time
+                gantt_chart.add(pid, current_time, run_until)
+
+            remaining[i] -= run_until - current_time
+            current_time = run_until
+
+            if remaining[i] == 0:
+                heapq.heappop(ready)
+                if start[i] == -1:
+                    start[i] = current_time
+                completion[i] = current_time
+
+        return result, gantt_chart
+
+    @staticmethod
+    def round_robin(processes, time_quantum):
+        """Round Robin scheduling"""
+        processes = [copy.deepcopy(p) for p in processes]
+        queue = []
+        current_time = 0
+        gantt_chart = []
+        completed = 0
+        n = len(processes)
+        
+        for p in sorted(processes, key=lambda x: x.arrival_time):
+            if p.arrival_time == 0:
+                queue.append(p)
+        
+        while completed < n or queue:
+            if not queue:
+                next_process = min([p for p in processes if p.remaining_time > 0], 
+                                  key=lambda p: p.arrival_time)
+                gantt_chart.append(("IDLE", current_time, next_process.arrival_time))
+                current_time = next_process.arrival_time
+                queue.append(next_process)
+            
+            current_process = queue.pop(0)
+            
+            if current_process.start_time == -1:
+                current_process.start_time = current_time
+            
+            execution_time = min(time_quantum, current_process.remaining_time)
+            gantt_chart.append((current_process.pid, current_time, current_time + execution_time))
+            current_process.remaining_time -= execution_time
+            current_time += execution_time
+            
+            for p in processes:
+                if p.arrival_time <= current_time and p.remaining_time > 0 and p not in queue and p != current_process:
+                    queue.append(p)
+            
+            if current_process.remaining_time == 0:
+                completed += 1
+                current_process.completion_time = current_time
+                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
+                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
+            else:
+                queue.append(current_process)
+
+        return processes, gantt_chart
+
+    @staticmethod
+    def round_robin_fast(processes, time_quantum):
+        """Round Robin scheduling - deque with an arrival cursor
+
+        See round_robin_table.
+        """
+        result, gantt_chart = SchedulingSimulator.round_robin_table(
+            ProcessTable.from_processes(processes), time_quantum)
+        return result.to_processes(), gantt_chart
+
+    @staticmethod
+    def round_robin_table(table, time_quantum, gantt=None, switch_cost=0, checkpoints=None):
+        """Round Robin over a ProcessTable
+
+        Arrivals are admitted by walking a cursor over the rows sorted by
+        arrival time, so every dispatch is O(1) amortized. Every process
+        that has arrived when the CPU goes idle is seeded, not just the ones
+        arriving at time 0.
+        """
+        n = len(table)
+        arrival = table.arrival_time
+        pids = table.pid
+        result = ScheduleResult(table)
+        start = result.start_time
+        completion = result.completion_time
+        remaining = array("q", table.burst_time)
+        order = checkpoints.order if checkpoints is not None else sorted(range(n), key=arrival.__getitem__)
+        queue = deque()
+        current_time = 0
+        gantt_chart = gantt if gantt is not None else ColumnarGantt()
+        next_idx = 0
+        last = -1  # row that ran last, for switch_cost
+        next_checkpoint = NO_CHECKPOINT
+        if checkpoints is not None:
+            current_time, next_idx, last, remaining, queue = checkpoints.resume(
+                result, (current_time, next_idx, last, remaining, queue))
+            next_checkpoint = current_time
+
+        while next_idx < n or queue:
+            if current_time >= next_checkpoint:
+                next_checkpoint = checkpoints.save(gantt_chart, result,
+                                                   (current_time, next_idx, last, remaining, queue))
+
+            if not queue:
+                next_arrival = arrival[order[next_idx]]
+                if current_time < next_arrival:
+                    gantt_chart.add("IDLE", current_time, next_arrival)
+                    current_time = next_arrival
+                while next_idx < n and arrival[order[next_idx]] <= current_time:
+                    queue.append(order[next_idx])
+                    next_idx += 1
+
+            i = queue.popleft()
+
+            if switch_cost and last not in (-1, i):
+                gantt_chart.add("SWITCH", current_time, current_time + switch_cost)
+                current_time += switch_cost
+            last = i
+
+            if start[i] == -1:
+                start[i] = current_time
+
+            execution_time = min(time_quantum, remaining[i])
+            gantt_chart.add(pids[i], current_time, current_time + execution_time)
+            remaining[i] -= execution_time
+            current_time += execution_time
+
+            # New arrivals go ahead of the process that was just preempted
+            while next_idx < n and arrival[order[next_idx]] <= current_time:
+                queue.append(order[next_idx])
+                next_idx += 1
+
+            if remaining[i] == 0:
+                completion[i] = current_time
+            else:
+                queue.append(i)
+
+        return result, gantt_chart
+
+    @staticmethod
+    def fcfs_table(table, gantt=None, switch_cost=0, checkpoints=None):
+        """First Come First Serve over a ProcessTable"""
+        n = len(table)
+        arrival = table.arrival_time
+        burst = table.burst_time
+        pids = table.pid
+        result = ScheduleResult(table)
+        start = result.start_time
+        completion = result.completion_time
+        order = checkpoints.order if checkpoints is not None else sorted(range(n), key=arrival.__getitem__)
+        current_time = 0
+        gantt_chart = gantt if gantt is not None else ColumnarGantt()
+        next_idx = 0
+        last = -1
+        next_checkpoint = NO_CHECKPOINT
+        if checkpoints is not None:
+            current_time, next_idx, last, _ = checkpoints.resume(
+                result, (current_time, next_idx, last, None))
+            next_checkpoint = current_time
+
+        while next_idx < n:
+            if current_time >= next_checkpoint:
+                next_checkpoint = checkpoints.save(gantt_chart, result,
+                                                   (current_time, next_idx, last, None))
+
+            i = order[next_idx]
+            next_idx += 1
+            if current_time < arrival[i]:
+                gantt_chart.add("IDLE", current_time, arrival[i])
+                current_time = arrival[i]
+
+            if switch_cost and last != -1:
+                gantt_chart.add("SWITCH", current_time, current_time + switch_cost)
+                current_time += switch_cost
+            last = i
+
+            start[i] = current_time
+            gantt_chart.add(pids[i], current_time, current_time + burst[i])
+            current_time += burst[i]
+            completion[i] = current_time
+
+        return result, gantt_chart
+
+    @staticmethod
+    def mlfq_table(table, quanta=(2, 4, 8), boost_period=None, gantt=None, switch_cost=0,
+                   checkpoints=None):
+        """Multilevel Feedback Queue over a ProcessTable
+
+        There is one FIFO level per entry of quanta. New processes enter the
+        top level; a process that has used up its level's quantum (across
+        preemptions) moves one level down, and the last level is plain
+        Round Robin. An arrival preempts anything below the top level, and
+        every boost_period time units all waiting processes move back to
+        the top. The clock jumps between arrivals, quantum ends and boosts.
+        """
+        if not quanta or min(quanta) <= 0:
+            raise ValueError("Quanta must be positive")
+        if boost_period is not None and boost_period <= 0:
+            raise ValueError("Boost period must be positive")
+        n = len(table)
+        arrival = table.arrival_time
+        pids = table.pid
+        result = ScheduleResult(table)
+        start = result.start_time
+        completion = result.completion_time
+        remaining = array("q", table.burst_time)
+        # Time used at the current level, valid while used_epoch matches boosts
+        used = array("q", [0]) * n
+        used_epoch = array("q", [0]) * n
+        boosts = 0
+        order = checkpoints.order if checkpoints is not None else sorted(range(n), key=arrival.__getitem__)
+        levels = len(quanta)
+        # The top level is a chain of FIFOs, so a boost only has to link the
+        # lower levels onto it instead of moving every waiting process
+        top = deque([deque()])
+        lower = [deque() for _ in quanta[1:]]
+        counts = [0] * levels
+        waiting = 0
+        current_time = 0
+        gantt_chart = gantt if gantt is not None else ColumnarGantt()
+        next_idx = 0
+        last = -1  # row that ran last, for switch_cost
+        next_boost = boost_period
+        next_checkpoint = NO_CHECKPOINT
+        if checkpoints is not None:
+            (current_time, next_idx, last, remaining, used, used_epoch, boosts, top, lower, counts,
+             waiting, next_boost) = checkpoints.resume(
+                result, (current_time, next_idx, last, remaining, used, used_epoch, boosts, top,
+                         lower, counts, waiting, next_boost))
+            next_checkpoint = current_time
+
+        while next_idx < n or waiting:
+            if current_time >= next_checkpoint:
+                next_checkpoint = checkpoints.save(
+                    gantt_chart, result, (current_time, next_idx, last, remaining, used, used_epoch,
+                                          boosts, top, lower, counts, waiting, next_boost))
+
+            # Admit everything that has arrived by now
+            while next_idx < n and arrival[order[next_idx]] <= current_time:
+                top[-1].append(order[next_idx])
+                counts[0] += 1
+                waiting += 1
+                next_idx += 1
+
+            if not waiting:
+                next_arrival = arrival[order[next_idx]]
+                gantt_chart.add("IDLE", current_time, next_arrival)
+                current_time = next_arrival
+                if boost_period:
+                    next_boost = (current_time // boost_period + 1) * boost_period
+                continue
+
+            if counts[0]:
+                level = 0
+                while not top[0]:
+                    top.popleft()
+                i = top[0].popleft()
+            else:
+                level = 1
+                while not counts[level]:
+                    level += 1
+                i = lower[level - 1].popleft()
+            counts[level] -= 1
+            waiting -= 1
+            if used_epoch[i] != boosts:
+                used[i] = 0
+                used_epoch[i] = boosts
+
+            if switch_cost and last not in (-1, i):
+                gantt_chart.add("SWITCH", current_time, current_time + switch_cost)
+                current_time += switch_cost
+            last = i
+
+            # Run until the quantum is used up or the process completes, a
+            # boost is due or (below the top level) the next arrival. A
+            # boost that fell due during the switch waits for this slice
+            run_until = current_time + min(quanta[level] - used[i], remaining[i])
+            if level and next_idx < n and arrival[order[next_idx]] < run_until:
+                run_until = max(arrival[order[next_idx]], current_time)
+            if boost_period and current_time < next_boost < run_until:
+                run_until = next_boost
+
+            if run_until > current_time or remaining[i] == 0:
+                if start[i] == -1:
+                    start[i] = current_time
+            if run_until > current_time:
+                gantt_chart.add(pids[i], current_time, run_until)
+            remaining[i] -= run_until - current_time
+            used[i] += run_until - current_time
+            current_time = run_until
+
+            # New arrivals go ahead of the process that was just preempted
+            while next_idx < n and arrival[order[next_idx]] <= current_time:
+                top[-1].append(order[next_idx])
+                counts[0] += 1
+                waiting += 1
+                next_idx += 1
+
+            if remaining[i] == 0:
+                completion[i] = current_time
+            else:
+                if used[i] >= quanta[level]:
+                    used[i] = 0
+                    if level < levels - 1:
+                        level += 1
+                if level:
+                    lower[level - 1].append(i)
+                else:
+                    top[-1].append(i)
+                counts[level] += 1
+                waiting += 1
+
+            if boost_period and current_time >= next_boost:
+                for level in range(1, levels):
+                    if counts[level]:
+                        top.append(lower[level - 1])
+                        lower[level - 1] = deque()
+                        counts[0] += counts[level]
+                        counts[level] = 0
+                boosts += 1
+                next_boost = (current_time // boost_period + 1) * boost_period
+
+        return result, gantt_chart
+
+    @staticmethod
+    def cfs_table(table, latency=24, min_granularity=3, gantt=None, switch_cost=0, checkpoints=None):
+        """Completely Fair Scheduler style engine over a ProcessTable
+
+        The priority column is read as a nice value (-20..19, clamped) and
+        mapped to the kernel's load weights. Ready processes sit in a heap
+        ordered by virtual runtime, which grows by the time run scaled by
+        1024 / weight, so lower nice values get proportionally more CPU.
+        The leftmost process (the earliest arrival among equals) runs for
+        its weighted share of latency (at least min_granularity), then goes
+        back into the heap. Arrivals start at the current minimum virtual
+        runtime and wait for the running slice to end.
+        """
+        if latency <= 0 or min_granularity <= 0:
+            raise ValueError("Latency and minimum granularity must be positive")
+        n = len(table)
+        arrival = table.arrival_time
+        pids = table.pid
+        result = ScheduleResult(table)
+        start = result.start_time
+        completion = result.completion_time
+        remaining = array("q", table.burst_time)
+        weight = array("q", [NICE_WEIGHTS[min(max(nice, -20), 19) + 20] for nice in table.priority])
+        order = checkpoints.order if checkpoints is not None else sorted(range(n), key=arrival.__getitem__)
+        ready = []
+        total_weight = 0
+        min_vruntime = 0
+        current_time = 0
+        gantt_chart = gantt if gantt is not None else ColumnarGantt()
+        next_idx = 0
+        last = -1  # row that ran last, for switch_cost
+        next_checkpoint = NO_CHECKPOINT
+        if checkpoints is not None:
+            current_time, next_idx, last, remaining, ready, total_weight, min_vruntime = checkpoints.resume(
+                result, (current_time, next_idx, last, remaining, ready, total_weight, min_vruntime))
+            next_checkpoint = current_time
+
+        while next_idx < n or ready:
+            if current_time >= next_checkpoint:
+                next_checkpoint = checkpoints.save(
+                    gantt_chart, result,
+                    (current_time, next_idx, last, remaining, ready, total_weight, min_vruntime))
+
+            # Admit everything that has arrived by now
+            while next_idx < n and arrival[order[next_idx]] <= current_time:
+                i = order[next_idx]
+                heapq.heappush(ready, (min_vruntime, next_idx, i))
+                total_weight += weight[i]
+                next_idx += 1
+
+            if not ready:
+                next_arrival = arrival[order[next_idx]]
+                gantt_chart.add("IDLE", current_time, next_arrival)
+                current_time = next_arrival
+                continue
+
+            vruntime, seq, i = heapq.heappop(ready)
+
+            if switch_cost and last not in (-1, i):
+                gantt_chart.add("SWITCH", current_time, current_time + switch_cost)
+                current_time += switch_cost
+            last = i
+
+            if start[i] == -1:
+                start[i] = current_time
+
+            time_slice = max(min_granularity, latency * weight[i] // total_weight, 1)
+            ran = min(time_slice, remaining[i])
+            if ran:
+                gantt_chart.add(pids[i], current_time, current_time + ran)
+            remaining[i] -= ran
+            current_time += ran
+            # Virtual runtime in units of 1/1024 of a weight-1024 time unit
+            vruntime += ran * 1024 * 1024 // weight[i]
+
+            if remaining[i] == 0:
+                completion[i] = current_time
+                total_weight -= weight[i]
+            else:
+                heapq.heappush(ready, (vruntime, seq, i))
+            if ready and ready[0][0] > min_vruntime:
+                min_vruntime = ready[0][0]
+
+        return result, gantt_chart
+
+    @classmethod
+    def run(cls, algorithm, processes, time_quantum=None, gantt=None, **options):
+        """Run an engine by its short name (see ALGORITHMS) over Process objects"""
+        result, gantt_chart = cls.run_table(algorithm, ProcessTable.from_processes(processes),
+                                            time_quantum, gantt, **options)
+        return result.to_processes(), gantt_chart
+
+    @classmethod
+    def run_table(cls, algorithm, table, time_quantum=None, gantt=None, **options):
+        """Run an engine by its short name over a ProcessTable
+
+        For mlfq, time_quantum is the top-level quantum and doubles at each
+        of the three levels unless quanta is passed in options. Other
+        options (switch_cost, boost_period, latency, ...) go to the engine.
+        """
+        engine, options = cls.engine(algorithm, time_quantum, **options)
+        with profiler.stage("simulate"):
+            result, gantt_chart = engine(table, gantt=gantt, **options)
+        profiler.record_run(table, gantt_chart)
+        return result, gantt_chart
+
+    @classmethod
+    def engine(cls, algorithm, time_quantum=None, **options):
+        """The table engine for a short name and the options to call it with
+
+        Validates the arguments the way run_table does.
+        """
+        if algorithm not in cls.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if options.get("switch_cost", 0) < 0:
+            raise ValueError("Switch cost must not be negative")
+        engine = getattr(cls, cls.ALGORITHMS[algorithm])
+        if algorithm == "rr":
+            if time_quantum is None or time_quantum <= 0:
+                raise ValueError("Time quantum must be positive")
+            options["time_quantum"] = time_quantum
+        if algorithm == "mlfq" and time_quantum is not None:
+            if time_quantum <= 0:
+                raise ValueError("Time quantum must be positive")
+            options.setdefault("quanta", tuple(time_quantum << level for level in range(3)))
+        return engine, options
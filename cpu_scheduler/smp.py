@@ -0,0 +1,303 @@
+"""Multi-processor (SMP) scheduling
+
+SMPSimulator runs FCFS, SJF, Priority and Round Robin on several CPUs at
+once. Processes wait either in one global run queue shared by all CPUs or
+in per-CPU run queues, where each arrival goes to the least loaded CPU
+and an idle CPU can optionally steal work from the busiest one. A CPU
+that dispatches a different process than it last ran first pays
+switch_cost, and a process that resumes on a different CPU than it last
+ran on pays migration_cost time units of cache warm-up on top; both are
+recorded as a "SWITCH" segment. A switch is never cut short: a better
+process that arrives during it preempts only once it ends, as on a
+single CPU. The output is one ScheduleResult plus one
+ColumnarGantt lane per CPU, all padded to the same end time.
+
+The simulation is event driven: the clock jumps between arrivals and the
+ends of running slices and switches, which sit in heaps. With cpus=1 and
+a global queue every engine reproduces its single-CPU counterpart in
+SchedulingSimulator exactly, switch_cost included.
+"""
+import heapq
+from array import array
+from collections import deque
+
+from .gantt import ColumnarGantt
+from .profiling import profiler
+from .table import ScheduleResult
+
+QUEUE_MODES = ("global", "per-cpu")
+
+
+class SMPSimulator:
+    """One algorithm on a machine with `cpus` processors"""
+
+    ALGORITHMS = ("fcfs", "sjf", "priority", "rr")
+
+    def __init__(self, algorithm, cpus, time_quantum=None, queues="global",
+                 work_stealing=False, migration_cost=0, switch_cost=0):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm on several CPUs: {algorithm} "
+                             f"(use one of {', '.join(self.ALGORITHMS)})")
+        if algorithm == "rr" and (time_quantum is None or time_quantum <= 0):
+            raise ValueError("Time quantum must be positive")
+        if cpus < 1:
+            raise ValueError("CPU count must be at least 1")
+        if queues not in QUEUE_MODES:
+            raise ValueError(f"Unknown queue mode: {queues}")
+        if migration_cost < 0 or switch_cost < 0:
+            raise ValueError("Switch and migration costs must not be negative")
+        self.algorithm = algorithm
+        self.cpus = cpus
+        self.time_quantum = time_quantum if algorithm == "rr" else None
+        self.queues = queues
+        self.work_stealing = work_stealing
+        self.migration_cost = migration_cost
+        self.switch_cost = switch_cost
+
+    def run(self, table):
+        """Simulate table and return (ScheduleResult, [ColumnarGantt per CPU])"""
+        with profiler.stage("simulate smp"):
+            return self._run(table)
+
+    def _run(self, table):
+        n = len(table)
+        cpus = self.cpus
+        algorithm = self.algorithm
+        arrival = table.arrival_time
+        priority = table.priority
+        pids = table.pid
+        result = ScheduleResult(table)
+        start = result.start_time
+        completion = result.completion_time
+        remaining = array("q", table.burst_time)
+        last_cpu = array("q", [-1]) * n
+        order = sorted(range(n), key=arrival.__getitem__)
+        lanes = [ColumnarGantt() for _ in range(cpus)]
+        migration_cost = self.migration_cost
+        switch_cost = self.switch_cost
+        time_quantum = self.time_quantum
+        per_cpu = self.queues == "per-cpu"
+        stealing = per_cpu and self.work_stealing
+        preemptive = algorithm in ("sjf", "priority")
+
+        # Ready queues: one shared, or one per CPU. SJF and Priority keep a
+        # heap of keys ending in the row; FCFS and Round Robin a FIFO of rows
+        queues = [[] if preemptive else deque() for _ in range(cpus if per_cpu else 1)]
+        if algorithm == "sjf":
+            # Equal remaining times go in arrival order, as in sjf_table
+            rank = array("q", [0]) * n
+            for k, i in enumerate(order):
+                rank[i] = k
+            def ready_key(i):
+                return (remaining[i], rank[i], i)
+        else:
+            def ready_key(i):
+                return (priority[i], arrival[i], pids[i], i)
+
+        # Per-CPU state; a running slice's end event is (slice_end, cpu, version)
+        running = [-1] * cpus
+        last_run = [-1] * cpus  # row each CPU ran last
+        dispatched_at = [0] * cpus
+        work_start = [0] * cpus
+        slice_end = [0] * cpus
+        version = [0] * cpus
+        idle_since = [0] * cpus
+        load = [0] * cpus  # processes queued on or running on each CPU
+        events = []
+        idle_cpus = list(range(cpus))  # heap, entries of busy CPUs are stale
+        in_idle_heap = [not per_cpu] * cpus
+        idle_set = set(range(cpus))  # idle CPUs, for work stealing
+        queued = [0]  # processes waiting in any queue
+        # Max-heap of the running processes (global queue only), to find the
+        # one a better arrival preempts; entries are negated keys plus
+        # (version, cpu). A CPU still paying a switch can't be preempted and
+        # has less work left than its slice end suggests, so with costs the
+        # CPUs are scanned instead.
+        running_heap = []
+        scan_running = preemptive and bool(switch_cost or migration_cost)
+        # Ends of switches on preemptive CPUs, (work_start, cpu, version),
+        # when what arrived during them gets its chance to preempt
+        switch_ends = []
+
+        def push(q, i):
+            queued[0] += 1
+            if preemptive:
+                heapq.heappush(queues[q], ready_key(i))
+            else:
+                queues[q].append(i)
+
+        def pop(q):
+            queued[0] -= 1
+            if preemptive:
+                return heapq.heappop(queues[q])[-1]
+            return queues[q].popleft()
+
+        def running_key(c, now):
+            """Key of the process running on c, comparable with ready keys"""
+            i = running[c]
+            if algorithm == "sjf":
+                return (slice_end[c] - max(now, work_start[c]), rank[i], i)
+            return (priority[i], arrival[i], pids[i], i)
+
+        def dispatch(c, i, now):
+            lane = lanes[c]
+            if idle_since[c] < now:
+                lane.add("IDLE", idle_since[c], now)
+            cost = switch_cost if last_run[c] not in (-1, i) else 0
+            if last_cpu[i] not in (-1, c):
+                cost += migration_cost
+            last_cpu[i] = c
+            last_run[c] = i
+            running[c] = i
+            idle_set.discard(c)
+            dispatched_at[c] = now
+            work_start[c] = now + cost
+            length = remaining[i] if time_quantum is None else min(time_quantum, remaining[i])
+            slice_end[c] = now + cost + length
+            version[c] += 1
+            heapq.heappush(events, (slice_end[c], c, version[c]))
+            if preemptive and cost and length:
+                heapq.heappush(switch_ends, (work_start[c], c, version[c]))
+            if preemptive and not per_cpu and not scan_running:
+                if algorithm == "sjf":
+                    entry = (-slice_end[c], -rank[i], -i, version[c], c)
+                else:
+                    entry = (-priority[i], -arrival[i], -pids[i], -i, version[c], c)
+                heapq.heappush(running_heap, entry)
+
+        def stop(c, now):
+            """Take the process off c at now; returns its row"""
+            i = running[c]
+            lane = lanes[c]
+            begin = work_start[c]
+            if dispatched_at[c] < min(begin, now):
+                lane.add("SWITCH", dispatched_at[c], min(begin, now))
+            if now > begin:
+                lane.add(pids[i], begin, now)
+                remaining[i] -= now - begin
+                if start[i] == -1:
+                    start[i] = begin
+            running[c] = -1
+            idle_set.add(c)
+            version[c] += 1
+            idle_since[c] = now
+            if not in_idle_heap[c]:
+                in_idle_heap[c] = True
+                heapq.heappush(idle_cpus, c)
+            return i
+
+        def worst_running(now):
+            """CPU whose running process a better ready one would preempt"""
+            if scan_running:
+                busy = [c for c in range(cpus) if running[c] != -1 and work_start[c] <= now]
+                return max(busy, key=lambda c: running_key(c, now)) if busy else -1
+            heap = running_heap
+            while heap and version[heap[0][-1]] != heap[0][-2]:
+                heapq.heappop(heap)
+            return heap[0][-1] if heap else -1
+
+        def any_idle():
+            while idle_cpus and running[idle_cpus[0]] != -1:
+                in_idle_heap[heapq.heappop(idle_cpus)] = False
+            return bool(idle_cpus)
+
+        def take_idle_cpu(preferred):
+            """An idle CPU, the preferred one if it is idle (call any_idle first)"""
+            if preferred >= 0 and running[preferred] == -1:
+                return preferred
+            c = heapq.heappop(idle_cpus)
+            in_idle_heap[c] = False
+            return c
+
+        def fill(c, now):
+            """Dispatch from c's own queue (per-CPU mode), stealing if allowed"""
+            queue = queues[c]
+            if running[c] == -1:
+                if not queue and stealing:
+                    victim = max(range(cpus), key=lambda v: len(queues[v]))
+                    if queues[victim]:
+                        i = pop(victim)
+                        load[victim] -= 1
+                        load[c] += 1
+                        push(c, i)
+                if queue:
+                    dispatch(c, pop(c), now)
+            elif preemptive and queue and work_start[c] <= now and queue[0] < running_key(c, now):
+                i = stop(c, now)
+                push(c, i)
+                dispatch(c, pop(c), now)
+
+        next_idx = 0
+        done = 0
+        now = 0
+        while done < n:
+            # Jump to the next arrival, slice end or switch end
+            now = events[0][0] if events else None
+            if next_idx < n and (now is None or arrival[order[next_idx]] < now):
+                now = arrival[order[next_idx]]
+            if switch_ends and switch_ends[0][0] < now:
+                now = switch_ends[0][0]
+            touched = set()
+            while switch_ends and switch_ends[0][0] <= now:
+                _, c, v = heapq.heappop(switch_ends)
+                if v == version[c]:
+                    touched.add(c)
+
+            # Arrivals first, so they queue ahead of a preempted process
+            while next_idx < n and arrival[order[next_idx]] <= now:
+                i = order[next_idx]
+                next_idx += 1
+                if per_cpu:
+                    c = min(range(cpus), key=load.__getitem__)
+                    load[c] += 1
+                    push(c, i)
+                    touched.add(c)
+                else:
+                    push(0, i)
+
+            # Finish the slices that end now
+            while events and events[0][0] == now:
+                _, c, v = heapq.heappop(events)
+                if v != version[c]:
+                    continue
+                i = stop(c, now)
+                if remaining[i] == 0:
+                    completion[i] = now
+                    if start[i] == -1:
+                        start[i] = work_start[c]
+                    load[c] -= 1
+                    done += 1
+                else:
+                    push(c if per_cpu else 0, i)
+                touched.add(c)
+
+            # Hand out work
+            if per_cpu:
+                for c in sorted(touched):
+                    fill(c, now)
+                if stealing:
+                    for c in sorted(idle_set):
+                        if not queued[0]:
+                            break
+                        fill(c, now)
+            else:
+                queue = queues[0]
+                while queue:
+                    if any_idle():
+                        i = queue[0][-1] if preemptive else queue[0]
+                        c = take_idle_cpu(last_cpu[i])
+                        dispatch(c, pop(0), now)
+                    elif preemptive:
+                        c = worst_running(now)
+                        if c == -1 or not queue[0] < running_key(c, now):
+                            break
+                        push(0, stop(c, now))
+                    else:
+                        break
+
+        # Pad every lane with idle time up to the common end
+        end = max(lane.total_time for lane in lanes)
+        for c, lane in enumerate(lanes):
+            if idle_since[c] < end:
+                lane.add("IDLE", idle_since[c], end)
+        return result, lanes
@@ -0,0 +1,68 @@
+"""Bounded-time snapshots of the running processes
+
+Needs psutil, which the rest of cpu_scheduler does not; import this module
+only where psutil is available.
+
+psutil.Process.cpu_percent(interval) sleeps for interval on every call, so
+sampling processes one by one costs interval x processes. take_snapshot
+instead primes cpu_percent(None) on every process, sleeps once for the
+sampling window and then reads them all, so a snapshot takes about one
+interval however many processes exist.
+"""
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+ProcessSample = namedtuple("ProcessSample", ["pid", "name", "nice", "cpu_percent"])
+
+
+def _prime(proc):
+    """Start the cpu_percent measurement window; False if it cannot be measured"""
+    try:
+        proc.cpu_percent(None)
+        return True
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+
+def _read(proc, primed):
+    """Read one process at the end of the window; None if it exited"""
+    try:
+        cpu_percent = proc.cpu_percent(None) if primed else 0.0
+    except psutil.NoSuchProcess:
+        return None
+    except psutil.AccessDenied:
+        cpu_percent = 0.0
+    nice = proc.info["nice"]
+    return ProcessSample(proc.info["pid"], proc.info["name"] or str(proc.info["pid"]),
+                         nice if nice is not None else 0, cpu_percent)
+
+
+def take_snapshot(interval=0.1, limit=None, top_by_cpu=False, workers=None):
+    """Sample every running process over a single interval
+
+    limit keeps at most that many processes: the first ones psutil lists,
+    or the busiest ones when top_by_cpu is set. workers > 1 fans the
+    priming and reading out over a thread pool, which helps on hosts with
+    many processes where each psutil call is a few system calls.
+    """
+    procs = list(psutil.process_iter(["pid", "name", "nice"]))
+
+    if workers and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            primed = list(executor.map(_prime, procs))
+            time.sleep(interval)
+            samples = list(executor.map(_read, procs, primed))
+    else:
+        primed = [_prime(proc) for proc in procs]
+        time.sleep(interval)
+        samples = [_read(proc, p) for proc, p in zip(procs, primed)]
+
+    samples = [s for s in samples if s is not None]
+    if top_by_cpu:
+        samples.sort(key=lambda s: s.cpu_percent, reverse=True)
+    if limit is not None:
+        samples = samples[:limit]
+    return samples
@@ -0,0 +1,374 @@
+"""Streaming scheduling engines
+
+Each engine consumes an iterable of (pid, arrival_time, burst_time,
+priority) records sorted by arrival time and yields one completion
+record (pid, arrival_time, burst_time, priority, start_time,
+completion_time) per process as soon as it finishes. Only processes that
+have arrived and not yet finished are held in memory, so traces larger
+than RAM can be replayed. Gantt slices go to an optional recorder from
+cpu_scheduler.gantt, typically a GanttFileSink. switch_cost is charged as
+in the table engines, so a stream produces the same schedule as the
+matching table engine.
+"""
+import heapq
+from collections import deque
+
+from .gantt import NullGantt
+from .simulator import NICE_WEIGHTS, SchedulingSimulator
+from .trace import sorted_arrivals
+
+
+def stream_fcfs(records, gantt=None, switch_cost=0):
+    """First Come First Serve over a sorted record stream"""
+    gantt = gantt if gantt is not None else NullGantt()
+    current_time = 0
+    first = True
+    for pid, arrival, burst, priority in sorted_arrivals(records):
+        if current_time < arrival:
+            gantt.add("IDLE", current_time, arrival)
+            current_time = arrival
+        if switch_cost and not first:
+            gantt.add("SWITCH", current_time, current_time + switch_cost)
+            current_time += switch_cost
+        first = False
+        start = current_time
+        gantt.add(pid, current_time, current_time + burst)
+        current_time += burst
+        yield (pid, arrival, burst, priority, start, current_time)
+
+
+def stream_sjf(records, gantt=None, switch_cost=0):
+    """Shortest Job First (Preemptive) over a sorted record stream"""
+    gantt = gantt if gantt is not None else NullGantt()
+    arrivals = sorted_arrivals(records)
+    nxt = next(arrivals, None)
+    ready = []
+    seq = 0
+    current_time = 0
+    last = -1  # seq of the process that ran last, for switch_cost
+
+    while nxt is not None or ready:
+        # Admit everything that has arrived by now
+        while nxt is not None and nxt[1] <= current_time:
+            pid, arrival, burst, priority = nxt
+            heapq.heappush(ready, (burst, seq, pid, arrival, burst, priority, -1))
+            seq += 1
+            nxt = next(arrivals, None)
+
+        if not ready:
+            gantt.add("IDLE", current_time, nxt[1])
+            current_time = nxt[1]
+            continue
+
+        remaining, s, pid, arrival, burst, priority, start = heapq.heappop(ready)
+
+        if switch_cost and last not in (-1, s):
+            gantt.add("SWITCH", current_time, current_time + switch_cost)
+            current_time += switch_cost
+        last = s
+
+        # Run until completion or the next arrival, whichever comes first
+        run_until = current_time + remaining
+        if nxt is not None and nxt[1] < run_until:
+            run_until = max(nxt[1], current_time)
+        if run_until > current_time:
+            if start == -1:
+                start = current_time
+            gantt.add(pid, current_time, run_until)
+
+        remaining -= run_until - current_time
+        current_time = run_until
+
+        if remaining == 0:
+            if start == -1:
+                start = current_time
+            yield (pid, arrival, burst, priority, start, current_time)
+        else:
+            heapq.heappush(ready, (remaining, s, pid, arrival, burst, priority, start))
+
+
+def stream_priority(records, gantt=None, switch_cost=0):
+    """Priority (Preemptive) over a sorted record stream
+
+    Ties are broken by arrival time and then PID, as in priority_table.
+    """
+    gantt = gantt if gantt is not None else NullGantt()
+    arrivals = sorted_arrivals(records)
+    nxt = next(arrivals, None)
+    ready = []
+    seq = 0
+    current_time = 0
+    last = -1  # seq of the process that ran last, for switch_cost
+
+    while nxt is not None or ready:
+        # Admit everything that has arrived by now
+        while nxt is not None and nxt[1] <= current_time:
+            pid, arrival, burst, priority = nxt
+            heapq.heappush(ready, (priority, arrival, pid, seq, burst, burst, -1))
+            seq += 1
+            nxt = next(arrivals, None)
+
+        if not ready:
+            gantt.add("IDLE", current_time, nxt[1])
+            current_time = nxt[1]
+            continue
+
+        priority, arrival, pid, s, burst, remaining, start = heapq.heappop(ready)
+
+        if switch_cost and last not in (-1, s):
+            gantt.add("SWITCH", current_time, current_time + switch_cost)
+            current_time += switch_cost
+        last = s
+
+        # Run until completion or the next arrival, whichever comes first
+        run_until = current_time + remaining
+        if nxt is not None and nxt[1] < run_until:
+            run_until = max(nxt[1], current_time)
+        if run_until > current_time:
+            if start == -1:
+                start = current_time
+            gantt.add(pid, current_time, run_until)
+
+        remaining -= run_until - current_time
+        current_time = run_until
+
+        if remaining == 0:
+            if start == -1:
+                start = current_time
+            yield (pid, arrival, burst, priority, start, current_time)
+        else:
+            heapq.heappush(ready, (priority, arrival, pid, s, burst, remaining, start))
+
+
+def stream_round_robin(records, time_quantum, gantt=None, switch_cost=0):
+    """Round Robin over a sorted record stream"""
+    gantt = gantt if gantt is not None else NullGantt()
+    arrivals = sorted_arrivals(records)
+    nxt = next(arrivals, None)
+    queue = deque()
+    current_time = 0
+    last = None  # entry of the process that ran last, for switch_cost
+
+    while nxt is not None or queue:
+        if not queue:
+            if current_time < nxt[1]:
+                gantt.add("IDLE", current_time, nxt[1])
+                current_time = nxt[1]
+            while nxt is not None and nxt[1] <= current_time:
+                queue.append([nxt[0], nxt[1], nxt[2], nxt[3], nxt[2], -1])
+                nxt = next(arrivals, None)
+
+        entry = queue.popleft()
+        if switch_cost and last is not None and last is not entry:
+            gantt.add("SWITCH", current_time, current_time + switch_cost)
+            current_time += switch_cost
+        last = entry
+        if entry[5] == -1:
+            entry[5] = current_time
+
+        execution_time = min(time_quantum, entry[4])
+        gantt.add(entry[0], current_time, current_time + execution_time)
+        entry[4] -= execution_time
+        current_time += execution_time
+
+        # New arrivals go ahead of the process that was just preempted
+        while nxt is not None and nxt[1] <= current_time:
+            queue.append([nxt[0], nxt[1], nxt[2], nxt[3], nxt[2], -1])
+            nxt = next(arrivals, None)
+
+        if entry[4] == 0:
+            yield (entry[0], entry[1], entry[2], entry[3], entry[5], current_time)
+        else:
+            queue.append(entry)
+
+
+def stream_mlfq(records, quanta=(2, 4, 8), boost_period=None, gantt=None, switch_cost=0):
+    """Multilevel Feedback Queue over a sorted record stream
+
+    Same levels, demotion and boosts as mlfq_table.
+    """
+    if not quanta or min(quanta) <= 0:
+        raise ValueError("Quanta must be positive")
+    if boost_period is not None and boost_period <= 0:
+        raise ValueError("Boost period must be positive")
+    gantt = gantt if gantt is not None else NullGantt()
+    arrivals = sorted_arrivals(records)
+    nxt = next(arrivals, None)
+    levels = len(quanta)
+    # Entries are [pid, arrival, burst, priority, remaining, start, used,
+    # boosts when used was last valid]; the top level is a chain of FIFOs
+    top = deque([deque()])
+    lower = [deque() for _ in quanta[1:]]
+    counts = [0] * levels
+    waiting = 0
+    boosts = 0
+    current_time = 0
+    last = None  # entry of the process that ran last, for switch_cost
+    next_boost = boost_period
+
+    while nxt is not None or waiting:
+        # Admit everything that has arrived by now
+        while nxt is not None and nxt[1] <= current_time:
+            top[-1].append([nxt[0], nxt[1], nxt[2], nxt[3], nxt[2], -1, 0, boosts])
+            counts[0] += 1
+            waiting += 1
+            nxt = next(arrivals, None)
+
+        if not waiting:
+            gantt.add("IDLE", current_time, nxt[1])
+            current_time = nxt[1]
+            if boost_period:
+                next_boost = (current_time // boost_period + 1) * boost_period
+            continue
+
+        if counts[0]:
+            level = 0
+            while not top[0]:
+                top.popleft()
+            entry = top[0].popleft()
+        else:
+            level = 1
+            while not counts[level]:
+                level += 1
+            entry = lower[level - 1].popleft()
+        counts[level] -= 1
+        waiting -= 1
+        if entry[7] != boosts:
+            entry[6] = 0
+            entry[7] = boosts
+
+        if switch_cost and last is not None and last is not entry:
+            gantt.add("SWITCH", current_time, current_time + switch_cost)
+            current_time += switch_cost
+        last = entry
+
+        # Run until the quantum is used up or the process completes, a
+        # boost is due or (below the top level) the next arrival. A boost
+        # that fell due during the switch waits for this slice
+        run_until = current_time + min(quanta[level] - entry[6], entry[4])
+        if level and nxt is not None and nxt[1] < run_until:
+            run_until = max(nxt[1], current_time)
+        if boost_period and current_time < next_boost < run_until:
+            run_until = next_boost
+
+        if (run_until > current_time or entry[4] == 0) and entry[5] == -1:
+            entry[5] = current_time
+        if run_until > current_time:
+            gantt.add(entry[0], current_time, run_until)
+        entry[4] -= run_until - current_time
+        entry[6] += run_until - current_time
+        current_time = run_until
+
+        # New arrivals go ahead of the process that was just preempted
+        while nxt is not None and nxt[1] <= current_time:
+            top[-1].append([nxt[0], nxt[1], nxt[2], nxt[3], nxt[2], -1, 0, boosts])
+            counts[0] += 1
+            waiting += 1
+            nxt = next(arrivals, None)
+
+        if entry[4] == 0:
+            yield (entry[0], entry[1], entry[2], entry[3], entry[5], current_time)
+        else:
+            if entry[6] >= quanta[level]:
+                entry[6] = 0
+                if level < levels - 1:
+                    level += 1
+            if level:
+                lower[level - 1].append(entry)
+            else:
+                top[-1].append(entry)
+            counts[level] += 1
+            waiting += 1
+
+        if boost_period and current_time >= next_boost:
+            for level in range(1, levels):
+                if counts[level]:
+                    top.append(lower[level - 1])
+                    lower[level - 1] = deque()
+                    counts[0] += counts[level]
+                    counts[level] = 0
+            boosts += 1
+            next_boost = (current_time // boost_period + 1) * boost_period
+
+
+def stream_cfs(records, latency=24, min_granularity=3, gantt=None, switch_cost=0):
+    """CFS-style fair scheduling over a sorted record stream
+
+    Same weights, time slices and virtual runtimes as cfs_table.
+    """
+    if latency <= 0 or min_granularity <= 0:
+        raise ValueError("Latency and minimum granularity must be positive")
+    gantt = gantt if gantt is not None else NullGantt()
+    arrivals = sorted_arrivals(records)
+    nxt = next(arrivals, None)
+    ready = []
+    seq = 0
+    total_weight = 0
+    min_vruntime = 0
+    current_time = 0
+    last = -1  # seq of the process that ran last, for switch_cost
+
+    while nxt is not None or ready:
+        # Admit everything that has arrived by now
+        while nxt is not None and nxt[1] <= current_time:
+            pid, arrival, burst, priority = nxt
+            weight = NICE_WEIGHTS[min(max(priority, -20), 19) + 20]
+            heapq.heappush(ready, (min_vruntime, seq, pid, arrival, burst, priority, burst, -1,
+                                   weight))
+            total_weight += weight
+            seq += 1
+            nxt = next(arrivals, None)
+
+        if not ready:
+            gantt.add("IDLE", current_time, nxt[1])
+            current_time = nxt[1]
+            continue
+
+        vruntime, s, pid, arrival, burst, priority, remaining, start, weight = heapq.heappop(ready)
+
+        if switch_cost and last not in (-1, s):
+            gantt.add("SWITCH", current_time, current_time + switch_cost)
+            current_time += switch_cost
+        last = s
+
+        if start == -1:
+            start = current_time
+
+        time_slice = max(min_granularity, latency * weight // total_weight, 1)
+        ran = min(time_slice, remaining)
+        if ran:
+            gantt.add(pid, current_time, current_time + ran)
+        remaining -= ran
+        current_time += ran
+        vruntime += ran * 1024 * 1024 // weight
+
+        if remaining == 0:
+            total_weight -= weight
+            yield (pid, arrival, burst, priority, start, current_time)
+        else:
+            heapq.heappush(ready, (vruntime, s, pid, arrival, burst, priority, remaining, start,
+                                   weight))
+        if ready and ready[0][0] > min_vruntime:
+            min_vruntime = ready[0][0]
+
+
+STREAM_ENGINES = {
+    "fcfs": stream_fcfs,
+    "sjf": stream_sjf,
+    "priority": stream_priority,
+    "rr": stream_round_robin,
+    "mlfq": stream_mlfq,
+    "cfs": stream_cfs,
+}
+
+
+def stream(algorithm, records, time_quantum=None, gantt=None, **options):
+    """Run a streaming engine by its short name
+
+    time_quantum and options (switch_cost, boost_period, latency, ...) are
+    checked and passed on as by SchedulingSimulator.run_table.
+    """
+    if algorithm not in STREAM_ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    _, options = SchedulingSimulator.engine(algorithm, time_quantum, **options)
+    return STREAM_ENGINES[algorithm](records, gantt=gantt, **options)
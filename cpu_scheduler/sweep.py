@@ -0,0 +1,138 @@
+"""Parallel parameter sweeps over one workload
+
+The workload is copied into a shared memory block once; every worker
+process attaches to it in its initializer and rebuilds the ProcessTable
+locally, so individual tasks only carry (algorithm, quantum).
+"""
+import csv
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+
+from .cache import workload_key
+from .metrics import result_metrics
+from .simulator import SchedulingSimulator
+from .table import ProcessTable
+
+COLUMNS = ("pid", "arrival_time", "burst_time", "priority")
+
+# Per-worker workload, set by _init_worker
+_worker_table = None
+
+
+def build_grid(algorithms, quanta=()):
+    """Expand algorithms x quanta into sweep points
+
+    Only Round Robin and MLFQ take a quantum; every other algorithm
+    appears once.
+    """
+    points = []
+    for algorithm in algorithms:
+        if algorithm in ("rr", "mlfq"):
+            points.extend((algorithm, q) for q in quanta)
+        else:
+            points.append((algorithm, None))
+    return points
+
+
+def parse_quanta(spec):
+    """Parse '1:100' (inclusive range), '1:100:5' or '2,4,8' into a list of quanta"""
+    if ":" in spec:
+        parts = [int(x) for x in spec.split(":")]
+        start, stop = parts[0], parts[1]
+        step = parts[2] if len(parts) > 2 else 1
+        return list(range(start, stop + 1, step))
+    return [int(x) for x in spec.split(",") if x]
+
+
+def _share_table(table):
+    """Copy the table columns into one shared memory block"""
+    n = len(table)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, n * 8 * len(COLUMNS)))
+    for k, column in enumerate(COLUMNS):
+        shm.buf[k * n * 8:(k + 1) * n * 8] = getattr(table, column).tobytes()
+    return shm
+
+
+def _init_worker(shm_name, n):
+    """Attach to the shared workload and keep a private ProcessTable"""
+    global _worker_table
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        table = ProcessTable()
+        for k, column in enumerate(COLUMNS):
+            values = array("q")
+            values.frombytes(shm.buf[k * n * 8:(k + 1) * n * 8])
+            setattr(table, column, values)
+    finally:
+        shm.close()
+    _worker_table = table
+
+
+def run_point(table, algorithm, time_quantum=None, **options):
+    """Run one sweep point and return its row of the results table"""
+    result, gantt_chart = SchedulingSimulator.run_table(algorithm, table, time_quantum, **options)
+    return _point_row(algorithm, time_quantum, result, gantt_chart)
+
+
+def _point_row(algorithm, time_quantum, result, gantt_chart):
+    row = {"algorithm": algorithm, "quantum": time_quantum}
+    row.update(result_metrics(result, gantt_chart))
+    return row
+
+
+def _run_worker_point(point, **options):
+    return run_point(_worker_table, *point, **options)
+
+
+def run_sweep(table, points, workers=None, cache=None, **options):
+    """Run every sweep point over the table and return one row per point
+
+    workers=1 runs in-process; otherwise the points are fanned out over a
+    ProcessPoolExecutor with os.cpu_count() workers by default. Rows come
+    back in the order of points. Repeated points are only run once, and
+    with a ResultCache, points it already holds are answered from it;
+    in-process runs are added to it. options (such as switch_cost) go to
+    every engine.
+    """
+    rows = {}
+    if cache is not None:
+        for point in dict.fromkeys(points):
+            cached = cache.get(workload_key(point[0], table, point[1], **options), table)
+            if cached is not None:
+                rows[point] = _point_row(point[0], point[1], *cached)
+    pending = [point for point in dict.fromkeys(points) if point not in rows]
+
+    if workers == 1 or len(pending) <= 1:
+        for algorithm, time_quantum in pending:
+            if cache is not None:
+                result, gantt_chart = cache.run(algorithm, table, time_quantum, **options)
+                rows[algorithm, time_quantum] = _point_row(algorithm, time_quantum,
+                                                           result, gantt_chart)
+            else:
+                rows[algorithm, time_quantum] = run_point(table, algorithm, time_quantum, **options)
+        return [rows[point] for point in points]
+
+    workers = workers or os.cpu_count() or 1
+    shm = _share_table(table)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, len(table))) as executor:
+            chunksize = max(1, len(pending) // (workers * 4))
+            rows.update(zip(pending, executor.map(partial(_run_worker_point, **options), pending,
+                                                  chunksize=chunksize)))
+    finally:
+        shm.close()
+        shm.unlink()
+    return [rows[point] for point in points]
+
+
+def write_csv(rows, f):
+    """Write sweep rows as a CSV table"""
+    if not rows:
+        return
+    writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
@@ -0,0 +1,83 @@
+from array import array
+
+from .process import Process
+
+
+class ProcessTable:
+    """Column-oriented workload: one typed array per attribute
+
+    Holds pid, arrival_time, burst_time and priority as int64 arrays, which
+    costs 32 bytes per process instead of a full Process object. Names are
+    optional and only kept when the workload came from real processes.
+    """
+
+    def __init__(self, names=None):
+        self.pid = array("q")
+        self.arrival_time = array("q")
+        self.burst_time = array("q")
+        self.priority = array("q")
+        self.names = names
+
+    def __len__(self):
+        return len(self.pid)
+
+    def append(self, pid, arrival_time, burst_time, priority=0, name=None):
+        """Add one process to the table"""
+        self.pid.append(pid)
+        self.arrival_time.append(arrival_time)
+        self.burst_time.append(burst_time)
+        self.priority.append(priority)
+        if self.names is not None:
+            self.names.append(name if name is not None else str(pid))
+
+    def name(self, i):
+        """Display name of row i"""
+        return self.names[i] if self.names is not None else str(self.pid[i])
+
+    @classmethod
+    def from_processes(cls, processes):
+        """Build a table from Process objects"""
+        table = cls(names=[p.name for p in processes])
+        table.pid = array("q", [p.pid for p in processes])
+        table.arrival_time = array("q", [p.arrival_time for p in processes])
+        table.burst_time = array("q", [p.burst_time for p in processes])
+        table.priority = array("q", [p.priority for p in processes])
+        return table
+
+    def to_processes(self):
+        """Materialize the rows as fresh Process objects"""
+        return [Process(self.pid[i], self.name(i), self.priority[i],
+                        burst_time=self.burst_time[i], arrival_time=self.arrival_time[i])
+                for i in range(len(self))]
+
+
+class ScheduleResult:
+    """Per-process output arrays of one engine run, row-aligned with its table"""
+
+    def __init__(self, table):
+        n = len(table)
+        self.table = table
+        self.start_time = array("q", [-1]) * n
+        self.completion_time = array("q", [0]) * n
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def turnaround_time(self):
+        return array("q", map(int.__sub__, self.completion_time, self.table.arrival_time))
+
+    @property
+    def waiting_time(self):
+        return array("q", map(int.__sub__, self.turnaround_time, self.table.burst_time))
+
+    def to_processes(self):
+        """Materialize finished Process objects, as the object engines return them"""
+        processes = self.table.to_processes()
+        for i, p in enumerate(processes):
+            p.remaining_time = 0
+            p.start_time = self.start_time[i]
+            p.completion_time = self.completion_time[i]
+            p.turnaround_time = p.completion_time - p.arrival_time
+            p.waiting_time = p.turnaround_time - p.burst_time
+        return processes
@@ -0,0 +1,149 @@
+"""Workload traces
+
+Traces are read as streams of (pid, arrival_time, burst_time, priority)
+records so they never need to be held in memory as Process objects.
+Three formats are supported, picked by file extension:
+
+- .csv   header row with at least pid and burst_time; name, priority and
+         arrival_time are optional
+- .jsonl one JSON object per line with the same keys
+- .bin   compact binary: an 8 byte magic followed by little-endian int64
+         records of pid, arrival_time, burst_time, priority
+"""
+import csv
+import heapq
+import json
+import os
+import struct
+import tempfile
+
+from .table import ProcessTable
+
+BINARY_MAGIC = b"CPUTRC01"
+RECORD = struct.Struct("<qqqq")
+# Records read per block from binary traces
+BLOCK_RECORDS = 65536
+
+
+def iter_csv(path):
+    """Stream records from a CSV trace"""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        col = {name.strip(): i for i, name in enumerate(header)}
+        pid_i = col["pid"]
+        burst_i = col["burst_time"]
+        arrival_i = col.get("arrival_time")
+        priority_i = col.get("priority")
+        for row in reader:
+            if not row:
+                continue
+            yield (int(row[pid_i]),
+                   int(row[arrival_i] or 0) if arrival_i is not None else 0,
+                   int(row[burst_i]),
+                   int(row[priority_i] or 0) if priority_i is not None else 0)
+
+
+def iter_jsonl(path):
+    """Stream records from a JSON Lines trace"""
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            yield (int(obj["pid"]), int(obj.get("arrival_time", 0)),
+                   int(obj["burst_time"]), int(obj.get("priority", 0)))
+
+
+def iter_binary(path):
+    """Stream records from a binary trace, one block at a time"""
+    with open(path, "rb") as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a binary trace")
+        while True:
+            block = f.read(RECORD.size * BLOCK_RECORDS)
+            if not block:
+                return
+            if len(block) % RECORD.size:
+                raise ValueError(f"{path} is truncated")
+            yield from RECORD.iter_unpack(block)
+
+
+def write_binary(records, path):
+    """Write records to a binary trace and return how many were written"""
+    count = 0
+    pack = RECORD.pack
+    with open(path, "wb") as f:
+        f.write(BINARY_MAGIC)
+        buffer = []
+        for record in records:
+            buffer.append(pack(*record))
+            if len(buffer) == BLOCK_RECORDS:
+                f.write(b"".join(buffer))
+                buffer = []
+            count += 1
+        f.write(b"".join(buffer))
+    return count
+
+
+def iter_trace(path):
+    """Stream records from a trace, picking the reader by file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return iter_csv(path)
+    if ext in (".jsonl", ".ndjson"):
+        return iter_jsonl(path)
+    if ext == ".bin":
+        return iter_binary(path)
+    raise ValueError(f"Unknown trace format: {path}")
+
+
+def sorted_arrivals(records):
+    """Pass records through, checking that they come sorted by arrival time
+
+    The streaming engines rely on this order; use sort_trace to convert an
+    unsorted trace first.
+    """
+    last = None
+    for record in records:
+        if last is not None and record[1] < last:
+            raise ValueError(f"Trace is not sorted by arrival_time at pid {record[0]}; "
+                             "convert it with sort_trace first")
+        last = record[1]
+        yield record
+
+
+def sort_trace(records, path, chunk_size=1_000_000):
+    """Sort records by arrival time into a binary trace
+
+    Uses an external merge sort: chunks of chunk_size records are sorted in
+    memory and spilled to temporary binary files, then merged. Records with
+    the same arrival time keep their input order.
+    """
+    arrival = lambda record: record[1]
+    with tempfile.TemporaryDirectory() as tmp:
+        chunks = []
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                chunk.sort(key=arrival)
+                chunks.append(os.path.join(tmp, f"{len(chunks)}.bin"))
+                write_binary(chunk, chunks[-1])
+                chunk = []
+        chunk.sort(key=arrival)
+        if not chunks:
+            return write_binary(chunk, path)
+        chunks.append(os.path.join(tmp, f"{len(chunks)}.bin"))
+        write_binary(chunk, chunks[-1])
+        return write_binary(heapq.merge(*[iter_binary(c) for c in chunks], key=arrival), path)
+
+
+def read_table(path):
+    """Load a trace of any supported format into a ProcessTable"""
+    table = ProcessTable()
+    for pid, arrival_time, burst_time, priority in iter_trace(path):
+        table.append(pid, arrival_time, burst_time, priority)
+    return table
@@ -0,0 +1,384 @@
+"""Differential checks of the fast engines against the reference engines
+
+The original tick-based Process engines (fcfs, sjf_preemptive,
+priority_preemptive, round_robin) are the reference. check() runs random
+workloads through them and through every fast path (the ProcessTable
+engines, the streaming engines, IncrementalSimulator from scratch and
+rerun after an edit, a one-CPU SMPSimulator and OnlineScheduler, fed in
+uneven steps), and compares start, completion, turnaround and waiting
+time per process plus the normalized Gantt timeline. A mismatch is
+shrunk to a minimal workload before it is reported.
+
+The reference engines break ties by list position, the fast ones by
+arrival order, so workloads checked against the reference are listed by
+(arrival_time, pid) unless any_order is set. Their burst times are at
+least 1, since the reference engines never finish a process with a zero
+burst, and they take no engine options.
+
+Every other trial, and every trial of mlfq and cfs, which have no
+reference engine, is checked against the table engine instead: the
+workload is listed in random order, may have zero bursts and runs with
+random engine options (switch_cost, boost_period, latency, ...), so the
+fast paths must agree with each other on all of those too. Paths that do
+not support an algorithm (smp and online for mlfq and cfs) are skipped.
+"""
+import random
+
+from .gantt import ColumnarGantt
+from .incremental import IncrementalSimulator
+from .online import ALGORITHMS as ONLINE_ALGORITHMS, OnlineScheduler
+from .process import Process
+from .simulator import SchedulingSimulator
+from .smp import SMPSimulator
+from .stream import stream
+from .table import ProcessTable
+
+REFERENCE_ENGINES = {
+    "fcfs": "fcfs",
+    "sjf": "sjf_preemptive",
+    "priority": "priority_preemptive",
+    "rr": "round_robin",
+}
+ALGORITHMS = tuple(SchedulingSimulator.ALGORITHMS)
+FAST_PATHS = ("table", "stream", "incremental", "rerun", "smp", "online")
+ORACLES = ("reference", "table")
+
+
+def supports(path, algorithm):
+    """Whether the fast path can run algorithm"""
+    if path == "smp":
+        return algorithm in SMPSimulator.ALGORITHMS
+    if path == "online":
+        return algorithm in ONLINE_ALGORITHMS
+    return True
+
+
+class Mismatch:
+    """A workload on which a fast path disagrees with the oracle
+
+    workload is a list of (pid, arrival_time, burst_time, priority) tuples,
+    oracle "reference" or "table" and options the engine options.
+    """
+
+    def __init__(self, algorithm, path, workload, time_quantum, reason, oracle="reference",
+                 options=None):
+        self.algorithm = algorithm
+        self.path = path
+        self.workload = workload
+        self.time_quantum = time_quantum
+        self.reason = reason
+        self.oracle = oracle
+        self.options = options or {}
+
+    def __str__(self):
+        parameters = [f"quantum {self.time_quantum}"] if self.time_quantum is not None else []
+        parameters += [f"{name} {value}" for name, value in self.options.items()]
+        parameters = f" ({', '.join(parameters)})" if parameters else ""
+        against = " against the table engine" if self.oracle == "table" else ""
+        lines = [f"{self.algorithm}/{self.path}{parameters}{against}: {self.reason}",
+                 "pid,arrival_time,burst_time,priority"]
+        lines += [",".join(map(str, record)) for record in self.workload]
+        return "\n".join(lines)
+
+
+def random_workload(rng, max_processes=12, max_arrival=30, max_burst=15, max_priority=5,
+                    any_order=False, min_burst=1):
+    """A small random workload as (pid, arrival_time, burst_time, priority) tuples"""
+    workload = [(pid, rng.randint(0, max_arrival), rng.randint(min_burst, max_burst),
+                 rng.randint(0, max_priority))
+                for pid in range(1, rng.randint(1, max_processes) + 1)]
+    if any_order:
+        rng.shuffle(workload)
+    else:
+        workload.sort(key=lambda record: (record[1], record[0]))
+    return workload
+
+
+def random_options(rng, algorithm):
+    """Random engine options for algorithm, as run_table takes them"""
+    options = {}
+    switch_cost = rng.randint(0, 3)
+    if switch_cost:
+        options["switch_cost"] = switch_cost
+    if algorithm == "mlfq" and rng.random() < 0.5:
+        options["boost_period"] = rng.randint(1, 30)
+    if algorithm == "cfs" and rng.random() < 0.5:
+        options["latency"] = rng.randint(1, 40)
+        options["min_granularity"] = rng.randint(1, 6)
+    return options
+
+
+def normalize_gantt(gantt_chart):
+    """Drop empty slices and merge adjacent slices of the same PID"""
+    segments = []
+    for pid, start, end in gantt_chart:
+        if end <= start:
+            continue
+        if segments and segments[-1][0] == pid and segments[-1][2] == start:
+            segments[-1] = (pid, segments[-1][1], end)
+        else:
+            segments.append((pid, start, end))
+    return segments
+
+
+def _reference(algorithm, workload, time_quantum):
+    processes = [Process(pid, str(pid), priority, burst, arrival)
+                 for pid, arrival, burst, priority in workload]
+    engine = getattr(SchedulingSimulator, REFERENCE_ENGINES[algorithm])
+    if algorithm == "rr":
+        results, gantt_chart = engine(processes, time_quantum)
+    else:
+        results, gantt_chart = engine(processes)
+    times = {p.pid: (p.start_time, p.completion_time, p.turnaround_time, p.waiting_time)
+             for p in results}
+    return times, normalize_gantt(gantt_chart)
+
+
+def _table(workload):
+    table = ProcessTable()
+    for pid, arrival, burst, priority in workload:
+        table.append(pid, arrival, burst, priority)
+    return table
+
+
+def rerun_edit(workload):
+    """The row the rerun path edits, as (index, record before the edit)
+
+    The edit is derived from the workload itself, so shrinking a failing
+    case keeps it deterministic.
+    """
+    rng = random.Random(repr(workload))
+    k = rng.randrange(len(workload))
+    pid, arrival, burst, priority = workload[k]
+    column = rng.randrange(3)
+    if column == 0:
+        arrival = rng.choice([value for value in range(31) if value != arrival])
+    elif column == 1:
+        burst = rng.choice([value for value in range(16) if value != burst])
+    else:
+        priority = rng.choice([value for value in range(6) if value != priority])
+    return k, (pid, arrival, burst, priority)
+
+
+def online_schedule(workload):
+    """The times the online path advances to before each submission
+
+    One list per record in arrival order, each ending at or before its
+    arrival; an advance may pass arrivals that are submitted but still
+    pending. Derived from the workload, like rerun_edit.
+    """
+    rng = random.Random(repr(workload))
+    schedule = []
+    time = 0
+    for record in sorted(workload, key=lambda record: record[1]):
+        advances = []
+        for _ in range(rng.randint(0, 2)):
+            time = rng.randint(time, record[1])
+            advances.append(time)
+        schedule.append(advances)
+    return schedule
+
+
+# Online runs that once went wrong, as (algorithm, time_quantum, options,
+# workload, schedule) with schedule as online_schedule returns it. check()
+# runs them against the table engine before its random trials.
+ONLINE_REGRESSIONS = [
+    # Switching to a process with nothing left while an arrival was pending
+    # inside the switch moved the clock back to that arrival
+    ("sjf", None, {"switch_cost": 3}, [(2, 0, 2, 1), (3, 2, 0, 0), (1, 4, 3, 0)], [[], [1], [3]]),
+]
+
+
+def _online(algorithm, workload, time_quantum, options, schedule):
+    scheduler = OnlineScheduler(algorithm, time_quantum, switch_cost=options.get("switch_cost", 0))
+    completed = []
+    for (pid, arrival, burst, priority), advances in zip(
+            sorted(workload, key=lambda record: record[1]), schedule):
+        for until in advances:
+            completed += scheduler.advance(until)
+        scheduler.submit(pid, arrival, burst, priority)
+    completed += scheduler.finish()
+    times = {pid: (start, completion, completion - arrival, completion - arrival - burst)
+             for pid, arrival, burst, priority, start, completion in completed}
+    return times, normalize_gantt(scheduler.gantt)
+
+
+def _fast(algorithm, path, workload, time_quantum, options):
+    table = _table(workload)
+    if path == "stream":
+        records = sorted(workload, key=lambda record: record[1])
+        gantt_chart = ColumnarGantt()
+        times = {}
+        for pid, arrival, burst, priority, start, completion in stream(
+                algorithm, records, time_quantum, gantt_chart, **options):
+            times[pid] = (start, completion, completion - arrival, completion - arrival - burst)
+        return times, normalize_gantt(gantt_chart)
+    if path == "online":
+        return _online(algorithm, workload, time_quantum, options, online_schedule(workload))
+    if path == "table":
+        result, gantt_chart = SchedulingSimulator.run_table(algorithm, table, time_quantum, **options)
+    elif path == "incremental":
+        result, gantt_chart = IncrementalSimulator(algorithm, time_quantum, checkpoints=4,
+                                                   **options).run(table)
+    elif path == "rerun":
+        # Run the workload with one row edited, then rerun it with the row restored
+        k, record = rerun_edit(workload)
+        simulator = IncrementalSimulator(algorithm, time_quantum, checkpoints=8, **options)
+        simulator.run(_table(workload[:k] + [record] + workload[k + 1:]))
+        result, gantt_chart = simulator.rerun(table)
+    elif path == "smp":
+        result, lanes = SMPSimulator(algorithm, 1, time_quantum,
+                                     switch_cost=options.get("switch_cost", 0)).run(table)
+        gantt_chart = lanes[0]
+    else:
+        raise ValueError(f"Unknown fast path: {path}")
+    turnaround = result.turnaround_time
+    waiting = result.waiting_time
+    times = {table.pid[i]: (result.start_time[i], result.completion_time[i], turnaround[i], waiting[i])
+             for i in range(len(table))}
+    return times, normalize_gantt(gantt_chart)
+
+
+def compare(algorithm, path, workload, time_quantum=None, oracle="reference", options=None):
+    """Return why path disagrees with the oracle on workload, or None
+
+    oracle is "reference" for the tick-based engine or "table" for
+    run_table, which does not depend on the order the workload is listed in.
+    options (switch_cost, ...) go to both engines; the reference takes none.
+    """
+    options = options or {}
+    if oracle == "table":
+        expected_times, expected_gantt = _fast(algorithm, "table", workload, time_quantum, options)
+    else:
+        expected_times, expected_gantt = _reference(algorithm, workload, time_quantum)
+    times, gantt_chart = _fast(algorithm, path, workload, time_quantum, options)
+    reason = _difference(expected_times, expected_gantt, times, gantt_chart, oracle)
+    if reason is not None and path == "rerun":
+        _, record = rerun_edit(workload)
+        reason += f" (rerun after P{record[0]} changed from {record[1:]})"
+    return reason
+
+
+def _difference(expected_times, expected_gantt, times, gantt_chart, oracle):
+    fields = ("start", "completion", "turnaround", "waiting")
+    for pid, expected in expected_times.items():
+        got = times.get(pid)
+        if got != expected:
+            for field, a, b in zip(fields, expected, got or (None,) * 4):
+                if a != b:
+                    return f"P{pid} {field} {b}, {oracle} {a}"
+    if gantt_chart != expected_gantt:
+        for k, (a, b) in enumerate(zip(expected_gantt, gantt_chart)):
+            if a != b:
+                return f"Gantt segment {k} is {b}, {oracle} {a}"
+        return f"Gantt has {len(gantt_chart)} segments, {oracle} {len(expected_gantt)}"
+    return None
+
+
+def _candidates(workload, time_quantum, options, min_burst):
+    """Smaller variants of a failing case, most aggressive first"""
+    for k in range(len(workload)):
+        if len(workload) > 1:
+            yield workload[:k] + workload[k + 1:], time_quantum, options
+    for name in options:
+        yield workload, time_quantum, {key: value for key, value in options.items() if key != name}
+    for k, (pid, arrival, burst, priority) in enumerate(workload):
+        for value in dict.fromkeys((0, arrival // 2, arrival - 1)):
+            if 0 <= value < arrival:
+                yield (workload[:k] + [(pid, value, burst, priority)] + workload[k + 1:],
+                       time_quantum, options)
+        for value in dict.fromkeys((min_burst, burst // 2, burst - 1)):
+            if min_burst <= value < burst:
+                yield (workload[:k] + [(pid, arrival, value, priority)] + workload[k + 1:],
+                       time_quantum, options)
+        for value in dict.fromkeys((0, priority // 2, priority - 1)):
+            if 0 <= value < priority:
+                yield (workload[:k] + [(pid, arrival, burst, value)] + workload[k + 1:],
+                       time_quantum, options)
+    if time_quantum is not None:
+        for value in dict.fromkeys((1, time_quantum // 2, time_quantum - 1)):
+            if 1 <= value < time_quantum:
+                yield workload, value, options
+    switch_cost = options.get("switch_cost", 0)
+    for value in dict.fromkeys((1, switch_cost // 2, switch_cost - 1)):
+        if 1 <= value < switch_cost:
+            yield workload, time_quantum, dict(options, switch_cost=value)
+    renumbered = [(k + 1,) + record[1:] for k, record in enumerate(workload)]
+    if renumbered != workload:
+        yield renumbered, time_quantum, options
+
+
+def shrink(mismatch):
+    """Greedily reduce a Mismatch until no smaller variant still fails"""
+    min_burst = 0 if mismatch.oracle == "table" else 1
+    progress = True
+    while progress:
+        progress = False
+        for workload, time_quantum, options in _candidates(mismatch.workload, mismatch.time_quantum,
+                                                           mismatch.options, min_burst):
+            reason = compare(mismatch.algorithm, mismatch.path, workload, time_quantum,
+                             mismatch.oracle, options)
+            if reason is not None:
+                mismatch = Mismatch(mismatch.algorithm, mismatch.path, workload, time_quantum, reason,
+                                    mismatch.oracle, options)
+                progress = True
+                break
+    return mismatch
+
+
+def _online_regression(algorithm, time_quantum, options, workload, schedule):
+    expected_times, expected_gantt = _fast(algorithm, "table", workload, time_quantum, options)
+    times, gantt_chart = _online(algorithm, workload, time_quantum, options, schedule)
+    reason = _difference(expected_times, expected_gantt, times, gantt_chart, "table")
+    if reason is None:
+        return None
+    return Mismatch(algorithm, "online", workload, time_quantum,
+                    f"{reason} (advancing to {schedule} before each arrival)", "table", options)
+
+
+def check(algorithm, paths=FAST_PATHS, trials=1000, seed=0, time_quantum=None, any_order=False,
+          **workload_options):
+    """Compare the fast paths with the reference on random workloads
+
+    The online path first replays ONLINE_REGRESSIONS for algorithm.
+    Returns the shrunk Mismatch of the first failing trial, or None. For
+    rr a random quantum from 1 to 6 is drawn per trial unless
+    time_quantum is given; mlfq gets one (its top-level quantum) or its
+    default quanta. workload_options go to random_workload.
+
+    Odd-numbered trials, and all trials of algorithms without a reference
+    engine, compare the other paths with the table engine on random
+    options, zero bursts and random order; with any_order the other
+    trials are listed in random order too.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if "online" in paths:
+        for case in ONLINE_REGRESSIONS:
+            if case[0] == algorithm:
+                mismatch = _online_regression(*case)
+                if mismatch is not None:
+                    return mismatch
+    rng = random.Random(seed)
+    for trial in range(trials):
+        if algorithm not in REFERENCE_ENGINES or (trial % 2 and not any_order):
+            oracle = "table"
+            workload = random_workload(rng, any_order=True, min_burst=0, **workload_options)
+            options = random_options(rng, algorithm)
+        else:
+            oracle = "reference"
+            workload = random_workload(rng, any_order=any_order, **workload_options)
+            options = {}
+        quantum = None
+        if algorithm == "rr":
+            quantum = time_quantum or rng.randint(1, 6)
+        elif algorithm == "mlfq":
+            quantum = time_quantum or (rng.randint(1, 6) if rng.random() < 0.5 else None)
+        for path in paths:
+            if not supports(path, algorithm) or (oracle == "table" and path == "table"):
+                continue
+            reason = compare(algorithm, path, workload, quantum, oracle, options)
+            if reason is not None:
+                return shrink(Mismatch(algorithm, path, workload, quantum, reason, oracle,
+                                       options))
+    return None
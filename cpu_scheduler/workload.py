@@ -0,0 +1,102 @@
+"""Seeded synthetic workloads
+
+iter_workload yields (pid, arrival_time, burst_time, priority) records in
+arrival order, the same records the trace readers produce, so a generated
+workload can be fed to the streaming engines or written out with
+write_binary; generate collects it into a ProcessTable. The same seed and
+parameters always give the same workload.
+
+Arrival patterns (mean gap mean_burst / load, so load is the offered CPU
+utilization):
+
+- poisson  exponential inter-arrival gaps
+- bursty   on/off source: arrivals come 1 / BURSTY_DUTY times faster
+           during ON periods and stop during OFF periods
+- batch    everything arrives at time 0
+
+Burst distributions, all with mean about mean_burst and at least 1:
+exponential, uniform, pareto (heavy tail, shape PARETO_SHAPE) and
+lognormal (sigma LOGNORMAL_SIGMA).
+
+Priority mixes: uniform (1..10), bimodal (20% at 1, the rest at 10) and
+nice (80% at 0, the rest spread over -20..19, as the cfs engine reads
+them).
+"""
+import math
+import random
+
+from .table import ProcessTable
+
+ARRIVALS = ("poisson", "bursty", "batch")
+BURSTS = ("exponential", "uniform", "pareto", "lognormal")
+PRIORITY_MIXES = ("uniform", "bimodal", "nice")
+
+PARETO_SHAPE = 1.5
+LOGNORMAL_SIGMA = 1.0
+# Share of the time a bursty source is ON, and the mean ON period in bursts
+BURSTY_DUTY = 0.25
+BURSTY_PERIOD = 25
+
+
+def iter_workload(n, arrivals="poisson", bursts="exponential", priorities="uniform", seed=0,
+                  mean_burst=10, load=0.9):
+    """Yield n synthetic (pid, arrival_time, burst_time, priority) records"""
+    if arrivals not in ARRIVALS:
+        raise ValueError(f"Unknown arrival pattern: {arrivals}")
+    if bursts not in BURSTS:
+        raise ValueError(f"Unknown burst distribution: {bursts}")
+    if priorities not in PRIORITY_MIXES:
+        raise ValueError(f"Unknown priority mix: {priorities}")
+    if mean_burst <= 0 or load <= 0:
+        raise ValueError("Mean burst and load must be positive")
+    rng = random.Random(seed)
+    rate = load / mean_burst
+
+    if bursts == "exponential":
+        def burst():
+            return rng.expovariate(1 / mean_burst)
+    elif bursts == "uniform":
+        def burst():
+            return rng.uniform(1, 2 * mean_burst - 1)
+    elif bursts == "pareto":
+        scale = mean_burst * (PARETO_SHAPE - 1) / PARETO_SHAPE
+        def burst():
+            return scale * rng.paretovariate(PARETO_SHAPE)
+    else:
+        mu = math.log(mean_burst) - LOGNORMAL_SIGMA ** 2 / 2
+        def burst():
+            return rng.lognormvariate(mu, LOGNORMAL_SIGMA)
+
+    if priorities == "uniform":
+        def priority():
+            return rng.randint(1, 10)
+    elif priorities == "bimodal":
+        def priority():
+            return 1 if rng.random() < 0.2 else 10
+    else:
+        def priority():
+            return 0 if rng.random() < 0.8 else rng.randint(-20, 19)
+
+    clock = 0.0
+    on_until = rng.expovariate(1 / (BURSTY_PERIOD * mean_burst))
+    for pid in range(1, n + 1):
+        if arrivals == "poisson":
+            clock += rng.expovariate(rate)
+        elif arrivals == "bursty":
+            clock += rng.expovariate(rate / BURSTY_DUTY)
+            while clock > on_until:
+                # The rest of the gap carries over past an OFF period
+                off = rng.expovariate(BURSTY_DUTY / ((1 - BURSTY_DUTY) * BURSTY_PERIOD * mean_burst))
+                clock += off
+                on_until += off + rng.expovariate(1 / (BURSTY_PERIOD * mean_burst))
+        yield (pid, int(clock), max(1, round(burst())), priority())
+
+
+def generate(n, arrivals="poisson", bursts="exponential", priorities="uniform", seed=0,
+             mean_burst=10, load=0.9):
+    """Build a ProcessTable of n synthetic processes; see iter_workload"""
+    table = ProcessTable()
+    for pid, arrival_time, burst_time, priority in iter_workload(
+            n, arrivals, bursts, priorities, seed, mean_burst, load):
+        table.append(pid, arrival_time, burst_time, priority)
+    return table